@@ -8,12 +8,18 @@ Enhanced with:
 - Human authenticity markers
 - Voice cloning from best posts
 """
-from .core_message_node import extract_core_message_node
-from .post_analyzer_node import analyze_best_posts_node
-from .generator_node import generate_content_node
-from .critic_node import critique_content_node
-from .reviser_node import revise_content_node
-from .validator_node import validate_content_node
+from .core_message_node import extract_core_message_node, extract_core_message_node_async
+from .post_analyzer_node import analyze_best_posts_node, analyze_best_posts_node_async
+from .generator_node import (
+    generate_content_node,
+    generate_content_node_async,
+    generate_all_platforms_node,
+    generate_all_platforms_node_async,
+)
+from .critic_node import critique_content_node, critique_content_node_async
+from .reviser_node import revise_content_node, revise_content_node_async
+from .validator_node import validate_content_node, PLATFORM_SPECS
+from .repair_node import repair_content_node, repair_draft
 from .schemas import RepurposingState, CoreMessage, CritiqueResult, ContentMetadata
 
 # Export prompt utilities for external use
@@ -22,7 +28,12 @@ from .prompts import (
     ANTI_AI_RULES,
     HOOK_FORMULAS,
     ENGAGEMENT_RULES,
+    PROMPTS,
+    PromptTemplate,
+    get_prompt,
+    get_prompt_version,
     get_enhanced_generator_prompt,
+    get_enhanced_multi_platform_prompt,
     get_enhanced_core_message_prompt,
     get_enhanced_reviser_prompt,
     get_enhanced_variations_prompt,
@@ -36,20 +47,37 @@ __all__ = [
     "extract_core_message_node",
     "analyze_best_posts_node",
     "generate_content_node",
+    "generate_all_platforms_node",
     "critique_content_node",
     "revise_content_node",
     "validate_content_node",
+    "repair_content_node",
+    # Async nodes
+    "extract_core_message_node_async",
+    "analyze_best_posts_node_async",
+    "generate_content_node_async",
+    "generate_all_platforms_node_async",
+    "critique_content_node_async",
+    "revise_content_node_async",
     # Schemas
     "RepurposingState",
     "CoreMessage",
     "CritiqueResult",
     "ContentMetadata",
+    # Validation
+    "PLATFORM_SPECS",
+    "repair_draft",
     # Prompts
     "PLATFORM_RULES",
     "ANTI_AI_RULES",
     "HOOK_FORMULAS",
     "ENGAGEMENT_RULES",
+    "PROMPTS",
+    "PromptTemplate",
+    "get_prompt",
+    "get_prompt_version",
     "get_enhanced_generator_prompt",
+    "get_enhanced_multi_platform_prompt",
     "get_enhanced_core_message_prompt",
     "get_enhanced_reviser_prompt",
     "get_enhanced_variations_prompt",
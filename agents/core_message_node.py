@@ -1,39 +1,17 @@
 """Core Message Extraction Node for LangGraph with Enhanced Analysis."""
-import json
-from groq import Groq
+import hashlib
+from typing import Any, Dict, Optional
+from utils.llm_client import (
+    json_chat_completion_with_model,
+    ajson_chat_completion_with_model,
+    get_node_model,
+    get_escalation_model,
+)
 from .schemas import RepurposingState, CoreMessage
-from .prompts import CORE_MESSAGE_PROMPT, ANTI_AI_RULES, get_enhanced_core_message_prompt
-from config import GROQ_MODEL
+from .prompts import get_prompt
 
 
-def extract_core_message_node(state: RepurposingState) -> RepurposingState:
-    """
-    Extracts the core message from raw text using Groq.
-    
-    Enhanced to extract:
-    - Core topic and thesis
-    - Key insights
-    - Hook angles for engagement
-    - Controversy potential for discussion
-    - Story elements for personal touch
-    
-    This is the first node in the workflow.
-    """
-    print("🧠 [CORE MESSAGE] Extracting core message with engagement analysis...")
-    
-    # Initialize Groq client
-    client = Groq(api_key=state["groq_api_key"])
-    
-    # Use enhanced prompt with anti-AI rules
-    prompt = get_enhanced_core_message_prompt().format(raw_text=state["raw_text"])
-    
-    # Call Groq with JSON mode
-    response = client.chat.completions.create(
-        model=GROQ_MODEL,
-        messages=[
-            {
-                "role": "system",
-                "content": """You are an expert Content Strategist who identifies what makes content resonate and go viral.
+CORE_MESSAGE_SYSTEM_PROMPT = """You are an expert Content Strategist who identifies what makes content resonate and go viral.
 
 Analyze the content deeply and extract:
 1. The core message that must be preserved
@@ -45,18 +23,58 @@ Analyze the content deeply and extract:
 Return valid JSON with keys: topic, thesis, insights, audience_analysis, hook_angles, controversy_potential, story_elements.
 
 Be specific and actionable. Generic analysis is useless."""
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        response_format={"type": "json_object"},
-        temperature=0.1  # Low temp for accurate extraction
-    )
+
+# A response without these is escalated to the larger model (see LLM_NODE_MODELS)
+REQUIRED_KEYS = ("topic", "thesis", "insights")
+
+
+# Cache keys include this so editing either prompt invalidates old entries
+CORE_MESSAGE_PROMPT_VERSION = hashlib.sha256(
+    (CORE_MESSAGE_SYSTEM_PROMPT + get_prompt("core_message").version).encode()
+).hexdigest()[:12]
+
+
+def _load_cached(state: RepurposingState) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached extraction for this text and prompt version.
+    
+    Entries are keyed on the model that produced them, so both the routed
+    model and its escalation model are looked up.
+    """
+    from utils import CacheManager
+    for model in (get_node_model("core_message"), get_escalation_model("core_message")):
+        if model:
+            cached = CacheManager.get_cached_core_message(state["raw_text"], model, CORE_MESSAGE_PROMPT_VERSION)
+            if cached:
+                return cached
+    return None
+
+
+def _save_cached(state: RepurposingState, data: Dict[str, Any], model: str) -> None:
+    """Store a fresh extraction (under the model that answered) so re-runs skip the LLM."""
+    from utils import CacheManager
+    CacheManager.save_core_message(state["raw_text"], model, CORE_MESSAGE_PROMPT_VERSION, data)
+
+
+def _build_request(state: RepurposingState) -> Dict[str, Any]:
+    """Build the chat completion arguments for core message extraction."""
+    # Use enhanced prompt with anti-AI rules
+    prompt = get_prompt("core_message").format(raw_text=state["raw_text"])
     
-    # Parse JSON response
-    data = json.loads(response.choices[0].message.content)
+    return {
+        "model": get_node_model("core_message"),
+        "messages": [
+            {"role": "system", "content": CORE_MESSAGE_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.1,  # Low temp for accurate extraction
+    }
+
+
+def _apply_core_message(state: RepurposingState, data: Dict[str, Any], cached: bool = False) -> RepurposingState:
+    """Write the parsed extraction result into the workflow state."""
+    state["core_message_cached"] = cached
     
     # Update state with core message
     state["core_message"] = CoreMessage(
@@ -90,3 +108,48 @@ Be specific and actionable. Generic analysis is useless."""
         print(f"   🔥 Controversy potential identified")
     
     return state
+
+
+def extract_core_message_node(state: RepurposingState) -> RepurposingState:
+    """
+    Extracts the core message from raw text using Groq.
+    
+    Enhanced to extract:
+    - Core topic and thesis
+    - Key insights
+    - Hook angles for engagement
+    - Controversy potential for discussion
+    - Story elements for personal touch
+    
+    This is the first node in the workflow. Results are cached per
+    normalized source text, so re-runs skip the LLM call entirely.
+    """
+    cached = _load_cached(state)
+    if cached:
+        return _apply_core_message(state, cached, cached=True)
+    
+    print("🧠 [CORE MESSAGE] Extracting core message with engagement analysis...")
+    
+    # Call Groq with JSON mode (parsed, escalated to the large model if unusable)
+    data, model = json_chat_completion_with_model(
+        state["groq_api_key"], "core_message", REQUIRED_KEYS, **_build_request(state)
+    )
+    _save_cached(state, data, model)
+    
+    return _apply_core_message(state, data)
+
+
+async def extract_core_message_node_async(state: RepurposingState) -> RepurposingState:
+    """Awaitable variant of extract_core_message_node built on AsyncGroq."""
+    cached = _load_cached(state)
+    if cached:
+        return _apply_core_message(state, cached, cached=True)
+    
+    print("🧠 [CORE MESSAGE] Extracting core message with engagement analysis...")
+    
+    data, model = await ajson_chat_completion_with_model(
+        state["groq_api_key"], "core_message", REQUIRED_KEYS, **_build_request(state)
+    )
+    _save_cached(state, data, model)
+    
+    return _apply_core_message(state, data)
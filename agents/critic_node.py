@@ -1,51 +1,12 @@
 """Critic Node for LangGraph with AI Detection Check."""
 import json
-from groq import Groq
+from typing import Any, Dict
+from utils.llm_client import chat_completion, achat_completion, get_node_model
 from .schemas import RepurposingState, CritiqueResult
-from .prompts import CRITIC_PROMPT, PLATFORM_RULES
-from config import GROQ_MODEL
+from .prompts import PLATFORM_RULES, get_prompt
 
 
-def critique_content_node(state: RepurposingState, platform: str) -> RepurposingState:
-    """
-    Critiques generated content for quality, compliance, AND human authenticity.
-    
-    Enhanced to check:
-    - Platform compliance (character limits, structure)
-    - Engagement potential
-    - AI detection patterns (em dashes, banned words, etc.)
-    - Human authenticity markers
-    
-    Returns PASS/FAIL status with specific improvement suggestions.
-    """
-    # Skip critique for A/B variations
-    if state.get("ab_testing", False):
-        state["critiques"][platform] = CritiqueResult(
-            status="PASS",
-            reasoning="A/B variations generated - skipping critique",
-            suggested_revision="",
-            predicted_score=85
-        )
-        return state
-    
-    print(f"🔍 [CRITIC] Evaluating {platform} content for quality and authenticity...")
-    
-    client = Groq(api_key=state["groq_api_key"])
-    draft = state["drafts"].get(platform, "")
-    
-    prompt = CRITIC_PROMPT.format(
-        platform=platform,
-        audience=state["audience"],
-        platform_rules=PLATFORM_RULES.get(platform, ""),
-        draft=draft
-    )
-    
-    response = client.chat.completions.create(
-        model=GROQ_MODEL,
-        messages=[
-            {
-                "role": "system",
-                "content": """You are a ruthless Content Editor who detects AI-generated content and ensures human authenticity.
+CRITIC_SYSTEM_PROMPT = """You are a ruthless Content Editor who detects AI-generated content and ensures human authenticity.
 
 CRITIQUE PRIORITIES:
 1. AI DETECTION (CRITICAL): 
@@ -80,18 +41,46 @@ Return valid JSON with keys:
 - strengths: what's working well
 
 Be STRICT on AI detection. Content that sounds robotic is an automatic FAIL."""
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        response_format={"type": "json_object"},
-        temperature=0.2  # Low temp for consistent evaluation
+
+
+def _skip_ab_critique(state: RepurposingState, platform: str) -> bool:
+    """Record an automatic PASS for A/B variations, which are never critiqued."""
+    if not state.get("ab_testing", False):
+        return False
+    
+    state["critiques"][platform] = CritiqueResult(
+        status="PASS",
+        reasoning="A/B variations generated - skipping critique",
+        suggested_revision="",
+        predicted_score=85
     )
+    return True
+
+
+def _build_request(state: RepurposingState, platform: str) -> Dict[str, Any]:
+    """Build the chat completion arguments for critiquing a draft."""
+    draft = state["drafts"].get(platform, "")
     
-    data = json.loads(response.choices[0].message.content)
+    prompt = get_prompt("critic").format(
+        platform=platform,
+        audience=state["audience"],
+        platform_rules=PLATFORM_RULES.get(platform, ""),
+        draft=draft
+    )
     
+    return {
+        "model": get_node_model("critic"),
+        "messages": [
+            {"role": "system", "content": CRITIC_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.2,  # Low temp for consistent evaluation
+    }
+
+
+def _apply_critique(state: RepurposingState, platform: str, data: Dict[str, Any]) -> RepurposingState:
+    """Store the parsed critique and AI issues in state."""
     # Extract AI detection issues for the reviser
     ai_issues = data.get("ai_detection_issues", [])
     
@@ -117,3 +106,42 @@ Be STRICT on AI detection. Content that sounds robotic is an automatic FAIL."""
         print(f"   💪 Strengths: {data['strengths'][:100]}...")
     
     return state
+
+
+def critique_content_node(state: RepurposingState, platform: str) -> RepurposingState:
+    """
+    Critiques generated content for quality, compliance, AND human authenticity.
+    
+    Enhanced to check:
+    - Platform compliance (character limits, structure)
+    - Engagement potential
+    - AI detection patterns (em dashes, banned words, etc.)
+    - Human authenticity markers
+    
+    Returns PASS/FAIL status with specific improvement suggestions.
+    """
+    # Skip critique for A/B variations
+    if _skip_ab_critique(state, platform):
+        return state
+    
+    print(f"🔍 [CRITIC] Evaluating {platform} content for quality and authenticity...")
+    
+    content = chat_completion(state["groq_api_key"], "critic", **_build_request(state, platform))
+    
+    data = json.loads(content)
+    
+    return _apply_critique(state, platform, data)
+
+
+async def critique_content_node_async(state: RepurposingState, platform: str) -> RepurposingState:
+    """Awaitable variant of critique_content_node built on AsyncGroq."""
+    if _skip_ab_critique(state, platform):
+        return state
+    
+    print(f"🔍 [CRITIC] Evaluating {platform} content for quality and authenticity...")
+    
+    content = await achat_completion(state["groq_api_key"], "critic", **_build_request(state, platform))
+    
+    data = json.loads(content)
+    
+    return _apply_critique(state, platform, data)
@@ -1,81 +1,28 @@
 """Content Generator Node for LangGraph with Enhanced Human-Like Output."""
 import json
-from groq import Groq
-from typing import List
+from utils.llm_client import (
+    chat_completion,
+    achat_completion,
+    stream_chat_completion,
+    astream_chat_completion,
+    get_node_model,
+)
+from utils.events import emit_event
+from utils.hedging import get_hedge_policy
+from utils.content_cleaner import StreamingCleaner
+from typing import Any, Dict, List, Optional
 from .schemas import RepurposingState
 from .prompts import (
-    GENERATOR_PROMPT, 
-    VARIATIONS_PROMPT, 
     PLATFORM_RULES,
-    ANTI_AI_RULES,
-    HOOK_FORMULAS,
-    ENGAGEMENT_RULES,
-    get_enhanced_generator_prompt,
-    get_enhanced_variations_prompt
+    get_prompt,
+    render_insights,
+    render_style_instructions,
 )
-from config import GROQ_MODEL
+from utils.metrics import increment
+from config import ENABLE_STREAMING
 
 
-def generate_content_node(state: RepurposingState, platform: str) -> RepurposingState:
-    """
-    Generates human-like content for a specific platform.
-    
-    Features:
-    - Anti-AI detection patterns
-    - Viral hook formulas
-    - Engagement engineering
-    - Style matching from user's best posts
-    
-    Can generate either:
-    - Single draft (normal mode)
-    - 3 variations (A/B testing mode)
-    """
-    print(f"✍️ [GENERATOR] Generating human-like content for {platform}...")
-    
-    client = Groq(api_key=state["groq_api_key"])
-    core_msg = state["core_message"]
-    
-    # Prepare style instructions
-    style_instructions = ""
-    if state.get("style_guide"):
-        from .prompts import STYLE_GUIDE_INSTRUCTIONS
-        style = state["style_guide"]
-        
-        style_instructions = STYLE_GUIDE_INSTRUCTIONS.format(
-            writing_style=style.get("writing_style", "N/A"),
-            hook_patterns="\n".join(f"- {p}" for p in style.get("hook_patterns", [])),
-            story_structure=style.get("story_structure", "N/A"),
-            cta_style=style.get("cta_style", "N/A"),
-            emoji_usage=style.get("emoji_usage", "N/A"),
-            sentence_length=style.get("sentence_length", "N/A"),
-            unique_phrases="\n".join(f"- {p}" for p in style.get("unique_phrases", [])),
-            formatting_style=style.get("formatting_style", "N/A")
-        )
-        print(f"   🎨 [GENERATOR] Using personalized style guide!")
-    
-    # A/B Testing mode - 3 variations
-    if state.get("ab_testing", False):
-        # Use enhanced variations prompt with anti-AI rules
-        prompt = get_enhanced_variations_prompt().format(
-            platform=platform,
-            audience=state["audience"],
-            platform_rules=PLATFORM_RULES.get(platform, ""),
-            topic=core_msg["topic"],
-            thesis=core_msg["thesis"],
-            insights="\n".join(f"- {i}" for i in core_msg["insights"])
-        )
-        
-        # Try up to 2 times to get 3 variations
-        variations = []
-        max_attempts = 2
-        
-        for attempt in range(max_attempts):
-            response = client.chat.completions.create(
-                model=GROQ_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are a top-performing content creator known for viral, authentic posts.
+VARIATIONS_SYSTEM_PROMPT = """You are a top-performing content creator known for viral, authentic posts.
 
 CRITICAL: Return valid JSON with EXACTLY this structure:
 {
@@ -95,91 +42,8 @@ RULES FOR EACH VARIATION:
 - Each variation must be COMPLETE and ready to post
 
 You MUST return exactly 3 variations in the 'variations' array."""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.85
-            )
-            
-            data = json.loads(response.choices[0].message.content)
-            
-            # Try to extract variations from various possible response formats
-            if isinstance(data.get("variations"), list):
-                variations = data["variations"]
-            elif isinstance(data.get("variation"), list):
-                variations = data["variation"]
-            else:
-                # Try numbered keys like variation_1, variation_2, etc.
-                variations = []
-                for key in ["variation_1", "variation_2", "variation_3", "v1", "v2", "v3", "1", "2", "3"]:
-                    if key in data and isinstance(data[key], str):
-                        variations.append(data[key])
-                
-                # If still no variations, try to get any string values
-                if not variations:
-                    for key, value in data.items():
-                        if isinstance(value, str) and len(value) > 50:
-                            variations.append(value)
-            
-            # Check if we got 3 variations
-            if len(variations) >= 3:
-                variations = variations[:3]  # Take only first 3
-                break
-            elif attempt < max_attempts - 1:
-                print(f"   ⚠️ Got {len(variations)} variations, retrying...")
-        
-        # If we still don't have 3, pad with copies or generate more
-        if len(variations) == 0:
-            # Fallback: generate a single draft and use it
-            print("   ⚠️ No variations found, generating single drafts...")
-            single_response = client.chat.completions.create(
-                model=GROQ_MODEL,
-                messages=[
-                    {"role": "system", "content": "Create 3 distinct variations of this content. Return them separated by '---VARIATION---'"},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.9
-            )
-            content = single_response.choices[0].message.content
-            if "---VARIATION---" in content:
-                variations = [v.strip() for v in content.split("---VARIATION---") if v.strip()][:3]
-            else:
-                variations = [content]  # At least have something
-        
-        # Ensure we have exactly 3 variations
-        while len(variations) < 3:
-            if variations:
-                # Duplicate the last variation with a note
-                variations.append(variations[-1])
-            else:
-                variations.append("Variation generation failed. Please try again.")
-        
-        state["drafts"][platform] = variations[:3]
-        print(f"✅ [GENERATOR] Created {len(variations[:3])} variations for {platform}")
-    
-    # Normal mode - single draft
-    else:
-        # Use enhanced generator prompt with all anti-AI rules injected
-        prompt = get_enhanced_generator_prompt().format(
-            platform=platform,
-            audience=state["audience"],
-            platform_rules=PLATFORM_RULES.get(platform, ""),
-            topic=core_msg["topic"],
-            thesis=core_msg["thesis"],
-            insights="\n".join(f"- {i}" for i in core_msg["insights"]),
-            style_instructions=style_instructions
-        )
-        
-        response = client.chat.completions.create(
-            model=GROQ_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are a top-performing content creator known for authentic, engaging posts that go viral.
+
+GENERATOR_SYSTEM_PROMPT = """You are a top-performing content creator known for authentic, engaging posts that go viral.
 
 CRITICAL RULES (MUST FOLLOW):
 1. NEVER use em dashes (—). Use commas or periods.
@@ -192,18 +56,366 @@ CRITICAL RULES (MUST FOLLOW):
 8. Be slightly imperfect. That's human.
 
 Create content that passes AI detection tests by being genuinely human."""
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.75  # Balanced creativity and coherence
-        )
-        
-        state["drafts"][platform] = response.choices[0].message.content
+
+MULTI_PLATFORM_SYSTEM_PROMPT = GENERATOR_SYSTEM_PROMPT + """
+
+Return valid JSON: one key per requested platform, each holding that platform's complete post."""
+
+# A/B mode: attempts at getting 3 variations before falling back
+MAX_VARIATION_ATTEMPTS = 2
+
+
+def _build_style_instructions(state: RepurposingState) -> str:
+    """The personalized style guide block (empty without a style guide), rendered once per guide."""
+    if not state.get("style_guide"):
+        return ""
+    
+    style_instructions = render_style_instructions(state["style_guide"])
+    print(f"   🎨 [GENERATOR] Using personalized style guide!")
+    return style_instructions
+
+
+def _build_variations_prompt(state: RepurposingState, platform: str) -> str:
+    """Render the A/B variations prompt."""
+    core_msg = state["core_message"]
+    
+    # Use enhanced variations prompt with anti-AI rules
+    return get_prompt("variations").format(
+        platform=platform,
+        audience=state["audience"],
+        platform_rules=PLATFORM_RULES.get(platform, ""),
+        topic=core_msg["topic"],
+        thesis=core_msg["thesis"],
+        insights=render_insights(core_msg["insights"])
+    )
+
+
+def _build_variations_request(prompt: str) -> Dict[str, Any]:
+    """Chat completion arguments for the JSON-mode variations call."""
+    return {
+        "model": get_node_model("generator"),
+        "messages": [
+            {"role": "system", "content": VARIATIONS_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.85,
+    }
+
+
+def _build_fallback_variations_request(prompt: str) -> Dict[str, Any]:
+    """Chat completion arguments for the plain-text variations fallback."""
+    return {
+        "model": get_node_model("generator"),
+        "messages": [
+            {"role": "system", "content": "Create 3 distinct variations of this content. Return them separated by '---VARIATION---'"},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.9,
+    }
+
+
+def _build_single_request(state: RepurposingState, platform: str) -> Dict[str, Any]:
+    """Chat completion arguments for a single-draft generation."""
+    core_msg = state["core_message"]
+    
+    # Use enhanced generator prompt with all anti-AI rules injected
+    prompt = get_prompt("generator").format(
+        platform=platform,
+        audience=state["audience"],
+        platform_rules=PLATFORM_RULES.get(platform, ""),
+        topic=core_msg["topic"],
+        thesis=core_msg["thesis"],
+        insights=render_insights(core_msg["insights"]),
+        style_instructions=_build_style_instructions(state)
+    )
+    
+    return {
+        "model": get_node_model("generator"),
+        "messages": [
+            {"role": "system", "content": GENERATOR_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.75,  # Balanced creativity and coherence
+    }
+
+
+def _build_multi_platform_request(state: RepurposingState, platforms: List[str]) -> Dict[str, Any]:
+    """Chat completion arguments for generating every platform in one JSON-mode call."""
+    core_msg = state["core_message"]
+    
+    prompt = get_prompt("multi_platform").format(
+        platforms=", ".join(platforms),
+        audience=state["audience"],
+        platform_rules="\n".join(f"### {p}{PLATFORM_RULES.get(p, '')}" for p in platforms),
+        topic=core_msg["topic"],
+        thesis=core_msg["thesis"],
+        insights=render_insights(core_msg["insights"]),
+        style_instructions=_build_style_instructions(state)
+    )
+    
+    return {
+        "model": get_node_model("generator"),
+        "messages": [
+            {"role": "system", "content": MULTI_PLATFORM_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.75,
+    }
+
+
+def _extract_platform_drafts(content: str, platforms: List[str]) -> Dict[str, str]:
+    """
+    Drafts from a multi-platform response, by platform. Platforms that are
+    missing, empty or not a string are left out (so is everything when the
+    response isn't a JSON object).
+    """
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    if isinstance(data.get("platforms"), dict):
+        data = data["platforms"]
+    
+    # Match keys loosely ("twitter/x", " LinkedIn ")
+    by_key = {str(key).strip().lower(): value for key, value in data.items()}
+    drafts = {}
+    for platform in platforms:
+        draft = by_key.get(platform.lower())
+        if isinstance(draft, str) and draft.strip():
+            drafts[platform] = draft.strip()
+    return drafts
+
+
+def _extract_variations(data: Dict[str, Any]) -> List[str]:
+    """Pull variations out of the various response shapes the model returns."""
+    # Try to extract variations from various possible response formats
+    if isinstance(data.get("variations"), list):
+        return data["variations"]
+    if isinstance(data.get("variation"), list):
+        return data["variation"]
+    
+    # Try numbered keys like variation_1, variation_2, etc.
+    variations = []
+    for key in ["variation_1", "variation_2", "variation_3", "v1", "v2", "v3", "1", "2", "3"]:
+        if key in data and isinstance(data[key], str):
+            variations.append(data[key])
+    
+    # If still no variations, try to get any string values
+    if not variations:
+        for key, value in data.items():
+            if isinstance(value, str) and len(value) > 50:
+                variations.append(value)
+    
+    return variations
+
+
+def _split_fallback_variations(content: str) -> List[str]:
+    """Split the plain-text fallback response into variations."""
+    if "---VARIATION---" in content:
+        return [v.strip() for v in content.split("---VARIATION---") if v.strip()][:3]
+    return [content]  # At least have something
+
+
+def _store_variations(state: RepurposingState, platform: str, variations: List[str]) -> RepurposingState:
+    """Pad to exactly 3 variations and store them as the platform draft."""
+    # Ensure we have exactly 3 variations
+    while len(variations) < 3:
+        if variations:
+            # Duplicate the last variation with a note
+            variations.append(variations[-1])
+        else:
+            variations.append("Variation generation failed. Please try again.")
+    
+    state["drafts"][platform] = variations[:3]
+    print(f"✅ [GENERATOR] Created {len(variations[:3])} variations for {platform}")
+    return state
+
+
+def _store_platform_drafts(state: RepurposingState, platforms: List[str], drafts: Dict[str, str]) -> RepurposingState:
+    """Store the drafts a multi-platform call produced; the rest fall back."""
+    for platform, draft in drafts.items():
+        state["drafts"][platform] = draft
         state["iterations"][platform] = 0
-        
-        print(f"✅ [GENERATOR] Created human-like draft for {platform}")
     
+    missing = [p for p in platforms if p not in drafts]
+    increment("generator.multi_platform.calls")
+    increment("generator.multi_platform.fallbacks", len(missing))
+    if missing:
+        print(f"⚠️ [GENERATOR] Multi-platform call missed {', '.join(missing)}, generating separately")
+    print(f"✅ [GENERATOR] Created {len(drafts)}/{len(platforms)} drafts in one call")
+    return state
+
+
+def _store_single_draft(state: RepurposingState, platform: str, draft: str) -> RepurposingState:
+    """Store a single generated draft."""
+    state["drafts"][platform] = draft
+    state["iterations"][platform] = 0
+    
+    print(f"✅ [GENERATOR] Created human-like draft for {platform}")
     return state
+
+
+def _should_stream() -> bool:
+    """
+    Stream single drafts unless the generator hedges: streams aren't
+    hedged, so hedging takes the non-streaming path (no draft_delta events).
+    """
+    return ENABLE_STREAMING and get_hedge_policy("generator") is None
+
+
+class _DraftStreamer:
+    """
+    Cleans streamed tokens and forwards them as draft_delta events.
+    
+    Deltas are run through StreamingCleaner so em dashes and banned words
+    never reach the UI; the streamed text matches the final cleaned draft.
+    """
+    
+    def __init__(self, platform: str, rule_pack: Optional[str] = None):
+        self.platform = platform
+        self.rule_pack = rule_pack
+        self._restart()
+    
+    def _restart(self):
+        self.cleaner = StreamingCleaner(self.rule_pack)
+        self.text = ""
+    
+    def on_delta(self, delta: str, text: str) -> None:
+        if delta == text:
+            self._restart()  # First chunk of a new (possibly retried) attempt
+        self._send(self.cleaner.feed(delta))
+    
+    def finish(self) -> None:
+        self._send(self.cleaner.flush())
+    
+    def _send(self, cleaned: str) -> None:
+        if not cleaned:
+            return
+        self.text += cleaned
+        emit_event({
+            "type": "draft_delta",
+            "platform": self.platform,
+            "delta": cleaned,
+            "text": self.text,
+        })
+
+
+def generate_content_node(state: RepurposingState, platform: str) -> RepurposingState:
+    """
+    Generates human-like content for a specific platform.
+    
+    Features:
+    - Anti-AI detection patterns
+    - Viral hook formulas
+    - Engagement engineering
+    - Style matching from user's best posts
+    
+    Can generate either:
+    - Single draft (normal mode), streamed as draft_delta events
+    - 3 variations (A/B testing mode)
+    """
+    print(f"✍️ [GENERATOR] Generating human-like content for {platform}...")
+    
+    # Normal mode - single draft
+    if not state.get("ab_testing", False):
+        request = _build_single_request(state, platform)
+        if _should_stream():
+            streamer = _DraftStreamer(platform, state.get("rule_pack"))
+            content = stream_chat_completion(
+                state["groq_api_key"], "generator", streamer.on_delta, **request
+            )
+            streamer.finish()
+        else:
+            content = chat_completion(state["groq_api_key"], "generator", **request)
+        return _store_single_draft(state, platform, content)
+    
+    # A/B Testing mode - 3 variations
+    prompt = _build_variations_prompt(state, platform)
+    
+    # Try up to 2 times to get 3 variations
+    variations = []
+    for attempt in range(MAX_VARIATION_ATTEMPTS):
+        content = chat_completion(state["groq_api_key"], "generator", **_build_variations_request(prompt))
+        variations = _extract_variations(json.loads(content))
+        
+        # Check if we got 3 variations
+        if len(variations) >= 3:
+            variations = variations[:3]  # Take only first 3
+            break
+        elif attempt < MAX_VARIATION_ATTEMPTS - 1:
+            print(f"   ⚠️ Got {len(variations)} variations, retrying...")
+    
+    # If we still don't have 3, pad with copies or generate more
+    if len(variations) == 0:
+        # Fallback: generate a single draft and use it
+        print("   ⚠️ No variations found, generating single drafts...")
+        fallback_content = chat_completion(state["groq_api_key"], "generator", **_build_fallback_variations_request(prompt))
+        variations = _split_fallback_variations(fallback_content)
+    
+    return _store_variations(state, platform, variations)
+
+
+async def generate_content_node_async(state: RepurposingState, platform: str) -> RepurposingState:
+    """Awaitable variant of generate_content_node built on AsyncGroq."""
+    print(f"✍️ [GENERATOR] Generating human-like content for {platform}...")
+    
+    if not state.get("ab_testing", False):
+        request = _build_single_request(state, platform)
+        if _should_stream():
+            streamer = _DraftStreamer(platform, state.get("rule_pack"))
+            content = await astream_chat_completion(
+                state["groq_api_key"], "generator", streamer.on_delta, **request
+            )
+            streamer.finish()
+        else:
+            content = await achat_completion(state["groq_api_key"], "generator", **request)
+        return _store_single_draft(state, platform, content)
+    
+    prompt = _build_variations_prompt(state, platform)
+    
+    variations = []
+    for attempt in range(MAX_VARIATION_ATTEMPTS):
+        content = await achat_completion(state["groq_api_key"], "generator", **_build_variations_request(prompt))
+        variations = _extract_variations(json.loads(content))
+        
+        if len(variations) >= 3:
+            variations = variations[:3]
+            break
+        elif attempt < MAX_VARIATION_ATTEMPTS - 1:
+            print(f"   ⚠️ Got {len(variations)} variations, retrying...")
+    
+    if len(variations) == 0:
+        print("   ⚠️ No variations found, generating single drafts...")
+        fallback_content = await achat_completion(state["groq_api_key"], "generator", **_build_fallback_variations_request(prompt))
+        variations = _split_fallback_variations(fallback_content)
+    
+    return _store_variations(state, platform, variations)
+
+
+def generate_all_platforms_node(state: RepurposingState, platforms: List[str]) -> RepurposingState:
+    """
+    Generates single drafts for several platforms in one JSON-mode call.
+    
+    The long shared prompt (anti-AI rules, hook formulas, core message,
+    style guide) is sent once instead of once per platform. Platforms the
+    response doesn't cover get no draft; the caller generates those with
+    generate_content_node.
+    """
+    print(f"✍️ [GENERATOR] Generating human-like content for {len(platforms)} platforms in one call...")
+    
+    request = _build_multi_platform_request(state, platforms)
+    content = chat_completion(state["groq_api_key"], "generator", **request)
+    return _store_platform_drafts(state, platforms, _extract_platform_drafts(content, platforms))
+
+
+async def generate_all_platforms_node_async(state: RepurposingState, platforms: List[str]) -> RepurposingState:
+    """Awaitable variant of generate_all_platforms_node built on AsyncGroq."""
+    print(f"✍️ [GENERATOR] Generating human-like content for {len(platforms)} platforms in one call...")
+    
+    request = _build_multi_platform_request(state, platforms)
+    content = await achat_completion(state["groq_api_key"], "generator", **request)
+    return _store_platform_drafts(state, platforms, _extract_platform_drafts(content, platforms))
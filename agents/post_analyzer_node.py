@@ -1,16 +1,18 @@
 """Post Analyzer Node - Extracts writing style from user's best posts with enhanced voice cloning."""
-import json
-from groq import Groq
+import hashlib
+from typing import Any, Dict, Optional
+from utils.llm_client import (
+    json_chat_completion_with_model,
+    ajson_chat_completion_with_model,
+    get_node_model,
+    get_escalation_model,
+)
 from .schemas import RepurposingState
-from config import GROQ_MODEL
 
 
 STYLE_ANALYSIS_PROMPT = """You are an expert Content Analyst who can clone a writer's unique voice and style.
 
-Analyze these high-performing posts deeply to extract EXACTLY what makes this author's content unique.
-
-Posts to analyze:
-{posts}
+Analyze the high-performing posts below deeply to extract EXACTLY what makes this author's content unique.
 
 EXTRACT AND RETURN VALID JSON WITH THESE KEYS:
 
@@ -19,51 +21,51 @@ EXTRACT AND RETURN VALID JSON WITH THESE KEYS:
    - Confident or humble?
    - Provocative or safe?
    - What emotions do they evoke?
-   
+
 2. "hook_patterns": List of 3-5 SPECIFIC hook types they use
    - Don't just say "uses questions" - give examples like "Opens with controversial statements that challenge common wisdom"
    - What makes their first lines scroll-stopping?
-   
+
 3. "story_structure": How they organize content
    - Do they go problem→solution→action?
    - Do they use numbered lists?
    - How do they transition between ideas?
    - Do they use cliffhangers or teasers?
-   
+
 4. "cta_style": How they end posts
    - Do they ask questions?
    - Do they invite debate?
    - Direct or subtle?
-   
+
 5. "emoji_usage": Specific emoji patterns
    - Which emojis do they use?
    - Where do they place them?
    - Frequency?
-   
+
 6. "sentence_length": Their rhythm and pacing
    - Do they use fragments?
    - Long flowing sentences?
    - Mix of both?
    - One-word sentences for impact?
-   
+
 7. "unique_phrases": List of 5-10 ACTUAL phrases or patterns they use
    - Words they favor
    - Transition phrases
    - Opening patterns
    - Signature expressions
-   
+
 8. "formatting_style": Visual structure
    - Line breaks?
    - Bullet points?
    - Bold/emphasis?
    - Paragraph length?
-   
+
 9. "personality_markers": What makes them THEM
    - Humor style?
    - Self-deprecation?
    - Confidence level?
    - How they relate to audience?
-   
+
 10. "content_themes": What topics/angles they gravitate toward
     - Do they favor personal stories?
     - Data-driven content?
@@ -71,26 +73,34 @@ EXTRACT AND RETURN VALID JSON WITH THESE KEYS:
 
 Be EXTREMELY SPECIFIC. Generic insights are useless. 
 The goal is to generate new content that sounds exactly like them.
+
+Posts to analyze:
+{posts}
 """
 
 
-def analyze_best_posts_node(state: RepurposingState) -> RepurposingState:
+STYLE_ANALYSIS_SYSTEM_PROMPT = """You are an expert Content Analyst specializing in voice cloning and style analysis.
+
+Your job is to extract everything that makes a writer unique so we can generate content that sounds EXACTLY like them.
+
+Be extremely specific. Don't say "uses casual tone" - say "uses contractions frequently, starts sentences with 'Look,' and 'Here's the thing:', often includes self-deprecating humor about past failures."
+
+Return valid JSON with all requested keys. Be detailed and actionable."""
+
+# A response without these is escalated to the larger model (see LLM_NODE_MODELS)
+REQUIRED_KEYS = ("writing_style", "hook_patterns", "unique_phrases")
+
+# Cache keys include this so editing either prompt invalidates old entries
+STYLE_PROMPT_VERSION = hashlib.sha256(
+    (STYLE_ANALYSIS_SYSTEM_PROMPT + STYLE_ANALYSIS_PROMPT).encode()
+).hexdigest()[:12]
+
+
+def _check_preconditions(state: RepurposingState) -> Optional[RepurposingState]:
     """
-    Analyzes user's best performing posts to extract writing style patterns.
-    
-    Enhanced to extract:
-    - Voice and personality markers
-    - Specific phrases and patterns
-    - Structural preferences
-    - Engagement tactics
+    Handle the no-posts and cached-style cases.
     
-    Creates a comprehensive style guide for voice cloning.
-    
-    Args:
-        state: Current workflow state
-    
-    Returns:
-        Updated state with detailed style_guide
+    Returns the updated state when no LLM call is needed, otherwise None.
     """
     # Skip if no best posts provided
     if not state.get("best_posts") or not state["best_posts"].strip():
@@ -98,51 +108,42 @@ def analyze_best_posts_node(state: RepurposingState) -> RepurposingState:
         state["style_guide"] = None
         return state
     
-    # Check cache first
+    # Check cache first (entries are keyed on the model that produced them)
     from utils import CacheManager
-    cached_style = CacheManager.get_cached_style(state["best_posts"])
-    
-    if cached_style:
-        state["style_guide"] = cached_style
-        return state
-    
-    print("🔍 [POST ANALYZER] Deep-analyzing user's best posts for voice cloning...")
-    
-    client = Groq(api_key=state["groq_api_key"])
+    for model in (get_node_model("post_analyzer"), get_escalation_model("post_analyzer")):
+        if model:
+            cached_style = CacheManager.get_cached_style(state["best_posts"], model, STYLE_PROMPT_VERSION)
+            if cached_style:
+                state["style_guide"] = cached_style
+                return state
     
+    return None
+
+
+def _build_request(state: RepurposingState) -> Dict[str, Any]:
+    """Build the chat completion arguments for style analysis."""
     # Create prompt
     prompt = STYLE_ANALYSIS_PROMPT.format(posts=state["best_posts"])
     
-    # Call Groq with JSON mode
-    response = client.chat.completions.create(
-        model=GROQ_MODEL,
-        messages=[
-            {
-                "role": "system",
-                "content": """You are an expert Content Analyst specializing in voice cloning and style analysis.
+    return {
+        "model": get_node_model("post_analyzer"),
+        "messages": [
+            {"role": "system", "content": STYLE_ANALYSIS_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.3,
+    }
 
-Your job is to extract everything that makes a writer unique so we can generate content that sounds EXACTLY like them.
 
-Be extremely specific. Don't say "uses casual tone" - say "uses contractions frequently, starts sentences with 'Look,' and 'Here's the thing:', often includes self-deprecating humor about past failures."
-
-Return valid JSON with all requested keys. Be detailed and actionable."""
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        response_format={"type": "json_object"},
-        temperature=0.3
-    )
-    
-    # Parse JSON response
-    style_data = json.loads(response.choices[0].message.content)
+def _apply_style_guide(state: RepurposingState, style_data: Dict[str, Any], model: str) -> RepurposingState:
+    """Store the extracted style guide in state and in the cache (under the model that answered)."""
+    from utils import CacheManager
     
     state["style_guide"] = style_data
     
     # Save to cache
-    CacheManager.save_style(state["best_posts"], style_data)
+    CacheManager.save_style(state["best_posts"], model, STYLE_PROMPT_VERSION, style_data)
     
     print(f"✅ [POST ANALYZER] Voice profile created:")
     print(f"   🎭 Style: {style_data.get('writing_style', 'N/A')[:60]}...")
@@ -151,3 +152,50 @@ Return valid JSON with all requested keys. Be detailed and actionable."""
     print(f"   🎨 Personality: {style_data.get('personality_markers', 'N/A')[:50] if isinstance(style_data.get('personality_markers'), str) else 'Analyzed'}...")
     
     return state
+
+
+def analyze_best_posts_node(state: RepurposingState) -> RepurposingState:
+    """
+    Analyzes user's best performing posts to extract writing style patterns.
+    
+    Enhanced to extract:
+    - Voice and personality markers
+    - Specific phrases and patterns
+    - Structural preferences
+    - Engagement tactics
+    
+    Creates a comprehensive style guide for voice cloning.
+    
+    Args:
+        state: Current workflow state
+    
+    Returns:
+        Updated state with detailed style_guide
+    """
+    early_state = _check_preconditions(state)
+    if early_state is not None:
+        return early_state
+    
+    print("🔍 [POST ANALYZER] Deep-analyzing user's best posts for voice cloning...")
+    
+    # Call Groq with JSON mode (parsed, escalated to the large model if unusable)
+    style_data, model = json_chat_completion_with_model(
+        state["groq_api_key"], "post_analyzer", REQUIRED_KEYS, **_build_request(state)
+    )
+    
+    return _apply_style_guide(state, style_data, model)
+
+
+async def analyze_best_posts_node_async(state: RepurposingState) -> RepurposingState:
+    """Awaitable variant of analyze_best_posts_node built on AsyncGroq."""
+    early_state = _check_preconditions(state)
+    if early_state is not None:
+        return early_state
+    
+    print("🔍 [POST ANALYZER] Deep-analyzing user's best posts for voice cloning...")
+    
+    style_data, model = await ajson_chat_completion_with_model(
+        state["groq_api_key"], "post_analyzer", REQUIRED_KEYS, **_build_request(state)
+    )
+    
+    return _apply_style_guide(state, style_data, model)
@@ -8,6 +8,11 @@ Features:
 - Viral hook formulas
 - Human authenticity markers
 """
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Dict, List
+
 
 # ============================================================================
 # ANTI-AI DETECTION RULES (Applied to ALL content)
@@ -432,9 +437,9 @@ Text to analyze:
 # GENERATOR PROMPT (MAIN CONTENT CREATION)
 # ============================================================================
 
-GENERATOR_PROMPT = """You are a top-performing content creator for {platform} with a track record of viral posts.
+GENERATOR_PROMPT = """You are a top-performing content creator with a track record of viral posts.
 
-Your job: Transform this core message into content that feels genuinely human and drives engagement.
+Your job: Transform the core message below into content for the platform below that feels genuinely human and drives engagement.
 
 {anti_ai_rules}
 
@@ -442,25 +447,59 @@ Your job: Transform this core message into content that feels genuinely human an
 
 {engagement_rules}
 
-TARGET AUDIENCE: {audience}
+CONTENT REQUIREMENTS:
+1. Start with a hook that stops the scroll (use one of the hook formulas)
+2. Sound like a real person, not a content mill
+3. Include at least one specific detail (number, date, name)
+4. Vary your sentence rhythm (short. Then longer flowing ones.)
+5. Leave room for comments (don't wrap up too perfectly)
+6. Follow ALL platform constraints (character limits, hashtags, structure)
+
+FINAL CHECK (verify before output):
+- No em dashes (—) anywhere
+- No quotation marks for emphasis
+- No banned words from the list
+- At least 2 different sentence lengths
+- At least 1 human authenticity marker
+- Sounds like YOU wrote it, not an AI assistant
+
+PLATFORM: {platform}
 
 PLATFORM RULES (FOLLOW STRICTLY):
 {platform_rules}
+{style_instructions}
+TARGET AUDIENCE: {audience}
 
 CORE MESSAGE:
 - Topic: {topic}
 - Thesis: {thesis}
 - Insights: {insights}
 
-{style_instructions}
+Output ONLY the final content. No explanations, no meta-commentary.
+"""
 
-CONTENT REQUIREMENTS:
+# ============================================================================
+# MULTI-PLATFORM PROMPT (all platforms in one JSON-mode call)
+# ============================================================================
+
+MULTI_PLATFORM_PROMPT = """You are a top-performing content creator with a track record of viral posts on every major platform.
+
+Your job: Transform this core message into one post per platform below, each feeling genuinely human and native to its platform.
+
+{anti_ai_rules}
+
+{hook_formulas}
+
+{engagement_rules}
+
+CONTENT REQUIREMENTS (for EACH platform):
 1. Start with a hook that stops the scroll (use one of the hook formulas)
 2. Sound like a real person, not a content mill
 3. Include at least one specific detail (number, date, name)
 4. Vary your sentence rhythm (short. Then longer flowing ones.)
 5. Leave room for comments (don't wrap up too perfectly)
-6. Follow ALL platform constraints (character limits, hashtags, structure)
+6. Follow ALL of that platform's constraints (character limits, hashtags, structure)
+7. Write each post for its own platform. Don't reuse the same text across platforms.
 
 FINAL CHECK (verify before output):
 - No em dashes (—) anywhere
@@ -470,7 +509,18 @@ FINAL CHECK (verify before output):
 - At least 1 human authenticity marker
 - Sounds like YOU wrote it, not an AI assistant
 
-Output ONLY the final content. No explanations, no meta-commentary.
+PLATFORMS AND THEIR RULES (FOLLOW STRICTLY):
+{platform_rules}
+{style_instructions}
+TARGET AUDIENCE: {audience}
+
+CORE MESSAGE:
+- Topic: {topic}
+- Thesis: {thesis}
+- Insights: {insights}
+
+Output valid JSON: a JSON object keyed by platform name, using exactly these keys: {platforms}
+Each value is the complete, ready-to-post content for that platform as a string.
 """
 
 # ============================================================================
@@ -516,16 +566,6 @@ VARIATIONS_PROMPT = """You are a top-tier content strategist creating A/B test v
 
 Create 3 DISTINCTLY DIFFERENT versions for testing. Each should feel fresh, not like the same post reworded.
 
-TARGET AUDIENCE: {audience}
-
-PLATFORM RULES:
-{platform_rules}
-
-CORE MESSAGE:
-- Topic: {topic}
-- Thesis: {thesis}
-- Insights: {insights}
-
 GENERATE 3 VARIATIONS:
 
 VARIATION 1 - CONTRARIAN/BOLD:
@@ -552,6 +592,18 @@ Each variation must:
 - Have a unique hook
 - Feel human and authentic
 
+PLATFORM: {platform}
+
+PLATFORM RULES:
+{platform_rules}
+
+TARGET AUDIENCE: {audience}
+
+CORE MESSAGE:
+- Topic: {topic}
+- Thesis: {thesis}
+- Insights: {insights}
+
 Output valid JSON with key "variations": [string, string, string]
 Each string should be the complete, ready-to-post content.
 """
@@ -560,17 +612,9 @@ Each string should be the complete, ready-to-post content.
 # CRITIC PROMPT (Quality Control)
 # ============================================================================
 
-CRITIC_PROMPT = """You are a ruthless Content Editor who knows what performs on {platform}.
+CRITIC_PROMPT = """You are a ruthless Content Editor who knows what performs on every platform.
 
-Evaluate this draft against platform rules AND human authenticity.
-
-TARGET AUDIENCE: {audience}
-
-PLATFORM RULES:
-{platform_rules}
-
-DRAFT TO EVALUATE:
-{draft}
+Evaluate the draft below against its platform rules AND human authenticity.
 
 CRITIQUE CRITERIA:
 
@@ -603,7 +647,7 @@ CRITIQUE CRITERIA:
    - Varied sentence structure?
 
 6. AUDIENCE FIT:
-   - Resonates with {audience}?
+   - Resonates with the target audience?
    - Right tone and language?
    - Addresses their needs/interests?
 
@@ -615,6 +659,16 @@ Output valid JSON with EXACTLY these keys:
 - "predicted_score": Integer 0-100 (virality/engagement potential)
 - "strengths": What's working well
 
+PLATFORM: {platform}
+
+TARGET AUDIENCE: {audience}
+
+PLATFORM RULES:
+{platform_rules}
+
+DRAFT TO EVALUATE:
+{draft}
+
 Be STRICT. Content that sounds AI-generated is an automatic FAIL.
 """
 
@@ -628,21 +682,6 @@ Fix the draft based on the critique while keeping the core message.
 
 {anti_ai_rules}
 
-PLATFORM: {platform}
-AUDIENCE: {audience}
-
-ORIGINAL DRAFT:
-{draft}
-
-CRITIQUE FEEDBACK:
-{reasoning}
-
-SPECIFIC ISSUES TO FIX:
-{instructions}
-
-AI DETECTION ISSUES FOUND:
-{ai_issues}
-
 YOUR TASK:
 1. Fix all identified issues
 2. Remove any AI-detection patterns
@@ -659,6 +698,21 @@ REVISION CHECKLIST:
 - Add at least one human authenticity marker
 - Make it sound like a real person wrote this
 
+PLATFORM: {platform}
+AUDIENCE: {audience}
+
+ORIGINAL DRAFT:
+{draft}
+
+CRITIQUE FEEDBACK:
+{reasoning}
+
+SPECIFIC ISSUES TO FIX:
+{instructions}
+
+AI DETECTION ISSUES FOUND:
+{ai_issues}
+
 Output ONLY the revised content. No explanations.
 """
 
@@ -732,31 +786,116 @@ Output only the first comment text. Keep it short (1-2 sentences).
 """
 
 # ============================================================================
-# HELPER: Inject anti-AI rules into prompts
+# PROMPT REGISTRY (enhanced templates built once, at import)
+# ============================================================================
+
+class PromptTemplate:
+    """
+    An enhanced template: the shared rule blocks are injected once, leaving
+    only the per-call fields for .format. ``version`` is a hash of the
+    final text, so caches keyed on it drop entries when a prompt changes.
+    """
+    
+    __slots__ = ("name", "text", "version")
+    
+    def __init__(self, name: str, template: str):
+        self.name = name
+        self.text = template.replace(
+            "{anti_ai_rules}", ANTI_AI_RULES
+        ).replace(
+            "{hook_formulas}", HOOK_FORMULAS
+        ).replace(
+            "{engagement_rules}", ENGAGEMENT_RULES
+        )
+        self.version = hashlib.sha256(self.text.encode()).hexdigest()[:12]
+    
+    def format(self, **fields: Any) -> str:
+        return self.text.format(**fields)
+
+
+PROMPTS: Dict[str, PromptTemplate] = {
+    name: PromptTemplate(name, template)
+    for name, template in {
+        "core_message": CORE_MESSAGE_PROMPT,
+        "generator": GENERATOR_PROMPT,
+        "multi_platform": MULTI_PLATFORM_PROMPT,
+        "variations": VARIATIONS_PROMPT,
+        "critic": CRITIC_PROMPT,
+        "reviser": REVISER_PROMPT,
+        "remix": CONTENT_REMIX_PROMPT,
+        "first_comment": FIRST_COMMENT_PROMPT,
+    }.items()
+}
+
+
+def get_prompt(name: str) -> PromptTemplate:
+    """Registered enhanced template by name (see PROMPTS)."""
+    return PROMPTS[name]
+
+
+def get_prompt_version(name: str) -> str:
+    """Version hash of a registered template."""
+    return PROMPTS[name].version
+
+
+# Rendered per-run blocks, shared by every platform (and by later runs
+# with the same core message or style guide)
+
+@lru_cache(maxsize=256)
+def _render_block(kind: str, key: str) -> str:
+    value = json.loads(key)
+    if kind == "insights":
+        return "\n".join(f"- {i}" for i in value)
+    return STYLE_GUIDE_INSTRUCTIONS.format(
+        writing_style=value.get("writing_style", "N/A"),
+        hook_patterns="\n".join(f"- {p}" for p in value.get("hook_patterns", [])),
+        story_structure=value.get("story_structure", "N/A"),
+        cta_style=value.get("cta_style", "N/A"),
+        emoji_usage=value.get("emoji_usage", "N/A"),
+        sentence_length=value.get("sentence_length", "N/A"),
+        unique_phrases="\n".join(f"- {p}" for p in value.get("unique_phrases", [])),
+        formatting_style=value.get("formatting_style", "N/A")
+    )
+
+
+def _block_key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def render_insights(insights: List[Any]) -> str:
+    """Core message insights as a bullet list."""
+    return _render_block("insights", _block_key(insights))
+
+
+def render_style_instructions(style_guide: Dict[str, Any]) -> str:
+    """STYLE_GUIDE_INSTRUCTIONS filled in from a style guide."""
+    return _render_block("style", _block_key(style_guide))
+
+
+# ============================================================================
+# HELPER: Enhanced prompts (kept for external callers; built once above)
 # ============================================================================
 
 def get_enhanced_generator_prompt():
     """Returns generator prompt with all enhancements injected."""
-    return GENERATOR_PROMPT.replace(
-        "{anti_ai_rules}", ANTI_AI_RULES
-    ).replace(
-        "{hook_formulas}", HOOK_FORMULAS
-    ).replace(
-        "{engagement_rules}", ENGAGEMENT_RULES
-    )
+    return PROMPTS["generator"].text
+
+def get_enhanced_multi_platform_prompt():
+    """Returns multi-platform generator prompt with all enhancements injected."""
+    return PROMPTS["multi_platform"].text
 
 def get_enhanced_core_message_prompt():
     """Returns core message prompt with anti-AI rules."""
-    return CORE_MESSAGE_PROMPT.replace("{anti_ai_rules}", ANTI_AI_RULES)
+    return PROMPTS["core_message"].text
 
 def get_enhanced_reviser_prompt():
     """Returns reviser prompt with anti-AI rules."""
-    return REVISER_PROMPT.replace("{anti_ai_rules}", ANTI_AI_RULES)
+    return PROMPTS["reviser"].text
 
 def get_enhanced_variations_prompt():
     """Returns variations prompt with anti-AI rules."""
-    return VARIATIONS_PROMPT.replace("{anti_ai_rules}", ANTI_AI_RULES)
+    return PROMPTS["variations"].text
 
 def get_enhanced_remix_prompt():
     """Returns remix prompt with anti-AI rules."""
-    return CONTENT_REMIX_PROMPT.replace("{anti_ai_rules}", ANTI_AI_RULES)
+    return PROMPTS["remix"].text
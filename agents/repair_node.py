@@ -0,0 +1,172 @@
+"""Repair Node - Fixes length and hashtag violations locally, without an LLM call."""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from utils.metrics import increment
+from .schemas import RepurposingState, ContentMetadata, CritiqueResult
+from .validator_node import PLATFORM_SPECS, validate_content_node
+
+
+_TRAILING_HASHTAGS = re.compile(r'(?:\s*#\w+)+\s*$')
+_HASHTAG = re.compile(r'#(\w+)')
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_SENTENCE_END = re.compile(r'[.!?…]["\')\]]*(?=\s|$)')
+
+
+def _needs_repair(meta: ContentMetadata, spec: Dict[str, Any]) -> bool:
+    """Whether a draft breaks a limit the local repair can fix."""
+    if spec.get("max_chars") and meta["character_count"] > spec["max_chars"]:
+        return True
+    if "hashtags" in spec:
+        tags = [tag.casefold() for tag in meta["hashtags"]]
+        return len(tags) > spec["hashtags"][1] or len(set(tags)) < len(tags)
+    return False
+
+
+def needs_repair(state: RepurposingState, platform: str) -> bool:
+    """Whether the validated draft (or any A/B variation) should be repaired."""
+    spec = PLATFORM_SPECS.get(platform, {})
+    meta = state["metadata"].get(platform)
+    if not spec.get("repair") or not meta:
+        return False
+    return any(_needs_repair(m, spec) for m in meta.get("variations", [meta]))
+
+
+def _fix_hashtags(draft: str, max_tags: int) -> Tuple[str, List[str]]:
+    """
+    Split off the trailing hashtag block, dedupe and cap hashtags.
+    
+    Inline hashtags beyond the cap (or repeated) lose their "#" so the
+    sentence still reads; extra trailing ones are dropped. Returns the body
+    and the hashtags to put back at the end.
+    """
+    match = _TRAILING_HASHTAGS.search(draft)
+    body, block = (draft[:match.start()], match.group()) if match else (draft, "")
+    seen = set()
+    
+    def inline(tag_match: "re.Match") -> str:
+        tag = tag_match.group(1).casefold()
+        if tag in seen or len(seen) >= max_tags:
+            return tag_match.group(1)
+        seen.add(tag)
+        return tag_match.group(0)
+    
+    body = _HASHTAG.sub(inline, body).rstrip()
+    
+    tags = []
+    for tag in _HASHTAG.findall(block):
+        if tag.casefold() not in seen and len(seen) < max_tags:
+            seen.add(tag.casefold())
+            tags.append(f"#{tag}")
+    return body, tags
+
+
+def _sentence_prefix(text: str, limit: int) -> str:
+    """Longest prefix of text ending at a sentence boundary within limit ("" if none)."""
+    end = 0
+    for match in _SENTENCE_END.finditer(text):
+        if match.end() > limit:
+            break
+        end = match.end()
+    return text[:end]
+
+
+def _trim_body(body: str, limit: int) -> Optional[str]:
+    """
+    Shorten body to at most limit characters at paragraph, then sentence,
+    boundaries. Keeps the opening paragraph (the hook) and, if it fits, the
+    closing one (usually the CTA); middle paragraphs are kept in order
+    while they fit. None if not even the first sentence fits.
+    """
+    if len(body) <= limit:
+        return body
+    
+    paragraphs = [p.strip() for p in _PARAGRAPH_BREAK.split(body) if p.strip()]
+    head, rest = paragraphs[0], paragraphs[1:]
+    if len(head) > limit:
+        return _sentence_prefix(head, limit) or None
+    
+    tail = None
+    if rest and len(head) + 2 + len(rest[-1]) <= limit:
+        tail = rest.pop()
+    room = limit - len(head) - (2 + len(tail) if tail else 0)
+    
+    kept = [head]
+    for paragraph in rest:
+        if 2 + len(paragraph) <= room:
+            kept.append(paragraph)
+            room -= 2 + len(paragraph)
+            continue
+        partial = _sentence_prefix(paragraph, room - 2)
+        if partial:
+            kept.append(partial)
+        break
+    if tail:
+        kept.append(tail)
+    return "\n\n".join(kept)
+
+
+def repair_draft(draft: str, platform: str) -> Optional[str]:
+    """
+    Bring a draft within the platform's character limit and hashtag cap.
+    
+    Returns the repaired draft, or None if it can't be repaired locally
+    (e.g. the opening sentence alone is over the limit).
+    """
+    spec = PLATFORM_SPECS.get(platform, {})
+    max_chars = spec.get("max_chars")
+    max_tags = spec["hashtags"][1] if "hashtags" in spec else None
+    
+    body, tags = _fix_hashtags(draft, max_tags) if max_tags is not None else (draft.rstrip(), [])
+    tag_block = "\n\n" + " ".join(tags) if tags else ""
+    
+    if max_chars:
+        body = _trim_body(body, max_chars - len(tag_block))
+        if body is None:
+            return None
+    return body + tag_block
+
+
+def repair_content_node(state: RepurposingState, platform: str) -> RepurposingState:
+    """
+    Repairs limit and hashtag violations locally, then re-validates.
+    
+    Drafts (or A/B variations) that can't be repaired are left as they
+    are; their metadata still says they are non-compliant.
+    """
+    print(f"🩹 [REPAIR] Repairing {platform} content locally...")
+    
+    spec = PLATFORM_SPECS.get(platform, {})
+    draft = state["drafts"].get(platform, "")
+    meta = state["metadata"][platform]
+    
+    if isinstance(draft, list):
+        per_variation = meta.get("variations", [])
+        repaired = []
+        for i, variation in enumerate(draft):
+            if i < len(per_variation) and _needs_repair(per_variation[i], spec):
+                variation = repair_draft(variation, platform) or variation
+            repaired.append(variation)
+        state["drafts"][platform] = repaired
+    else:
+        state["drafts"][platform] = repair_draft(draft, platform) or draft
+    
+    state = validate_content_node(state, platform)
+    
+    if state["metadata"][platform]["platform_compliant"]:
+        increment("repair.local_fixes")
+        print(f"✅ [REPAIR] {platform} fixed locally")
+    else:
+        increment("repair.local_failures")
+        print(f"⚠️ [REPAIR] {platform} could not be fully repaired locally")
+    return state
+
+
+def build_limit_critique(state: RepurposingState, platform: str) -> CritiqueResult:
+    """Critique for the reviser when a draft still breaks platform limits."""
+    suggestions = state["metadata"][platform]["suggestions"]
+    return CritiqueResult(
+        status="FAIL",
+        reasoning=f"The draft breaks {platform}'s platform limits.",
+        suggested_revision="\n".join(suggestions),
+        predicted_score=0,
+    )
@@ -1,48 +1,11 @@
 """Reviser Node for LangGraph with Human Authenticity Focus."""
-from groq import Groq
+from typing import Any, Dict
+from utils.llm_client import chat_completion, achat_completion, get_node_model
 from .schemas import RepurposingState
-from .prompts import REVISER_PROMPT, PLATFORM_RULES, ANTI_AI_RULES, get_enhanced_reviser_prompt
-from config import GROQ_MODEL
+from .prompts import get_prompt
 
 
-def revise_content_node(state: RepurposingState, platform: str) -> RepurposingState:
-    """
-    Revises content based on critic feedback with focus on human authenticity.
-    
-    Enhanced to:
-    - Fix AI detection patterns (em dashes, banned words)
-    - Add human authenticity markers
-    - Improve engagement potential
-    - Maintain platform compliance
-    
-    Only called when critique status is FAIL.
-    """
-    print(f"🔧 [REVISER] Revising {platform} content for human authenticity...")
-    
-    client = Groq(api_key=state["groq_api_key"])
-    
-    draft = state["drafts"].get(platform, "")
-    critique = state["critiques"].get(platform, {})
-    ai_issues = state.get("ai_issues", {}).get(platform, [])
-    
-    # Format AI issues for the prompt
-    ai_issues_text = "\n".join(f"- {issue}" for issue in ai_issues) if ai_issues else "None detected"
-    
-    prompt = get_enhanced_reviser_prompt().format(
-        platform=platform,
-        audience=state["audience"],
-        draft=draft,
-        reasoning=critique.get("reasoning", ""),
-        instructions=critique.get("suggested_revision", ""),
-        ai_issues=ai_issues_text
-    )
-    
-    response = client.chat.completions.create(
-        model=GROQ_MODEL,
-        messages=[
-            {
-                "role": "system",
-                "content": """You are an expert Content Editor who transforms AI-sounding content into authentic human voice.
+REVISER_SYSTEM_PROMPT = """You are an expert Content Editor who transforms AI-sounding content into authentic human voice.
 
 YOUR MISSION:
 1. Remove ALL AI patterns:
@@ -63,17 +26,40 @@ YOUR MISSION:
 The revised content should pass AI detection tests by being genuinely human.
 
 Output ONLY the revised content. No explanations or meta-commentary."""
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        temperature=0.75  # Higher temp for more natural variation
+
+
+def _build_request(state: RepurposingState, platform: str) -> Dict[str, Any]:
+    """Build the chat completion arguments for revising a draft."""
+    draft = state["drafts"].get(platform, "")
+    critique = state["critiques"].get(platform, {})
+    ai_issues = state.get("ai_issues", {}).get(platform, [])
+    
+    # Format AI issues for the prompt
+    ai_issues_text = "\n".join(f"- {issue}" for issue in ai_issues) if ai_issues else "None detected"
+    
+    prompt = get_prompt("reviser").format(
+        platform=platform,
+        audience=state["audience"],
+        draft=draft,
+        reasoning=critique.get("reasoning", ""),
+        instructions=critique.get("suggested_revision", ""),
+        ai_issues=ai_issues_text
     )
     
+    return {
+        "model": get_node_model("reviser"),
+        "messages": [
+            {"role": "system", "content": REVISER_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.75,  # Higher temp for more natural variation
+    }
+
+
+def _apply_revision(state: RepurposingState, platform: str, revised: str) -> RepurposingState:
+    """Store the revised draft and bump the iteration count."""
     # Update draft with revision
-    state["drafts"][platform] = response.choices[0].message.content
+    state["drafts"][platform] = revised
     
     # Increment iteration count
     state["iterations"][platform] = state["iterations"].get(platform, 0) + 1
@@ -81,3 +67,31 @@ Output ONLY the revised content. No explanations or meta-commentary."""
     print(f"✅ [REVISER] Revised {platform} for authenticity (iteration {state['iterations'][platform]})")
     
     return state
+
+
+def revise_content_node(state: RepurposingState, platform: str) -> RepurposingState:
+    """
+    Revises content based on critic feedback with focus on human authenticity.
+    
+    Enhanced to:
+    - Fix AI detection patterns (em dashes, banned words)
+    - Add human authenticity markers
+    - Improve engagement potential
+    - Maintain platform compliance
+    
+    Only called when critique status is FAIL.
+    """
+    print(f"🔧 [REVISER] Revising {platform} content for human authenticity...")
+    
+    content = chat_completion(state["groq_api_key"], "reviser", **_build_request(state, platform))
+    
+    return _apply_revision(state, platform, content)
+
+
+async def revise_content_node_async(state: RepurposingState, platform: str) -> RepurposingState:
+    """Awaitable variant of revise_content_node built on AsyncGroq."""
+    print(f"🔧 [REVISER] Revising {platform} content for human authenticity...")
+    
+    content = await achat_completion(state["groq_api_key"], "reviser", **_build_request(state, platform))
+    
+    return _apply_revision(state, platform, content)
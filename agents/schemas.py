@@ -29,6 +29,8 @@ class ContentMetadata(TypedDict):
     has_cta: bool
     platform_compliant: bool
     suggestions: List[str]
+    # A/B mode: one entry per variation; the fields above aggregate them
+    variations: NotRequired[List["ContentMetadata"]]
 
 
 class RepurposingState(TypedDict):
@@ -42,6 +44,7 @@ class RepurposingState(TypedDict):
     audience: str
     ab_testing: bool
     groq_api_key: str
+    rule_pack: NotRequired[Optional[str]]  # Tenant cleaner rules (utils/rule_packs.py)
     
     # Phase 2: Best Posts Integration
     best_posts: NotRequired[str]  # User's best performing posts
@@ -49,6 +52,7 @@ class RepurposingState(TypedDict):
     
     # Core Message
     core_message: NotRequired[CoreMessage]
+    core_message_cached: NotRequired[bool]  # True when served from the cache
     
     # Generated Content
     drafts: NotRequired[Dict[str, str]]  # platform -> draft
@@ -1,75 +1,262 @@
 """Content Validator Node - Checks compliance and generates metadata."""
 import re
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+from utils.thread_packer import tweet_length
+from config import TWITTER_MAX_TWEET_LENGTH
 from .schemas import RepurposingState, ContentMetadata
 
 
-def validate_content_node(state: RepurposingState, platform: str) -> RepurposingState:
+# ============================================================================
+# PLATFORM SPECS
+# ============================================================================
+# One entry per platform (see PLATFORM_RULES in prompts.py for the rules the
+# generator is given). Every key is optional:
+#   max_chars   Hard character limit
+#   words       (min, max) word count
+#   hashtags    (min, max) hashtag count
+#   thread      Posts split on "separator", each at most "max_chars", and
+#               "posts" (min, max) of them if there is more than one;
+#               "label" names a post and "weighted" measures posts with
+#               Twitter's weighted length
+#   sections    Lines matching "pattern" (case-insensitive), "count" (min,
+#               max) of them; "label" names a section
+#   required    (marker, suggestion) pairs; suggest when marker is missing
+#   cta         Extra CTA keywords on top of DEFAULT_CTA_KEYWORDS
+#   strict      Checks that make the draft non-compliant when they fail;
+#               the rest only add suggestions
+#   repair      Trim over-long drafts and dedupe/cap hashtags locally
+#               (see repair_node.py) before any LLM revision
+# Supporting a new platform only takes a new entry.
+
+DEFAULT_CTA_KEYWORDS = ['click', 'subscribe', 'comment', 'share', 'read more', 'learn', 'try', 'join']
+DEFAULT_STRICT = ("max_chars", "thread")
+HOOK_WINDOW = 100  # A question or exclamation this early counts as a hook
+
+PLATFORM_SPECS: Dict[str, Dict[str, Any]] = {
+    "LinkedIn": {
+        "max_chars": 1300,
+        "hashtags": (3, 5),
+        "cta": ["what do you think", "agree", "thoughts", "let me know", "follow"],
+        "repair": True,
+    },
+    "Twitter/X": {
+        "hashtags": (0, 2),
+        "thread": {
+            "separator": "\n\n",
+            "max_chars": TWITTER_MAX_TWEET_LENGTH,
+            "posts": (3, 7),
+            "label": "Tweet",
+            "weighted": True,
+        },
+        "cta": ["follow", "retweet", "repost", "reply", "bookmark"],
+    },
+    "Short Blog": {
+        "words": (500, 700),
+        "sections": {"pattern": r"^[ \t]*##[ \t]", "count": (3, 4), "label": "H2 sections"},
+        "cta": ["sign up", "download", "get started", "let me know"],
+        "strict": ("words",),
+    },
+    "Email Sequence": {
+        "sections": {"pattern": r"^[ \t*#>_]*subject(?: line)?[ \t*_]*:", "count": (3, 3), "label": "emails"},
+        "cta": ["reply", "hit reply", "book", "sign up", "grab"],
+        "strict": ("sections",),
+    },
+    "Reddit": {
+        "words": (300, 500),
+        "hashtags": (0, 0),
+        "required": [("tl;dr", "Reddit posts should end with a TL;DR: summary")],
+        "cta": ["happy to answer", "let me know", "what do you think", "curious"],
+        "strict": ("words", "hashtags"),
+    },
+    "Substack": {
+        "words": (800, 1200),
+        "cta": ["reply", "hit reply", "let me know", "what do you think"],
+        "strict": ("words",),
+    },
+}
+
+
+_HASHTAG = re.compile(r'#\w+')
+_HOOK = re.compile(r'[?!]')
+
+
+@lru_cache(maxsize=None)
+def _cta_pattern(platform: str) -> "re.Pattern":
+    """All of the platform's CTA keywords as one alternation (for lowercased text)."""
+    keywords = set(DEFAULT_CTA_KEYWORDS) | set(PLATFORM_SPECS.get(platform, {}).get("cta", []))
+    ordered = sorted((k.lower() for k in keywords), key=len, reverse=True)
+    return re.compile(r'\b(?:%s)' % '|'.join(re.escape(k) for k in ordered))
+
+
+@lru_cache(maxsize=None)
+def _section_pattern(platform: str) -> "re.Pattern":
+    return re.compile(PLATFORM_SPECS[platform]["sections"]["pattern"], re.IGNORECASE | re.MULTILINE)
+
+
+def _measure(draft: str, platform: str) -> Dict[str, Any]:
     """
-    Validates content and generates metadata.
-    
-    Checks:
-    - Character/word count
-    - Hashtags
-    - Hook detection
-    - CTA detection
-    - Platform compliance
+    Metrics for one draft. The text is lowercased once and every feature
+    is a single C-level scan (hashtags, hook window, one CTA alternation),
+    instead of a lowercase copy per CTA keyword.
     """
-    print(f"✓ [VALIDATOR] Validating {platform} content...")
+    spec = PLATFORM_SPECS.get(platform, {})
+    lowered = draft.lower()
     
-    draft = state["drafts"].get(platform, "")
+    metrics = {
+        "char_count": len(draft),
+        "word_count": len(draft.split()),
+        "hashtags": _HASHTAG.findall(draft),
+        "has_hook": _HOOK.search(draft, 0, HOOK_WINDOW) is not None,
+        "has_cta": _cta_pattern(platform).search(lowered) is not None,
+    }
+    if "thread" in spec:
+        measure = tweet_length if spec["thread"].get("weighted") else len
+        metrics["post_lengths"] = [measure(post) for post in draft.split(spec["thread"]["separator"])]
+    if "sections" in spec:
+        metrics["sections"] = len(_section_pattern(platform).findall(draft))
+    if "required" in spec:
+        metrics["missing"] = [
+            suggestion for marker, suggestion in spec["required"] if marker.lower() not in lowered
+        ]
+    return metrics
+
+
+def _range_text(low: int, high: int) -> str:
+    return str(low) if low == high else f"{low}-{high}"
+
+
+def _check(platform: str, metrics: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    """Apply the platform spec to scanned metrics: (compliant, suggestions)."""
+    spec = PLATFORM_SPECS.get(platform, {})
+    strict = spec.get("strict", DEFAULT_STRICT)
+    failed = set()
+    suggestions = []
     
-    # Handle variations (A/B testing)
-    if isinstance(draft, list):
-        draft = " ".join(draft)  # Combine for metadata
+    max_chars = spec.get("max_chars")
+    if max_chars and metrics["char_count"] > max_chars:
+        failed.add("max_chars")
+        suggestions.append(f"Content exceeds {max_chars:,} character limit ({metrics['char_count']} chars)")
     
-    # Character and word count
-    char_count = len(draft)
-    word_count = len(draft.split())
+    if "words" in spec:
+        low, high = spec["words"]
+        if not low <= metrics["word_count"] <= high:
+            failed.add("words")
+            suggestions.append(f"{platform} should be {low}-{high} words (found {metrics['word_count']})")
     
-    # Extract hashtags
-    hashtags = re.findall(r'#\w+', draft)
+    if "hashtags" in spec:
+        low, high = spec["hashtags"]
+        count = len(metrics["hashtags"])
+        if count > high and high == 0:
+            failed.add("hashtags")
+            suggestions.append(f"{platform} posts should have no hashtags (found {count})")
+        elif count > high and low == 0:
+            failed.add("hashtags")
+            suggestions.append(f"{platform} works best with at most {high} hashtags (found {count})")
+        elif not low <= count <= high:
+            failed.add("hashtags")
+            suggestions.append(f"{platform} needs {_range_text(low, high)} hashtags (found {count})")
     
-    # Detect hook (question or bold statement in first 100 chars)
-    has_hook = bool(re.search(r'[?!]', draft[:100]))
+    if "thread" in spec:
+        thread = spec["thread"]
+        for i, length in enumerate(metrics["post_lengths"]):
+            if length > thread["max_chars"]:
+                failed.add("thread")
+                suggestions.append(f"{thread['label']} {i+1} exceeds {thread['max_chars']} characters")
+        low, high = thread["posts"]
+        posts = len(metrics["post_lengths"])
+        # A single post isn't a thread; only threads are held to the count
+        if posts > 1 and not low <= posts <= high:
+            suggestions.append(f"Thread should have {_range_text(low, high)} {thread['label'].lower()}s (found {posts})")
     
-    # Detect CTA keywords
-    cta_keywords = ['click', 'subscribe', 'comment', 'share', 'read more', 'learn', 'try', 'join']
-    has_cta = any(kw in draft.lower() for kw in cta_keywords)
+    if "sections" in spec:
+        sections = spec["sections"]
+        low, high = sections["count"]
+        if not low <= metrics["sections"] <= high:
+            failed.add("sections")
+            suggestions.append(f"Expected {_range_text(low, high)} {sections['label']} (found {metrics['sections']})")
     
-    # Platform compliance check
-    platform_compliant = True
-    suggestions = []
+    if metrics.get("missing"):
+        failed.add("required")
+        suggestions.extend(metrics["missing"])
     
-    # LinkedIn-specific validation
-    if platform == "LinkedIn":
-        if char_count > 1300:
-            platform_compliant = False
-            suggestions.append(f"Content exceeds 1,300 character limit ({char_count} chars)")
-        if len(hashtags) < 3 or len(hashtags) > 5:
-            suggestions.append(f"LinkedIn needs 3-5 hashtags (found {len(hashtags)})")
+    return not (failed & set(strict)), suggestions
+
+
+def _metadata(draft: str, platform: str) -> ContentMetadata:
+    metrics = _measure(draft, platform)
+    platform_compliant, suggestions = _check(platform, metrics)
+    return ContentMetadata(
+        character_count=metrics["char_count"],
+        word_count=metrics["word_count"],
+        hashtags=metrics["hashtags"],
+        has_hook=metrics["has_hook"],
+        has_cta=metrics["has_cta"],
+        platform_compliant=platform_compliant,
+        suggestions=suggestions
+    )
+
+
+def validate_variations(variations: List[str], platform: str) -> List[ContentMetadata]:
+    """Metadata for each A/B variation, validated as a separate post."""
+    return [_metadata(variation, platform) for variation in variations]
+
+
+def aggregate_metadata(per_variation: List[ContentMetadata]) -> ContentMetadata:
+    """
+    Roll per-variation metadata up into one entry.
     
-    # Twitter-specific validation
-    elif platform == "Twitter/X":
-        tweets = draft.split("\n\n")
-        for i, tweet in enumerate(tweets):
-            if len(tweet) > 280:
-                platform_compliant = False
-                suggestions.append(f"Tweet {i+1} exceeds 280 characters")
-        if len(hashtags) > 2:
-            suggestions.append(f"Twitter works best with 1-2 hashtags (found {len(hashtags)})")
+    Counts are the largest variation's (the one closest to any limit),
+    hashtags are the union, flags hold only if every variation passes, and
+    suggestions are prefixed with their variation number.
+    """
+    hashtags = []
+    suggestions = []
+    for i, meta in enumerate(per_variation):
+        hashtags.extend(tag for tag in meta["hashtags"] if tag not in hashtags)
+        suggestions.extend(f"Variation {i+1}: {suggestion}" for suggestion in meta["suggestions"])
     
-    # Store metadata
-    state["metadata"][platform] = ContentMetadata(
-        character_count=char_count,
-        word_count=word_count,
+    return ContentMetadata(
+        character_count=max((m["character_count"] for m in per_variation), default=0),
+        word_count=max((m["word_count"] for m in per_variation), default=0),
         hashtags=hashtags,
-        has_hook=has_hook,
-        has_cta=has_cta,
-        platform_compliant=platform_compliant,
-        suggestions=suggestions
+        has_hook=all(m["has_hook"] for m in per_variation),
+        has_cta=all(m["has_cta"] for m in per_variation),
+        platform_compliant=all(m["platform_compliant"] for m in per_variation),
+        suggestions=suggestions,
+        variations=per_variation,
     )
+
+
+def validate_content_node(state: RepurposingState, platform: str) -> RepurposingState:
+    """
+    Validates content and generates metadata.
+    
+    A/B variations are validated one by one; the stored metadata is their
+    aggregate, with the per-variation entries under "variations".
+    
+    Checks (driven by PLATFORM_SPECS):
+    - Character/word count
+    - Hashtags
+    - Hook detection
+    - CTA detection
+    - Platform compliance (limits, threads, sections, required markers)
+    """
+    print(f"✓ [VALIDATOR] Validating {platform} content...")
     
-    compliance_emoji = "✅" if platform_compliant else "⚠️"
-    print(f"{compliance_emoji} [VALIDATOR] {platform}: {char_count} chars, {len(hashtags)} hashtags")
+    draft = state["drafts"].get(platform, "")
+    
+    # A/B testing: validate each variation as its own post
+    if isinstance(draft, list):
+        metadata = aggregate_metadata(validate_variations(draft, platform))
+        compliant = sum(m["platform_compliant"] for m in metadata["variations"])
+        compliance_emoji = "✅" if metadata["platform_compliant"] else "⚠️"
+        print(f"{compliance_emoji} [VALIDATOR] {platform}: {compliant}/{len(draft)} variations compliant")
+    else:
+        metadata = _metadata(draft, platform)
+        compliance_emoji = "✅" if metadata["platform_compliant"] else "⚠️"
+        print(f"{compliance_emoji} [VALIDATOR] {platform}: {metadata['character_count']} chars, "
+              f"{len(metadata['hashtags'])} hashtags")
     
+    state["metadata"][platform] = metadata
     return state
@@ -314,6 +314,8 @@ if st.button("Generate Content", type="primary"):
                 elif event_type == "core_message":
                     core = event.get("data", {})
                     status_container.write(f"✅ {message}")
+                    if event.get("cached"):
+                        status_container.caption("💾 Cached: this source was analyzed before, no extraction call needed")
                     status_container.json(core)
                 
                 # NEW: Phase 2 - Style analysis event
@@ -323,8 +325,19 @@ if st.button("Generate Content", type="primary"):
                     status_container.write("📝 **Detected Style Patterns:**")
                     status_container.json(style)
                 
+                elif event_type == "draft_delta":
+                    # Live preview of the draft as tokens arrive
+                    platform_containers[event["platform"]].markdown(
+                        f"**✍️ {event['platform']}**\n\n{event['text']}"
+                    )
+                
                 elif event_type == "draft_generated":
                     status_container.write(f"✅ {message}")
+                    draft = event.get("draft")
+                    if isinstance(draft, str):
+                        platform_containers[event["platform"]].markdown(
+                            f"**✅ {event['platform']}**\n\n{draft}"
+                        )
                 
                 elif event_type == "critique_complete":
                     critique = event.get("critique", {})
@@ -337,6 +350,9 @@ if st.button("Generate Content", type="primary"):
                 elif event_type == "validation_complete":
                     status_container.write(f"✓ {message}")
                 
+                elif event_type in ("llm_retry", "circuit_breaker"):
+                    status_container.caption(message)
+                
                 elif event_type == "complete":
                     final_state = event.get("state")
                     status_container.update(label="✅ Generation Complete!", state="complete", expanded=False)
@@ -384,13 +400,19 @@ if 'final_results' in st.session_state:
                 
                 with col4:
                     compliant = platform_meta.get('platform_compliant', True)
-                    st.metric("Compliance", "✅" if compliant else "⚠️")
+                    variation_meta = platform_meta.get('variations', [])
+                    if variation_meta:
+                        passing = sum(m.get('platform_compliant', True) for m in variation_meta)
+                        st.metric("Compliance", f"{'✅' if compliant else '⚠️'} {passing}/{len(variation_meta)}")
+                    else:
+                        st.metric("Compliance", "✅" if compliant else "⚠️")
                 
                 if hashtags:
                     st.caption(f"**Hashtags:** {' '.join(hashtags)}")
                 
+                # A/B suggestions are shown inside each variation instead
                 suggestions = platform_meta.get('suggestions', [])
-                if suggestions:
+                if suggestions and not variation_meta:
                     with st.expander("💡 Improvement Suggestions", expanded=False):
                         for suggestion in suggestions:
                             st.warning(suggestion)
@@ -410,8 +432,21 @@ if 'final_results' in st.session_state:
                 st.subheader("🎯 3 Variations for A/B Testing")
                 st.caption("Compare and choose the best one")
                 
+                variation_meta = platform_meta.get('variations', [])
                 for idx, variant in enumerate(content):
-                    with st.expander(f"📝 Variation {idx+1}", expanded=(idx==0)):
+                    meta = variation_meta[idx] if idx < len(variation_meta) else {}
+                    badge = ""
+                    if meta:
+                        badge = " ✅" if meta.get('platform_compliant', True) else " ⚠️ needs work"
+                    with st.expander(f"📝 Variation {idx+1}{badge}", expanded=(idx==0)):
+                        if meta:
+                            st.caption(
+                                f"{meta.get('character_count', 0):,} chars · "
+                                f"{meta.get('word_count', 0):,} words · "
+                                f"{len(meta.get('hashtags', []))} hashtags"
+                            )
+                            for suggestion in meta.get('suggestions', []):
+                                st.warning(suggestion)
                         st.markdown(variant)
                         st.divider()
                         if st.button(f"📋 Copy Variation {idx+1}", key=f"copy_{platform}_{idx}"):
@@ -0,0 +1,159 @@
+"""
+Micro-benchmark for the content cleaner.
+
+Compares the compiled CleanerEngine (utils/content_cleaner.py) with the
+previous implementation, which ran one regex pass per dictionary key,
+on long drafts and on bulk batches of typical drafts. Also checks that
+both produce the same output, and times cleanup_batch (process pool)
+against cleaning the same batch in-process.
+
+Usage:
+    python benchmark_cleaner.py
+"""
+import re
+import time
+
+from utils.content_cleaner import (
+    WORD_REPLACEMENTS,
+    PHRASES_TO_SIMPLIFY,
+    CONTRACTIONS,
+    cleanup_ai_content,
+    cleanup_batch,
+)
+
+
+# ============================================================================
+# PREVIOUS IMPLEMENTATION (reference)
+# ============================================================================
+
+def legacy_cleanup(text: str) -> str:
+    """cleanup_ai_content as it was: one pass per key, patterns built per call."""
+    if not text:
+        return text
+    result = text
+    
+    for verbose in sorted(PHRASES_TO_SIMPLIFY, key=len, reverse=True):
+        if ' ' not in verbose:
+            pattern = re.compile(r'\b' + re.escape(verbose) + r'\b', re.IGNORECASE)
+        else:
+            pattern = re.compile(re.escape(verbose), re.IGNORECASE)
+        result = pattern.sub(PHRASES_TO_SIMPLIFY[verbose], result)
+    
+    for ai_word in sorted(WORD_REPLACEMENTS, key=len, reverse=True):
+        if ai_word.lower() not in result.lower():
+            continue
+        replacement = WORD_REPLACEMENTS[ai_word][0]
+        pattern = re.compile(r'\b' + re.escape(ai_word) + r'\b', re.IGNORECASE)
+        
+        def replace_match(match, replacement=replacement):
+            original = match.group(0)
+            if original.isupper():
+                return replacement.upper()
+            elif original[0].isupper():
+                return replacement.capitalize()
+            return replacement
+        
+        result = pattern.sub(replace_match, result)
+    
+    result = re.sub(r'\s*—\s*', ', ', result)
+    result = re.sub(r'—', ', ', result)
+    result = re.sub(r'–', '-', result)
+    result = re.sub(r',\s*,', ',', result)
+    result = re.sub(r'\.\s*,', '.', result)
+    result = re.sub(r',\s*\.', '.', result)
+    
+    result = re.sub(r'"(\w{1,20})"', r'\1', result)
+    result = re.sub(r'"(\w+\s\w+)"', r'\1', result)
+    result = re.sub(r'"(\w+\s\w+\s\w+)"', r'\1', result)
+    result = re.sub(r'["""](\w{1,20})["""]', r'\1', result)
+    result = re.sub(r'["""](\w+\s\w+)["""]', r'\1', result)
+    
+    for formal, contraction in CONTRACTIONS:
+        pattern = re.compile(r'\b' + re.escape(formal) + r'\b', re.IGNORECASE)
+        
+        def replace_contraction(match, contraction=contraction):
+            if match.group(0)[0].isupper():
+                return contraction.capitalize()
+            return contraction
+        
+        result = pattern.sub(replace_contraction, result)
+    
+    result = re.sub(r'\b(\w+)\s+\1\b', r'\1', result, flags=re.IGNORECASE)
+    result = re.sub(r'  +', ' ', result)
+    result = re.sub(r'\s+([.,!?;:])', r'\1', result)
+    result = re.sub(r'([.,!?;:])\s*([.,!?;:])', r'\1', result)
+    return result.strip()
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+SAMPLE_DRAFT = """
+The analysis—a crucial step—helps you leverage your data effectively.
+
+It's important to note that we need to utilize comprehensive strategies
+to optimize our approach. Let's delve into the "robust" methodology.
+
+Furthermore, this groundbreaking implementation will facilitate seamless
+integration. In today's digital landscape, we must analyze the paradigm shift.
+We do not have to wait. It is time to build, and I am sure that that is true.
+
+Most teams ship slowly because they plan in order to avoid risk. At the end
+of the day, the teams that win are the ones that learn fastest. #growth #ai
+"""
+
+
+def _time(fn, texts, repeat: int) -> float:
+    """Best wall time (seconds) of cleaning every text, over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_case(name: str, texts, repeat: int):
+    total_chars = sum(len(t) for t in texts)
+    legacy = _time(legacy_cleanup, texts, repeat)
+    compiled = _time(cleanup_ai_content, texts, repeat)
+    same = all(legacy_cleanup(t) == cleanup_ai_content(t) for t in texts)
+    
+    print(f"\n📊 {name}: {len(texts)} text(s), {total_chars:,} chars")
+    print(f"   Per-key passes:  {legacy * 1000:9.2f} ms")
+    print(f"   Compiled engine: {compiled * 1000:9.2f} ms")
+    print(f"   Speedup:         {legacy / compiled:9.2f}x")
+    print(f"   Same output:     {'✅' if same else '⚠️'}")
+
+
+def run_batch_case(name: str, texts):
+    start = time.perf_counter()
+    serial = [cleanup_ai_content(t) for t in texts]
+    serial_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    batched = list(cleanup_batch(texts))
+    batch_time = time.perf_counter() - start
+    
+    print(f"\n📊 {name}: {len(texts)} text(s)")
+    print(f"   In-process:      {serial_time * 1000:9.2f} ms")
+    print(f"   cleanup_batch:   {batch_time * 1000:9.2f} ms")
+    print(f"   Speedup:         {serial_time / batch_time:9.2f}x")
+    print(f"   Same output:     {'✅' if batched == serial else '⚠️'}")
+
+
+def main():
+    print("=" * 60)
+    print("Content Cleaner Benchmark")
+    print("=" * 60)
+    
+    run_case("Typical draft", [SAMPLE_DRAFT], repeat=200)
+    run_case("Long draft", [SAMPLE_DRAFT * 100], repeat=10)
+    run_case("Bulk batch", [SAMPLE_DRAFT + f" Draft {i}." for i in range(2000)], repeat=3)
+    run_batch_case("Bulk batch (process pool)", [SAMPLE_DRAFT + f" Draft {i}." for i in range(20000)])
+
+
+if __name__ == "__main__":
+    main()
@@ -131,6 +131,9 @@ def main():
             print(f"   📏 {metadata.get('character_count', 0)} chars, {metadata.get('word_count', 0)} words")
             print(f"   🏷️  {len(metadata.get('hashtags', []))} hashtags")
         
+        elif event_type in ("llm_retry", "circuit_breaker"):
+            print(f"   {message}")
+        
         elif event_type == "complete":
             state = event.get("state", {})
             print(f"\n\n{'='*60}")
@@ -152,6 +155,9 @@ def main():
                 print(f"   Words: {meta.get('word_count', 0)}")
                 print(f"   Hashtags: {', '.join(meta.get('hashtags', []))}")
                 print(f"   Compliant: {'✅' if meta.get('platform_compliant') else '⚠️'}")
+                for idx, variation in enumerate(meta.get('variations', [])):
+                    print(f"   Variation {idx+1}: {variation.get('character_count', 0)} chars, "
+                          f"{'✅' if variation.get('platform_compliant') else '⚠️'}")
                 
                 if meta.get('suggestions'):
                     print(f"\n💡 Suggestions:")
@@ -11,6 +11,49 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")  # Optional: Only for PDF/DOCX
 
 # Model Configuration
 GROQ_MODEL = "openai/gpt-oss-120b"  # Fast and powerful
+GROQ_SMALL_MODEL = "openai/gpt-oss-20b"  # Faster; plenty for structured extraction
+
+# Per-node model routing (nodes not listed use GROQ_MODEL). With "escalate_to",
+# a JSON response that is malformed or missing required keys is retried once
+# on that model.
+LLM_NODE_MODELS = {
+    "core_message":  {"model": GROQ_SMALL_MODEL, "escalate_to": GROQ_MODEL},
+    "post_analyzer": {"model": GROQ_SMALL_MODEL, "escalate_to": GROQ_MODEL},
+}
+
+# LLM Client Pool (one shared client per API key, keep-alive connections)
+LLM_CLIENT_MAX_CLIENTS = 32         # LRU cap on pooled clients (bring-your-own-key users)
+LLM_MAX_CONNECTIONS = 20            # Per-client HTTP connection limit
+LLM_MAX_KEEPALIVE_CONNECTIONS = 10  # Idle connections kept open for reuse
+LLM_KEEPALIVE_EXPIRY = 60.0         # Seconds an idle connection stays open
+
+# LLM Rate Limiting (per API key; match these to your Groq plan)
+GROQ_RPM_LIMIT = 30                 # Requests per minute
+GROQ_TPM_LIMIT = 60000              # Tokens per minute (prompt + completion, estimated)
+LLM_DEFAULT_COMPLETION_TOKENS = 1024  # Completion budget assumed when max_tokens is unset
+LLM_INITIAL_CONCURRENCY = 4         # Adaptive (AIMD) in-flight limit per key...
+LLM_MIN_CONCURRENCY = 1
+LLM_MAX_CONCURRENCY = 16
+LLM_LATENCY_TARGET = 30.0           # ...halved when a call takes longer than this (seconds)
+
+# LLM Resilience (timeouts, retries, circuit breaker per provider/model)
+LLM_REQUEST_TIMEOUT = 60.0          # Deadline for a single API call (seconds)
+LLM_CALL_DEADLINE = 150.0           # Overall budget for one call: queueing, all attempts and backoff
+LLM_MAX_RETRIES = 3                 # Extra attempts on timeouts, 429s, 5xx and connection errors
+LLM_RETRY_BASE_DELAY = 1.0          # Backoff before retry n is random(0, base * 2**n)...
+LLM_RETRY_MAX_DELAY = 20.0          # ...capped at this many seconds
+LLM_BREAKER_FAILURE_THRESHOLD = 5   # Consecutive failures that open the breaker
+LLM_BREAKER_RESET_TIMEOUT = 30.0    # Seconds open before a single trial call is let through
+
+# LLM Hedged Requests (duplicate a slow call, keep whichever answers first)
+LLM_HEDGE_NODES = ("generator",)    # Nodes allowed to hedge (when ENABLE_HEDGED_REQUESTS)
+LLM_HEDGE_PERCENTILE = 95           # Hedge once a call outlives this latency percentile...
+LLM_HEDGE_MIN_DELAY = 2.0           # ...but never sooner than this (seconds)
+LLM_HEDGE_DEFAULT_DELAY = 15.0      # Delay used until enough latencies are recorded
+LLM_HEDGE_MIN_SAMPLES = 20          # Latencies needed before the percentile is trusted
+LLM_HEDGE_WINDOW = 200              # Recent latencies kept per node
+LLM_HEDGE_BUDGET_RATIO = 0.1        # Hedges earned per call (caps extra calls at ~10%)
+LLM_HEDGE_BUDGET_BURST = 3          # Unused hedges that can be saved up
 
 # Speech-to-Text Configuration
 GROQ_WHISPER_MODEL = "whisper-large-v3-turbo"  # Fast transcription
@@ -26,16 +69,52 @@ SUPPORTED_PLATFORMS = [
     "Substack"
 ]
 
+# Twitter/X thread packing (weighted length: each URL counts as TWITTER_URL_LENGTH,
+# wide characters such as CJK and emoji count as 2)
+TWITTER_MAX_TWEET_LENGTH = 280
+TWITTER_URL_LENGTH = 23
+
 # Generation Settings (Simplified - no critic/reviser loop anymore)
 RATE_LIMIT_DELAY = 0.1  # Minimal delay for Groq
 
+# Workflow Threads (run_workflow runs every step on one shared pool)
+WORKFLOW_MAX_WORKERS = 32  # Across all concurrent runs; extra steps wait for a free thread
+
 # Feature Toggles
 ENABLE_PARALLEL_PROCESSING = True   # Generate all platforms simultaneously
 ENABLE_STYLE_CACHING = True         # Cache analyzed writing styles
+ENABLE_CORE_MESSAGE_CACHING = True  # Cache extracted core messages per source text
 ENABLE_CONTENT_CLEANUP = True       # Post-process to remove AI patterns
+ENABLE_HEDGED_REQUESTS = False      # Hedge slow generation calls (costs up to ~10% more calls)
+ENABLE_STREAMING = True             # Stream single drafts to the UI token by token
+                                    # (streams aren't hedged: with ENABLE_HEDGED_REQUESTS,
+                                    # drafts for LLM_HEDGE_NODES arrive whole instead)
+ENABLE_THREAD_PACKING = True        # Split over-long tweets locally (and number the re-packed thread)
+ENABLE_LOCAL_REPAIR = True          # Trim over-long drafts and fix hashtags without an LLM call
+ENABLE_REPAIR_LLM_FALLBACK = True   # Revise with the LLM only when local repair can't fix a draft
+ENABLE_MULTI_PLATFORM_GENERATION = False  # One JSON-mode call for all platforms (single drafts, not A/B)
+
+# Batch Cleanup (cleanup_batch for backfills)
+CLEANUP_BATCH_MIN_PARALLEL = 500    # Smaller batches are cleaned in-process (no pool startup)
+CLEANUP_BATCH_CHUNK_SIZE = 250      # Texts sent to a worker process at a time
+CLEANUP_BATCH_MAX_WORKERS = None    # Worker processes (None = one per CPU)
+
+# Cleaner Rule Packs (per-tenant rules in <dir>/<pack>.json, see utils/rule_packs.py)
+CLEANER_RULE_PACK_DIR = Path(os.getenv("CLEANER_RULE_PACK_DIR", Path(__file__).parent / "rule_packs"))
+CLEANER_RULE_PACK_CHECK_INTERVAL = 2.0  # Seconds between checks for edited pack files
+CLEANER_RULE_PACK_CACHE_SIZE = 32       # Compiled pack versions kept in memory
 
 # Cache Settings
 CACHE_DIR = Path.home() / ".content_repurposing_cache"
 CACHE_DIR.mkdir(exist_ok=True)
+CACHE_DB_FILE = CACHE_DIR / "cache.sqlite3"
+CACHE_MAX_ENTRIES = 5000                 # LRU eviction beyond this many entries
+CACHE_MAX_BYTES = 50 * 1024 * 1024       # ...or beyond this much stored JSON
+CACHE_TTL_SECONDS = 30 * 24 * 60 * 60    # Entries expire after 30 days
+CACHE_TOUCH_INTERVAL = 60.0              # Recency is written back at most this often per entry
+CACHE_MEMORY_MAX_ENTRIES = 512           # In-process LRU tier in front of the DB
+CACHE_MEMORY_MAX_BYTES = 16 * 1024 * 1024
+
+# Legacy JSON caches (no longer read; clear_all_caches deletes them)
 STYLE_CACHE_FILE = CACHE_DIR / "style_guides.json"
 CORE_MESSAGE_CACHE_FILE = CACHE_DIR / "core_messages.json"
@@ -0,0 +1,123 @@
+"""
+Shared fixtures.
+
+config creates its cache directory under $HOME at import time, so HOME is
+pointed at a throwaway directory before any project module is imported.
+"""
+import os
+import sys
+import tempfile
+import types
+from pathlib import Path
+from typing import Any, List
+
+os.environ["HOME"] = tempfile.mkdtemp(prefix="content_repurposing_tests_")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+import pytest
+from groq import APIConnectionError, InternalServerError, RateLimitError
+
+from utils import llm_client, rate_limiter, resilience
+from utils.metrics import reset_metrics
+
+
+class FakeClock:
+    """Stands in for the time module in code under test; advance() moves it."""
+    
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start
+    
+    def time(self) -> float:
+        return self.now
+    
+    def monotonic(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float):
+        self.now += seconds
+    
+    sleep = advance
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+# ============================================================================
+# STUBBED GROQ CLIENT
+# ============================================================================
+
+_REQUEST = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+
+
+def server_error() -> InternalServerError:
+    return InternalServerError("boom", response=httpx.Response(500, request=_REQUEST), body=None)
+
+
+def rate_limited() -> RateLimitError:
+    return RateLimitError("slow down", response=httpx.Response(429, request=_REQUEST), body=None)
+
+
+def connection_error() -> APIConnectionError:
+    return APIConnectionError(request=_REQUEST)
+
+
+def _response(content: str) -> Any:
+    usage = types.SimpleNamespace(prompt_tokens=10, total_tokens=20, prompt_tokens_details=None)
+    message = types.SimpleNamespace(content=content)
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=usage)
+
+
+class FakeGroq:
+    """
+    Groq client stand-in for chat.completions.create (sync and async).
+    
+    Each call takes the next item from ``script``: an exception is raised,
+    a string is returned as the message content. Once the script runs out
+    every call answers "ok". Calls' keyword arguments are kept in ``calls``.
+    """
+    
+    def __init__(self):
+        self.script: List[Any] = []
+        self.calls: List[dict] = []
+        self.chat = types.SimpleNamespace(completions=self)
+    
+    def create(self, **kwargs) -> Any:
+        self.calls.append(kwargs)
+        outcome = self.script.pop(0) if self.script else "ok"
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _response(outcome)
+
+
+class FakeAsyncGroq(FakeGroq):
+    async def create(self, **kwargs) -> Any:
+        return FakeGroq.create(self, **kwargs)
+
+
+@pytest.fixture
+def groq_stub(monkeypatch) -> FakeGroq:
+    """
+    Route llm_client's sync and async calls to one scripted FakeGroq, with
+    no backoff, fresh breakers and a rate limiter that never makes anyone wait.
+    """
+    stub = FakeGroq()
+    async_stub = FakeAsyncGroq()
+    async_stub.script, async_stub.calls = stub.script, stub.calls  # One shared script
+    monkeypatch.setattr(llm_client, "get_groq_client", lambda api_key: stub)
+    monkeypatch.setattr(llm_client, "get_async_groq_client", lambda api_key: async_stub)
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt, error: 0.0)
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(rate_limiter, "GROQ_RPM_LIMIT", 10**9)
+    monkeypatch.setattr(rate_limiter, "GROQ_TPM_LIMIT", 10**12)
+    monkeypatch.setattr(llm_client, "rate_limiters", rate_limiter.RateLimiterRegistry(4))
+    return stub
@@ -0,0 +1,172 @@
+"""Expiry and eviction in the SQLite store and the in-process LRU tier."""
+import pytest
+
+from utils import cache_manager, cache_store
+from utils.cache_manager import MemoryLRUCache
+from utils.cache_store import SQLiteCacheStore
+from utils.metrics import get_metrics
+
+
+@pytest.fixture
+def make_store(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(cache_store, "time", clock)
+    
+    def make(**kwargs) -> SQLiteCacheStore:
+        options = {"max_entries": 100, "max_bytes": 1_000_000, "default_ttl": None}
+        options.update(kwargs)
+        return SQLiteCacheStore(tmp_path / "cache.sqlite3", **options)
+    
+    return make
+
+
+def _accessed_at(store: SQLiteCacheStore, key: str) -> float:
+    return store._connection().execute(
+        "SELECT accessed_at FROM cache WHERE namespace = 'ns' AND key = ?", (key,)
+    ).fetchone()[0]
+
+
+# ============================================================================
+# SQLITE STORE
+# ============================================================================
+
+def test_round_trip_and_namespaces(make_store):
+    store = make_store()
+    store.set("ns", "k", {"a": [1, 2]})
+    
+    assert store.get("ns", "k") == {"a": [1, 2]}
+    assert store.get("other", "k") is None
+
+
+def test_entry_expires_after_ttl(make_store, clock):
+    store = make_store(default_ttl=60)
+    store.set("ns", "default", 1)
+    store.set("ns", "short", 2, ttl=10)
+    
+    clock.advance(10)
+    assert store.get("ns", "short") is None
+    assert store.get_with_expiry("ns", "default") == (1, clock.now + 50)
+    
+    clock.advance(50)
+    assert store.get("ns", "default") is None
+
+
+def test_expired_entries_are_dropped_on_write(make_store, clock):
+    store = make_store()
+    store.set("ns", "old", 1, ttl=5)
+    clock.advance(5)
+    store.set("ns", "new", 2)
+    
+    count = store._connection().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+    assert count == 1
+
+
+def test_evicts_least_recently_used_over_entry_limit(make_store, clock):
+    store = make_store(max_entries=2)
+    store.set("ns", "a", 1)
+    clock.advance(1)
+    store.set("ns", "b", 2)
+    clock.advance(1)
+    store.get("ns", "a")  # a is now more recent than b
+    clock.advance(1)
+    store.set("ns", "c", 3)
+    
+    assert store.get("ns", "b") is None
+    assert store.get("ns", "a") == 1
+    assert store.get("ns", "c") == 3
+    assert get_metrics("cache.disk.evictions") == {"cache.disk.evictions": 1}
+
+
+def test_evicts_down_to_byte_limit(make_store, clock):
+    store = make_store(max_bytes=25)
+    for key in ("a", "b", "c"):
+        store.set("ns", key, "x" * 8)  # 10 bytes of JSON each
+        clock.advance(1)
+    
+    assert store.get("ns", "a") is None
+    assert store.get("ns", "b") == "x" * 8
+    assert store.get("ns", "c") == "x" * 8
+
+
+def test_reads_refresh_recency_at_most_once_per_interval(make_store, clock):
+    store = make_store(touch_interval=60)
+    store.set("ns", "k", 1)
+    written = _accessed_at(store, "k")
+    
+    clock.advance(30)
+    store.get("ns", "k")
+    assert _accessed_at(store, "k") == written
+    
+    clock.advance(30)
+    store.get("ns", "k")
+    assert _accessed_at(store, "k") == clock.now
+
+
+def test_clear_one_namespace(make_store):
+    store = make_store()
+    store.set("ns", "k", 1)
+    store.set("other", "k", 2)
+    store.clear("ns")
+    
+    assert store.get("ns", "k") is None
+    assert store.get("other", "k") == 2
+
+
+# ============================================================================
+# MEMORY TIER
+# ============================================================================
+
+def test_memory_tier_evicts_least_recently_used(monkeypatch, clock):
+    monkeypatch.setattr(cache_manager, "time", clock)
+    memory = MemoryLRUCache(max_entries=2, max_bytes=1_000)
+    memory.set("ns", "a", 1)
+    memory.set("ns", "b", 2)
+    memory.get("ns", "a")
+    memory.set("ns", "c", 3)
+    
+    assert memory.get("ns", "b") is None
+    assert memory.get("ns", "a") == 1
+    assert len(memory) == 2
+
+
+def test_memory_tier_byte_limit_and_oversized_values(monkeypatch, clock):
+    monkeypatch.setattr(cache_manager, "time", clock)
+    memory = MemoryLRUCache(max_entries=10, max_bytes=25)
+    memory.set("ns", "a", "x" * 8)
+    memory.set("ns", "b", "x" * 8)
+    memory.set("ns", "c", "x" * 8)
+    memory.set("ns", "huge", "x" * 100)
+    
+    assert memory.get("ns", "a") is None
+    assert memory.get("ns", "huge") is None
+    assert len(memory) == 2
+
+
+def test_memory_tier_honours_expiry(monkeypatch, clock):
+    monkeypatch.setattr(cache_manager, "time", clock)
+    memory = MemoryLRUCache(max_entries=10, max_bytes=1_000)
+    memory.set("ns", "k", 1, expires_at=clock.now + 10)
+    
+    clock.advance(10)
+    assert memory.get("ns", "k") is None
+    assert len(memory) == 0
+
+
+def test_memory_tier_returns_copies(monkeypatch, clock):
+    monkeypatch.setattr(cache_manager, "time", clock)
+    memory = MemoryLRUCache(max_entries=10, max_bytes=1_000)
+    memory.set("ns", "k", {"tags": ["a"]})
+    
+    memory.get("ns", "k")["tags"].append("b")
+    assert memory.get("ns", "k") == {"tags": ["a"]}
+
+
+def test_memory_tier_claims_disk_touch_once_per_interval(monkeypatch, clock):
+    monkeypatch.setattr(cache_manager, "time", clock)
+    memory = MemoryLRUCache(max_entries=10, max_bytes=1_000)
+    memory.set("ns", "k", 1)
+    
+    assert not memory.claim_touch("ns", "k", 60)
+    clock.advance(60)
+    assert memory.claim_touch("ns", "k", 60)
+    assert not memory.claim_touch("ns", "k", 60)
+    assert not memory.claim_touch("ns", "missing", 60)
@@ -0,0 +1,90 @@
+"""FIFO queueing, deadlines and key labels in the per-key rate limiter."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import KeyRateLimiter, RateLimiterRegistry, key_label
+from utils.resilience import DeadlineExceededError
+
+
+@pytest.fixture
+def limiter() -> KeyRateLimiter:
+    """Plenty of request/token budget, but only one call in flight."""
+    limiter = KeyRateLimiter(10**6, 10**9)
+    limiter.concurrency_limit = 1.0
+    return limiter
+
+
+def test_threads_and_coroutines_are_served_in_arrival_order(limiter, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "LLM_MAX_CONCURRENCY", 1)
+    order = []
+    first = limiter.acquire(10)
+    
+    def thread_caller(i):
+        permit = limiter.acquire(10)
+        order.append(i)
+        permit.release()
+    
+    async def async_caller(i):
+        permit = await limiter.acquire_async(10)
+        order.append(i)
+        permit.release()
+    
+    async def main():
+        tasks, threads = [], []
+        for i in range(6):
+            if i % 2:
+                threads.append(threading.Thread(target=thread_caller, args=(i,)))
+                threads[-1].start()
+            else:
+                tasks.append(asyncio.create_task(async_caller(i)))
+            while len(limiter._waiters) <= i:  # Wait until it has queued
+                await asyncio.sleep(0.001)
+        
+        await asyncio.get_running_loop().run_in_executor(None, first.release)
+        await asyncio.gather(*tasks)
+        for thread in threads:
+            thread.join()
+    
+    asyncio.run(main())
+    assert order == list(range(6))
+    assert not limiter._waiters
+
+
+def test_hedges_do_not_jump_the_queue(limiter):
+    permit = limiter.acquire(10)
+    assert limiter.try_charge(10)
+    
+    waiter = threading.Thread(target=lambda: limiter.acquire(10).release())
+    waiter.start()
+    while not limiter._waiters:
+        time.sleep(0.001)
+    
+    assert not limiter.try_charge(10)
+    permit.release()
+    waiter.join()
+
+
+def test_waiter_past_its_deadline_leaves_the_queue(limiter):
+    permit = limiter.acquire(10)
+    
+    with pytest.raises(DeadlineExceededError):
+        limiter.acquire(10, deadline=time.monotonic() + 0.05)
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(limiter.acquire_async(10, deadline=time.monotonic() + 0.05))
+    
+    assert not limiter._waiters
+    permit.release()
+    limiter.acquire(10).release()
+
+
+def test_snapshot_does_not_expose_keys():
+    registry = RateLimiterRegistry(4)
+    registry.get("gsk_secret_key_one")
+    
+    snapshot = registry.snapshot()
+    assert list(snapshot) == [key_label("gsk_secret_key_one")]
+    assert "gsk_" not in next(iter(snapshot))
@@ -0,0 +1,116 @@
+"""Local LinkedIn repair: character limit, hashtag cap and sentence boundaries."""
+import random
+import re
+
+from agents.repair_node import needs_repair, repair_content_node, repair_draft
+from agents.validator_node import PLATFORM_SPECS, _metadata
+
+
+MAX_CHARS = PLATFORM_SPECS["LinkedIn"]["max_chars"]
+MAX_TAGS = PLATFORM_SPECS["LinkedIn"]["hashtags"][1]
+
+HOOK = "Most teams ship too slowly. Here's why!"
+CTA = "What do you think? Let me know below."
+MIDDLE = ["This is middle paragraph number %d. It has two sentences for trimming." % i for i in range(40)]
+
+
+def _hashtags(text: str):
+    return [tag.casefold() for tag in re.findall(r'#(\w+)', text)]
+
+
+def test_compliant_draft_is_left_alone():
+    draft = f"{HOOK}\n\n{MIDDLE[0]}\n\n{CTA}\n\n#AI #Growth #Tech"
+    
+    assert repair_draft(draft, "LinkedIn") == draft
+
+
+def test_over_long_draft_keeps_hook_cta_and_whole_sentences():
+    draft = "\n\n".join([HOOK, *MIDDLE, CTA]) + "\n\n#AI #Growth #Tech"
+    repaired = repair_draft(draft, "LinkedIn")
+    paragraphs = repaired.split("\n\n")
+    
+    assert len(repaired) <= MAX_CHARS
+    assert paragraphs[0] == HOOK
+    assert paragraphs[-2] == CTA
+    assert paragraphs[-1] == "#AI #Growth #Tech"
+    for paragraph in paragraphs[1:-2]:
+        assert paragraph in MIDDLE or paragraph == paragraph.split(" It has")[0]
+        assert paragraph.endswith(".")
+
+
+def test_long_paragraph_is_cut_at_a_sentence_boundary():
+    sentences = ["Sentence %d is here." % i for i in range(200)]
+    draft = HOOK + "\n\n" + " ".join(sentences)
+    repaired = repair_draft(draft, "LinkedIn")
+    
+    assert len(repaired) <= MAX_CHARS
+    assert repaired.endswith(".")
+    assert repaired.split("\n\n")[1] in " ".join(sentences)
+
+
+def test_trailing_hashtags_are_deduplicated_and_capped():
+    draft = f"{HOOK}\n\n#AI #ai #Growth #Tech #Data #Ops #More"
+    
+    assert repair_draft(draft, "LinkedIn") == f"{HOOK}\n\n#AI #Growth #Tech #Data #Ops"
+
+
+def test_inline_hashtags_count_toward_the_cap():
+    draft = "I love #AI and #ai and #Tech.\n\n#AI #Growth #One #Two #Three"
+    repaired = repair_draft(draft, "LinkedIn")
+    
+    assert repaired == "I love #AI and ai and #Tech.\n\n#Growth #One #Two"
+    assert len(_hashtags(repaired)) == MAX_TAGS
+
+
+def test_unrepairable_draft_returns_none():
+    assert repair_draft("x" * 2000, "LinkedIn") is None
+
+
+def test_repair_node_revalidates():
+    draft = "\n\n".join([HOOK, *MIDDLE, CTA]) + "\n\n#AI #ai #Growth #Tech #Data #Ops #More"
+    state = {"drafts": {"LinkedIn": draft}, "metadata": {"LinkedIn": _metadata(draft, "LinkedIn")}}
+    assert needs_repair(state, "LinkedIn")
+    
+    state = repair_content_node(state, "LinkedIn")
+    
+    assert not needs_repair(state, "LinkedIn")
+    assert state["metadata"]["LinkedIn"]["platform_compliant"]
+
+
+def test_repair_node_handles_variations():
+    good = f"{HOOK}\n\n{CTA}\n\n#AI #Growth #Tech"
+    bad = "\n\n".join([HOOK, *MIDDLE, CTA]) + "\n\n#AI #Growth #Tech"
+    state = {
+        "drafts": {"LinkedIn": [good, bad]},
+        "metadata": {"LinkedIn": {"variations": [_metadata(good, "LinkedIn"), _metadata(bad, "LinkedIn")]}},
+    }
+    
+    state = repair_content_node(state, "LinkedIn")
+    
+    assert state["drafts"]["LinkedIn"][0] == good
+    assert len(state["drafts"]["LinkedIn"][1]) <= MAX_CHARS
+
+
+def test_random_drafts_stay_within_limits():
+    rng = random.Random(1)
+    words = "alpha beta gamma delta. epsilon! zeta? eta theta".split()
+    for _ in range(500):
+        paragraphs = [
+            " ".join(rng.choice(words) for _ in range(rng.randint(1, 80))) + "."
+            for _ in range(rng.randint(1, 12))
+        ]
+        tags = " ".join("#t%d" % rng.randint(0, 9) for _ in range(rng.randint(0, 9)))
+        draft = "\n\n".join(paragraphs) + ("\n\n" + tags if tags else "")
+        repaired = repair_draft(draft, "LinkedIn")
+        if repaired is None:
+            continue
+        
+        tags_after = _hashtags(repaired)
+        assert len(repaired) <= MAX_CHARS
+        assert len(tags_after) <= MAX_TAGS
+        assert len(set(tags_after)) == len(tags_after)
+        
+        # The hook is kept, or cut back to whole sentences if it alone is too long
+        hook = repaired.split("\n\n")[0]
+        assert paragraphs[0].startswith(hook)
+        assert hook == paragraphs[0] or hook[-1] in ".!?"
@@ -0,0 +1,235 @@
+"""Retries, deadlines and circuit-breaker transitions, against a stubbed Groq client."""
+import asyncio
+
+import httpx
+import pytest
+from groq import BadRequestError, InternalServerError, RateLimitError
+
+from config import LLM_MAX_RETRIES
+from utils import llm_client, resilience
+from utils.events import run_with_event_sink
+from utils.metrics import get_metrics
+from utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    call_with_retries,
+    get_breaker,
+)
+from conftest import connection_error, rate_limited, server_error
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+@pytest.fixture
+def breaker(monkeypatch, clock) -> CircuitBreaker:
+    monkeypatch.setattr(resilience, "time", clock)
+    return CircuitBreaker("groq/test", failure_threshold=2, reset_timeout=30)
+
+
+def _failing(errors):
+    """fn for call_with_retries that raises each error in turn, then answers "ok"."""
+    calls = []
+    
+    def fn():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+    
+    fn.calls = calls
+    return fn
+
+
+# ============================================================================
+# RETRIES THROUGH THE CLIENT
+# ============================================================================
+
+def test_server_error_is_retried(groq_stub):
+    groq_stub.script[:] = [server_error(), connection_error(), "done"]
+    
+    assert llm_client.chat_completion("key", "generator", model="m", messages=MESSAGES) == "done"
+    assert len(groq_stub.calls) == 3
+    assert get_metrics("resilience.generator.retries") == {"resilience.generator.retries": 2}
+    assert get_breaker("groq", "m").state == CircuitBreaker.CLOSED
+    assert get_breaker("groq", "m").failures == 0
+
+
+def test_every_attempt_has_a_timeout(groq_stub):
+    llm_client.chat_completion("key", "generator", model="m", messages=MESSAGES)
+    
+    assert 0 < groq_stub.calls[0]["timeout"] <= resilience.LLM_REQUEST_TIMEOUT
+
+
+def test_retries_are_reported_as_events(groq_stub):
+    groq_stub.script[:] = [server_error()]
+    events = []
+    
+    run_with_event_sink(
+        events.append, lambda: llm_client.chat_completion("key", "generator", model="m", messages=MESSAGES)
+    )
+    
+    assert [e["type"] for e in events] == ["llm_retry"]
+    assert events[0]["error"] == "InternalServerError"
+
+
+def test_gives_up_after_max_retries(groq_stub):
+    groq_stub.script[:] = [server_error() for _ in range(LLM_MAX_RETRIES + 1)]
+    
+    with pytest.raises(InternalServerError):
+        llm_client.chat_completion("key", "generator", model="m", messages=MESSAGES)
+    assert len(groq_stub.calls) == LLM_MAX_RETRIES + 1
+    assert get_metrics("resilience.retries_exhausted") == {"resilience.retries_exhausted": 1}
+
+
+def test_client_errors_are_not_retried(groq_stub):
+    request = httpx.Request("POST", "https://api.groq.com")
+    groq_stub.script[:] = [BadRequestError("bad", response=httpx.Response(400, request=request), body=None)]
+    
+    with pytest.raises(BadRequestError):
+        llm_client.chat_completion("key", "generator", model="m", messages=MESSAGES)
+    assert len(groq_stub.calls) == 1
+
+
+def test_async_client_retries(groq_stub):
+    groq_stub.script[:] = [server_error(), "done"]
+    
+    result = asyncio.run(llm_client.achat_completion("key", "generator", model="m", messages=MESSAGES))
+    assert result == "done"
+    assert len(groq_stub.calls) == 2
+
+
+# ============================================================================
+# CIRCUIT BREAKER
+# ============================================================================
+
+def test_breaker_opens_after_consecutive_failures(breaker):
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_resets_the_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_lets_one_trial_through_then_closes(breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.advance(30)
+    
+    breaker.before_call()  # The trial
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+
+
+def test_failed_trial_reopens(breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.advance(30)
+    breaker.before_call()
+    breaker.record_failure()
+    
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_trial_without_verdict_frees_the_slot(breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.advance(30)
+    breaker.before_call()
+    breaker.release()
+    
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_state_changes_are_reported_as_events(breaker, clock):
+    events = []
+    
+    def trip():
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.advance(30)
+        breaker.before_call()
+        breaker.record_success()
+    
+    run_with_event_sink(events.append, trip)
+    assert [(e["previous_state"], e["state"]) for e in events] == [
+        ("closed", "open"), ("open", "half_open"), ("half_open", "closed"),
+    ]
+
+
+# ============================================================================
+# CALL_WITH_RETRIES
+# ============================================================================
+
+def test_no_retry_once_the_breaker_opens(breaker, monkeypatch):
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt, error: 0.0)
+    fn = _failing([server_error(), server_error(), server_error()])
+    
+    with pytest.raises(InternalServerError):
+        call_with_retries(breaker, "generator", fn)
+    assert len(fn.calls) == 2
+    
+    with pytest.raises(CircuitOpenError):
+        call_with_retries(breaker, "generator", fn)
+    assert len(fn.calls) == 2
+
+
+def test_rate_limits_do_not_trip_the_breaker(breaker, monkeypatch):
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt, error: 0.0)
+    fn = _failing([rate_limited(), rate_limited(), rate_limited()])
+    
+    assert call_with_retries(breaker, "generator", fn) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+
+
+def test_retry_after_header_sets_the_minimum_backoff(monkeypatch):
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: 0.0)
+    request = httpx.Request("POST", "https://api.groq.com")
+    error = RateLimitError(
+        "slow down", response=httpx.Response(429, headers={"retry-after": "7"}, request=request), body=None
+    )
+    
+    assert resilience.backoff_delay(0, error) == 7.0
+
+
+def test_retry_that_cannot_start_before_the_deadline_is_skipped(breaker, clock, monkeypatch):
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt, error: 5.0)
+    fn = _failing([server_error()])
+    
+    with pytest.raises(InternalServerError):
+        call_with_retries(breaker, "generator", fn, deadline=clock.now + 3)
+    assert len(fn.calls) == 1
+    assert get_metrics("resilience.deadline_exceeded") == {"resilience.deadline_exceeded": 1}
+
+
+def test_attempt_timeout_is_capped_by_the_deadline(clock, monkeypatch):
+    monkeypatch.setattr(resilience, "time", clock)
+    
+    assert resilience.attempt_timeout(clock.now + 5) == 5
+    assert resilience.attempt_timeout(None) == resilience.LLM_REQUEST_TIMEOUT
+    
+    with pytest.raises(DeadlineExceededError):
+        resilience.attempt_timeout(clock.now)
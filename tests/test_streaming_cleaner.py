@@ -0,0 +1,78 @@
+"""StreamingCleaner must produce exactly what cleanup_ai_content does on the whole text."""
+import random
+
+import pytest
+
+from utils.content_cleaner import StreamingCleaner, cleanup_ai_content
+
+
+SAMPLES = [
+    "",
+    "   \n  ",
+    "Plain text with nothing to clean.",
+    """
+    The analysis—a crucial step—helps you leverage your data effectively.
+    
+    It's important to note that we need to utilize comprehensive strategies
+    to optimize our approach. Let's delve into the "robust" methodology.
+    
+    Furthermore, this groundbreaking implementation will facilitate seamless
+    integration. In today's digital landscape, we must analyze the paradigm shift.
+    """,
+    "We do not think it is the the right call. In order to win, we cannot wait.",
+    "Due to the fact that   spacing varies,\n\n\nwe keep it — mostly. Is it not? It is!",
+    "Emoji 🚀 and CJK 中文 survive; \"quoted\" words and 'single' ones too…\n\n#AI #Growth  ",
+    "At the end of the day, a large number of teams will not ship. Last but not least: ship.",
+    "Our ninja team will circle back to move the needle, then synergize.",
+]
+
+
+def _stream(text: str, sizes, rule_pack=None) -> str:
+    cleaner = StreamingCleaner(rule_pack)
+    output = []
+    pos = 0
+    for size in sizes:
+        if pos >= len(text):
+            break
+        output.append(cleaner.feed(text[pos:pos + size]))
+        pos += size
+    if pos < len(text):
+        output.append(cleaner.feed(text[pos:]))
+    output.append(cleaner.flush())
+    return "".join(output)
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16, 1000])
+def test_fixed_chunks_match_batch_cleanup(text, size):
+    assert _stream(text, [size] * len(text)) == cleanup_ai_content(text)
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_random_chunks_match_batch_cleanup(text):
+    rng = random.Random(len(text))
+    for _ in range(50):
+        sizes = [rng.randint(1, 12) for _ in range(len(text))]
+        assert _stream(text, sizes) == cleanup_ai_content(text)
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_rule_pack_matches_batch_cleanup(text):
+    assert _stream(text, [5] * len(text), "example") == cleanup_ai_content(text, rule_pack="example")
+
+
+def test_phrase_split_across_chunks():
+    chunks = ["It is impor", "tant to no", "te that we util", "ize it. Done."]
+    cleaner = StreamingCleaner()
+    streamed = "".join(cleaner.feed(chunk) for chunk in chunks) + cleaner.flush()
+    
+    assert streamed == cleanup_ai_content("".join(chunks))
+    assert "utilize" not in streamed
+
+
+def test_output_lags_by_about_a_clause():
+    cleaner = StreamingCleaner()
+    
+    assert cleaner.feed("First sentence here.") == ""
+    assert cleaner.feed(" Second") == "First sentence here."
+    assert cleaner.flush() == " Second"
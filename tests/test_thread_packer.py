@@ -0,0 +1,127 @@
+"""Tweet lengths and numbering in the Twitter/X thread packer."""
+import random
+import re
+
+import pytest
+
+from config import TWITTER_MAX_TWEET_LENGTH, TWITTER_URL_LENGTH
+from utils.thread_packer import TWEET_SEPARATOR, pack_thread, tweet_length
+
+
+LONG = ("This is a sentence that goes on for a while, with clauses; and more clauses: lots. " * 6).strip()
+_TRAILING_NUMBER = re.compile(r' (\d+)/(\d+)$')
+
+
+def _tweets(thread: str):
+    return thread.split(TWEET_SEPARATOR)
+
+
+def _words(text: str) -> str:
+    return "".join(text.split())
+
+
+# ============================================================================
+# WEIGHTED LENGTH
+# ============================================================================
+
+@pytest.mark.parametrize("text, length", [
+    ("hello", 5),
+    ("https://example.com/" + "a" * 100, TWITTER_URL_LENGTH),
+    ("see www.example.com now", 8 + TWITTER_URL_LENGTH),
+    ("日本語", 6),
+    ("😀", 2),
+    ("caf\u00e9", 4),
+    ("cafe\u0301", 4),  # Combining accent, counted after NFC normalization
+    ("“quotes” — dash", 15),
+    ("wait…", 6),  # The ellipsis is outside the weight-1 ranges
+])
+def test_tweet_length_is_weighted(text, length):
+    assert tweet_length(text) == length
+
+
+# ============================================================================
+# PACKING
+# ============================================================================
+
+def test_fitting_unnumbered_draft_is_unchanged():
+    draft = "First tweet.\n\nSecond tweet.  \n\n\nThird tweet."
+    
+    assert pack_thread(draft) == draft
+    assert pack_thread("Just one short tweet.") == "Just one short tweet."
+
+
+def test_numbered_draft_keeps_its_numbering_style():
+    draft = "1/3 Hook?\n\n2/3 Middle.\n\n3/3 End."
+    assert pack_thread(draft) == draft
+    
+    draft = "Hook? (1/2)\n\nEnd. (2/2)"
+    assert pack_thread(draft) == "Hook? 1/2\n\nEnd. 2/2"
+
+
+def test_fraction_is_not_mistaken_for_numbering():
+    draft = "3/4 of teams fail.\n\nSecond tweet."
+    
+    assert pack_thread(draft) == draft
+
+
+def test_long_tweet_is_split_and_thread_renumbered():
+    draft = f"1/3 Hook tweet here?\n\n2/3 {LONG}\n\n3/3 Final tweet."
+    tweets = _tweets(pack_thread(draft))
+    n = len(tweets)
+    
+    assert n > 3
+    assert all(tweet_length(tweet) <= TWITTER_MAX_TWEET_LENGTH for tweet in tweets)
+    assert [tweet.split(" ", 1)[0] for tweet in tweets] == [f"{i}/{n}" for i in range(1, n + 1)]
+    assert tweets[0] == f"1/{n} Hook tweet here?"
+    assert tweets[-1] == f"{n}/{n} Final tweet."
+
+
+def test_unnumbered_draft_is_numbered_at_the_end_once_split():
+    tweets = _tweets(pack_thread(f"Hook.\n\n{LONG}"))
+    n = len(tweets)
+    
+    assert n > 2
+    for i, tweet in enumerate(tweets, 1):
+        assert tweet.endswith(f" {i}/{n}")
+        assert tweet_length(tweet) <= TWITTER_MAX_TWEET_LENGTH
+
+
+def test_splits_at_sentence_boundaries_first():
+    sentence = "Short sentence number %d is here."
+    body = " ".join(sentence % i for i in range(20))
+    
+    for tweet in _tweets(pack_thread(body)):
+        assert _TRAILING_NUMBER.sub("", tweet).endswith(".")
+
+
+def test_urls_are_never_split():
+    url = "https://example.com/very/long/path/" + "x" * 300
+    tweets = _tweets(pack_thread(f"{LONG} {url} done."))
+    
+    assert any(url in tweet for tweet in tweets)
+    assert all(tweet_length(tweet) <= TWITTER_MAX_TWEET_LENGTH for tweet in tweets)
+
+
+def test_numbering_reserve_grows_with_digits():
+    draft = " ".join(["word"] * 600)  # Packs into 10+ tweets with a small limit
+    tweets = _tweets(pack_thread(draft, max_length=60))
+    
+    assert len(tweets) >= 10
+    assert all(tweet_length(tweet) <= 60 for tweet in tweets)
+
+
+def test_random_drafts_fit_keep_their_words_and_are_stable():
+    rng = random.Random(1)
+    vocab = ["word", "longerword", "日本", "😀", "https://t.co/abc", "end.", "clause,", "semi;", "a" * 40, "x" * 400]
+    for _ in range(100):
+        draft = TWEET_SEPARATOR.join(
+            " ".join(rng.choice(vocab) for _ in range(rng.randint(1, 60)))
+            for _ in range(rng.randint(1, 5))
+        )
+        packed = pack_thread(draft)
+        tweets = _tweets(packed)
+        
+        assert all(tweet_length(tweet) <= TWITTER_MAX_TWEET_LENGTH for tweet in tweets)
+        body = "".join(_TRAILING_NUMBER.sub("", tweet) for tweet in tweets) if len(tweets) > 1 else packed
+        assert _words(body) == _words(draft)
+        assert pack_thread(packed) == packed
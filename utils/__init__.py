@@ -2,7 +2,12 @@
 from .extractors import extract_from_url, extract_from_file
 from .cache_manager import CacheManager
 from .stt_handler import transcribe_audio
-from .content_cleaner import cleanup_ai_content, cleanup_content_list
+from .content_cleaner import cleanup_ai_content, cleanup_content_list, cleanup_batch, StreamingCleaner, CleanerEngine, CleanupEdit
+from .llm_client import get_groq_client, get_async_groq_client, get_prompt_cache_stats, get_node_model
+from .metrics import get_metrics
+from .resilience import CircuitOpenError, DeadlineExceededError, get_breaker_states
+from .hedging import get_hedge_stats
+from .rule_packs import RulePackError, get_cleaner_engine, get_rule_pack_version
 
 __all__ = [
     "extract_from_url", 
@@ -11,4 +16,20 @@ __all__ = [
     "transcribe_audio",
     "cleanup_ai_content",
     "cleanup_content_list",
+    "cleanup_batch",
+    "StreamingCleaner",
+    "CleanerEngine",
+    "CleanupEdit",
+    "get_groq_client",
+    "get_async_groq_client",
+    "get_prompt_cache_stats",
+    "get_node_model",
+    "get_metrics",
+    "CircuitOpenError",
+    "DeadlineExceededError",
+    "get_breaker_states",
+    "get_hedge_stats",
+    "RulePackError",
+    "get_cleaner_engine",
+    "get_rule_pack_version",
 ]
@@ -1,90 +1,276 @@
 """Cache Manager for Phase 3 - Style guides and core messages."""
-import json
 import hashlib
-from pathlib import Path
-from typing import Optional, Dict
-from config import STYLE_CACHE_FILE, CORE_MESSAGE_CACHE_FILE, ENABLE_STYLE_CACHING
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Dict, Tuple
+from config import (
+    STYLE_CACHE_FILE,
+    CORE_MESSAGE_CACHE_FILE,
+    CACHE_DB_FILE,
+    CACHE_MAX_ENTRIES,
+    CACHE_MAX_BYTES,
+    CACHE_TTL_SECONDS,
+    CACHE_TOUCH_INTERVAL,
+    CACHE_MEMORY_MAX_ENTRIES,
+    CACHE_MEMORY_MAX_BYTES,
+    ENABLE_STYLE_CACHING,
+    ENABLE_CORE_MESSAGE_CACHING,
+)
+from .cache_store import SQLiteCacheStore
+from .metrics import increment, get_metrics
+
+
+STYLE_NAMESPACE = "style"
+CORE_MESSAGE_NAMESPACE = "core_message"
+
+
+class MemoryLRUCache:
+    """
+    Bounded in-process LRU tier that sits in front of the SQLite store.
+    
+    Capped by entry count and by size (JSON-encoded bytes). All
+    operations take one lock, so platform threads can share it. Values
+    are kept JSON-encoded, so every hit returns a fresh copy that callers
+    are free to modify.
+    
+    Hits are remembered per entry so the disk tier's recency can be
+    refreshed (see claim_touch); otherwise the hottest entries would look
+    coldest to the disk LRU.
+    """
+    
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, int, Optional[float]]]" = OrderedDict()
+        self._touched: Dict[Tuple[str, str], float] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                increment("cache.memory.misses")
+                return None
+            
+            payload, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                self._remove((namespace, key))
+                increment("cache.memory.misses")
+                return None
+            
+            self._entries.move_to_end((namespace, key))
+            increment("cache.memory.hits")
+        return json.loads(payload)
+    
+    def set(self, namespace: str, key: str, value: Any, expires_at: Optional[float] = None):
+        payload = json.dumps(value, separators=(",", ":"))
+        size = len(payload)
+        if size > self.max_bytes:
+            return  # Too large for the memory tier; the disk tier still has it
+        
+        with self._lock:
+            self._remove((namespace, key))
+            self._entries[(namespace, key)] = (payload, size, expires_at)
+            self._touched[(namespace, key)] = time.time()  # The disk tier was just read or written
+            self._bytes += size
+            
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                increment("cache.memory.evictions")
+    
+    def claim_touch(self, namespace: str, key: str, interval: float) -> bool:
+        """
+        True (at most once per interval) when the entry's disk recency
+        should be refreshed; the caller then touches the disk tier.
+        """
+        now = time.time()
+        with self._lock:
+            if (namespace, key) not in self._entries:
+                return False
+            if now - self._touched.get((namespace, key), 0.0) < interval:
+                return False
+            self._touched[(namespace, key)] = now
+            return True
+    
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._remove((namespace, key))
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._touched.clear()
+            self._bytes = 0
+    
+    def _remove(self, entry_key: Tuple[str, str]):
+        """Drop an entry; caller must hold the lock."""
+        self._touched.pop(entry_key, None)
+        entry = self._entries.pop(entry_key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
 
 
 class CacheManager:
     """Manages caching for style guides and core messages."""
     
+    _store: Optional[SQLiteCacheStore] = None
+    _store_lock = threading.Lock()
+    _memory = MemoryLRUCache(CACHE_MEMORY_MAX_ENTRIES, CACHE_MEMORY_MAX_BYTES)
+    
+    @classmethod
+    def get_store(cls) -> SQLiteCacheStore:
+        """
+        Shared SQLite store, created on first use.
+        
+        The legacy JSON cache files are not imported: their keys predate
+        the model and prompt version in today's keys, so no lookup could
+        ever reach them. clear_all_caches still deletes them.
+        """
+        if cls._store is None:
+            with cls._store_lock:
+                if cls._store is None:
+                    store = SQLiteCacheStore(
+                        CACHE_DB_FILE,
+                        max_entries=CACHE_MAX_ENTRIES,
+                        max_bytes=CACHE_MAX_BYTES,
+                        default_ttl=CACHE_TTL_SECONDS,
+                        touch_interval=CACHE_TOUCH_INTERVAL,
+                    )
+                    cls._store = store
+        return cls._store
+    
     @staticmethod
     def _generate_hash(content: str) -> str:
         """Generate hash for content."""
         return hashlib.md5(content.encode()).hexdigest()
     
     @staticmethod
-    def load_cache(cache_file: Path) -> Dict:
-        """Load cache from file."""
+    def _normalize_text(text: str) -> str:
+        """Collapse whitespace so trivially re-pasted text hits the same key."""
+        return " ".join(text.split())
+    
+    @classmethod
+    def _style_key(cls, best_posts: str, model: str, prompt_version: str) -> str:
+        """Cache key for a style guide: posts (as pasted; layout is style) + model + prompt version."""
+        return cls._generate_hash(f"{model}\x00{prompt_version}\x00{best_posts}")
+    
+    @classmethod
+    def _core_message_key(cls, raw_text: str, model: str, prompt_version: str) -> str:
+        """Cache key for a core message: normalized text + model + prompt version."""
+        return cls._generate_hash(f"{model}\x00{prompt_version}\x00{cls._normalize_text(raw_text)}")
+    
+    @classmethod
+    def get(cls, namespace: str, key: str) -> Optional[Dict]:
+        """
+        Read through the memory tier to the SQLite store.
+        
+        Store errors are treated as a miss.
+        """
+        value = cls._memory.get(namespace, key)
+        if value is not None:
+            if cls._memory.claim_touch(namespace, key, CACHE_TOUCH_INTERVAL):
+                try:
+                    cls.get_store().touch(namespace, key)
+                except Exception as e:
+                    print(f"⚠️ Cache touch failed: {e}")
+            return value
+        
         try:
-            if cache_file.exists():
-                with open(cache_file, 'r') as f:
-                    return json.load(f)
+            entry = cls.get_store().get_with_expiry(namespace, key)
         except Exception as e:
             print(f"⚠️ Cache load failed: {e}")
-        return {}
+            return None
+        
+        if entry is None:
+            increment("cache.disk.misses")
+            return None
+        
+        increment("cache.disk.hits")
+        value, expires_at = entry
+        cls._memory.set(namespace, key, value, expires_at=expires_at)
+        return value
     
-    @staticmethod
-    def save_cache(cache_file: Path, data: Dict):
-        """Save cache to file."""
+    @classmethod
+    def set(cls, namespace: str, key: str, value: Dict, ttl: Optional[float] = None):
+        """Write to the SQLite store, then the memory tier (ttl defaults to CACHE_TTL_SECONDS)."""
+        ttl = ttl or CACHE_TTL_SECONDS
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            cls.get_store().set(namespace, key, value, ttl=ttl)
         except Exception as e:
             print(f"⚠️ Cache save failed: {e}")
+        cls._memory.set(namespace, key, value, expires_at=time.time() + ttl)
     
     @classmethod
-    def get_cached_style(cls, best_posts: str) -> Optional[Dict]:
-        """Get cached style guide for given posts."""
+    def invalidate(cls, namespace: str, key: str):
+        """Remove an entry from both tiers."""
+        cls._memory.delete(namespace, key)
+        try:
+            cls.get_store().delete(namespace, key)
+        except Exception as e:
+            print(f"⚠️ Cache delete failed: {e}")
+    
+    @staticmethod
+    def get_stats() -> Dict[str, float]:
+        """Hit/miss/eviction counters for the memory and disk tiers."""
+        return get_metrics("cache.")
+    
+    @classmethod
+    def get_cached_style(cls, best_posts: str, model: str, prompt_version: str) -> Optional[Dict]:
+        """Get cached style guide for given posts, model and prompt version."""
         if not ENABLE_STYLE_CACHING or not best_posts:
             return None
         
-        cache = cls.load_cache(STYLE_CACHE_FILE)
-        posts_hash = cls._generate_hash(best_posts)
+        style = cls.get(STYLE_NAMESPACE, cls._style_key(best_posts, model, prompt_version))
         
-        if posts_hash in cache:
+        if style is not None:
             print("💾 [CACHE] Using cached style guide")
-            return cache[posts_hash]
         
-        return None
+        return style
     
     @classmethod
-    def save_style(cls, best_posts: str, style_guide: Dict):
+    def save_style(cls, best_posts: str, model: str, prompt_version: str, style_guide: Dict):
         """Save style guide to cache."""
         if not ENABLE_STYLE_CACHING or not best_posts:
             return
         
-        cache = cls.load_cache(STYLE_CACHE_FILE)
-        posts_hash = cls._generate_hash(best_posts)
-        cache[posts_hash] = style_guide
-        cls.save_cache(STYLE_CACHE_FILE, cache)
+        cls.set(STYLE_NAMESPACE, cls._style_key(best_posts, model, prompt_version), style_guide)
         print("💾 [CACHE] Style guide saved for future use")
     
     @classmethod
-    def get_cached_core_message(cls, raw_text: str) -> Optional[Dict]:
-        """Get cached core message for given text."""
-        cache = cls.load_cache(CORE_MESSAGE_CACHE_FILE)
-        text_hash = cls._generate_hash(raw_text)
+    def get_cached_core_message(cls, raw_text: str, model: str, prompt_version: str) -> Optional[Dict]:
+        """Get cached core message for given text, model and prompt version."""
+        if not ENABLE_CORE_MESSAGE_CACHING or not raw_text:
+            return None
+        
+        core_message = cls.get(CORE_MESSAGE_NAMESPACE, cls._core_message_key(raw_text, model, prompt_version))
         
-        if text_hash in cache:
+        if core_message is not None:
             print("💾 [CACHE] Using cached core message")
-            return cache[text_hash]
         
-        return None
+        return core_message
     
     @classmethod
-    def save_core_message(cls, raw_text: str, core_message: Dict):
+    def save_core_message(cls, raw_text: str, model: str, prompt_version: str, core_message: Dict):
         """Save core message to cache."""
-        cache = cls.load_cache(CORE_MESSAGE_CACHE_FILE)
-        text_hash = cls._generate_hash(raw_text)
-        cache[text_hash] = core_message
-        cls.save_cache(CORE_MESSAGE_CACHE_FILE, cache)
+        if not ENABLE_CORE_MESSAGE_CACHING or not raw_text:
+            return
+        
+        cls.set(CORE_MESSAGE_NAMESPACE, cls._core_message_key(raw_text, model, prompt_version), core_message)
         print("💾 [CACHE] Core message saved for future use")
     
     @classmethod
     def clear_all_caches(cls):
         """Clear all caches."""
+        cls._memory.clear()
+        cls.get_store().clear()
         for cache_file in [STYLE_CACHE_FILE, CORE_MESSAGE_CACHE_FILE]:
             if cache_file.exists():
                 cache_file.unlink()
@@ -0,0 +1,169 @@
+"""
+SQLite-backed persistent cache store.
+
+Replaces the old whole-file JSON caches: lookups are O(1) keyed reads,
+every write is its own transaction (safe across threads and Streamlit
+sessions), and the store is bounded by entry count, total bytes and a
+per-entry TTL with least-recently-used eviction.
+
+Recency is approximate: a read only rewrites accessed_at when it is more
+than touch_interval seconds old, so a hot entry doesn't take the write
+lock on every hit.
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from .metrics import increment
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace   TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    expires_at  REAL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at);
+CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache (expires_at);
+"""
+
+
+class SQLiteCacheStore:
+    """
+    Namespaced key/value store on a single SQLite file.
+    
+    Values are JSON-serialized. Each thread gets its own connection; WAL
+    mode lets readers proceed while another session is writing.
+    """
+    
+    def __init__(
+        self,
+        db_path: Path,
+        max_entries: int,
+        max_bytes: int,
+        default_ttl: Optional[float] = None,
+        touch_interval: float = 0.0,
+    ):
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+        
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+    
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self.get_with_expiry(namespace, key)
+        return entry[0] if entry is not None else None
+    
+    def get_with_expiry(self, namespace: str, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """Return (value, expires_at), or None if missing or expired."""
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires_at, accessed_at FROM cache WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        
+        if row is None:
+            return None
+        
+        value, expires_at, accessed_at = row
+        if expires_at is not None and expires_at <= now:
+            conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+            return None
+        
+        # Touch for LRU ordering (throttled; see touch_interval)
+        if now - accessed_at >= self.touch_interval:
+            conn.execute(
+                "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key),
+            )
+        return json.loads(value), expires_at
+    
+    def touch(self, namespace: str, key: str) -> None:
+        """Mark an entry as just used (e.g. after a hit in a cache tier in front of this one)."""
+        self._connection().execute(
+            "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+            (time.time(), namespace, key),
+        )
+    
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value atomically, then evict down to the size limits."""
+        payload = json.dumps(value, separators=(",", ":"))
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl else None
+        
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache "
+                "(namespace, key, value, size, created_at, accessed_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (namespace, key, payload, len(payload), now, now, expires_at),
+            )
+            self._evict(conn, now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired rows, then least-recently-used rows over the limits."""
+        conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        
+        count, total_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+        ).fetchone()
+        
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+        
+        excess_entries = max(count - self.max_entries, 0)
+        excess_bytes = max(total_bytes - self.max_bytes, 0)
+        
+        victims = []
+        freed = 0
+        for rowid, size in conn.execute("SELECT rowid, size FROM cache ORDER BY accessed_at"):
+            if len(victims) >= excess_entries and freed >= excess_bytes:
+                break
+            victims.append((rowid,))
+            freed += size
+        
+        conn.executemany("DELETE FROM cache WHERE rowid = ?", victims)
+        increment("cache.disk.evictions", len(victims))
+    
+    def delete(self, namespace: str, key: str) -> None:
+        self._connection().execute(
+            "DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+        )
+    
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Remove every entry (or every entry in one namespace)."""
+        conn = self._connection()
+        if namespace is None:
+            conn.execute("DELETE FROM cache")
+        else:
+            conn.execute("DELETE FROM cache WHERE namespace = ?", (namespace,))
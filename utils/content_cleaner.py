@@ -7,9 +7,21 @@ This module removes:
 - AI-typical words and phrases
 - Other detectable AI patterns
 """
+import itertools
+import os
 import re
-from typing import Dict, List, Tuple
-import random
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypedDict, Union
+
+from config import (
+    CLEANUP_BATCH_MIN_PARALLEL,
+    CLEANUP_BATCH_CHUNK_SIZE,
+    CLEANUP_BATCH_MAX_WORKERS,
+)
+from .metrics import increment
 
 
 # ============================================================================
@@ -120,178 +132,491 @@ PHRASES_TO_SIMPLIFY: Dict[str, str] = {
 }
 
 
+# Formal forms rewritten as contractions (matched case-insensitively)
+CONTRACTIONS: List[Tuple[str, str]] = [
+    ("do not", "don't"),
+    ("does not", "doesn't"),
+    ("did not", "didn't"),
+    ("will not", "won't"),
+    ("would not", "wouldn't"),
+    ("could not", "couldn't"),
+    ("should not", "shouldn't"),
+    ("can not", "can't"),
+    ("cannot", "can't"),
+    ("is not", "isn't"),
+    ("are not", "aren't"),
+    ("was not", "wasn't"),
+    ("were not", "weren't"),
+    ("have not", "haven't"),
+    ("has not", "hasn't"),
+    ("had not", "hadn't"),
+    ("it is", "it's"),
+    ("that is", "that's"),
+    ("there is", "there's"),
+    ("here is", "here's"),
+    ("what is", "what's"),
+    ("who is", "who's"),
+    ("let us", "let's"),
+    ("I am", "I'm"),
+    ("you are", "you're"),
+    ("we are", "we're"),
+    ("they are", "they're"),
+    ("I will", "I'll"),
+    ("you will", "you'll"),
+    ("we will", "we'll"),
+    ("I would", "I'd"),
+    ("you would", "you'd"),
+    ("we would", "we'd"),
+    ("I have", "I've"),
+    ("you have", "you've"),
+    ("we have", "we've"),
+]
+
+
 # ============================================================================
-# CLEANUP FUNCTIONS
+# EDIT TRACKING
 # ============================================================================
 
-def clean_em_dashes(text: str) -> str:
-    """Replace em dashes and en dashes with appropriate punctuation."""
-    # Em dash (—) to comma or period based on context
-    # Pattern: word—word or word — word
-    text = re.sub(r'\s*—\s*', ', ', text)  # Em dash with spaces
-    text = re.sub(r'—', ', ', text)  # Em dash without spaces
-    
-    # En dash (–) to hyphen
-    text = re.sub(r'–', '-', text)
-    
-    # Clean up double commas that might result
-    text = re.sub(r',\s*,', ',', text)
-    text = re.sub(r'\.\s*,', '.', text)
-    text = re.sub(r',\s*\.', '.', text)
-    
-    return text
+class CleanupEdit(TypedDict):
+    """One change made by a cleanup rule, in offsets of the original text."""
+    rule: str           # e.g. "word:leverage", "contraction:do not", "em_dash"
+    start: int          # Span of the original text that was changed
+    end: int
+    original: str       # text[start:end]
+    replacement: str    # What the rule wrote in its place
 
 
-def clean_emphasis_quotes(text: str) -> str:
-    """Remove quotation marks used for emphasis on single words/short phrases."""
-    # Pattern: "word" or "short phrase" (1-3 words) used for emphasis
-    # Keep actual quotes (dialogue, citations)
-    
-    # Remove quotes around single words that aren't dialogue
-    # Match "word" where word is 1-20 chars and not a full sentence
-    text = re.sub(r'"(\w{1,20})"', r'\1', text)
+class _EditLog:
+    """
+    Edits recorded while the cleanup steps run, mapped to original offsets.
     
-    # Remove quotes around 2-3 word emphasis phrases
-    text = re.sub(r'"(\w+\s\w+)"', r'\1', text)
-    text = re.sub(r'"(\w+\s\w+\s\w+)"', r'\1', text)
+    Each step rewrites the previous step's output, so its match offsets are
+    translated back through the regions replaced so far. An edit that
+    touches text an earlier step already replaced covers that whole earlier
+    edit (e.g. "leverage leverage" -> "use use" -> "use"), so applying the
+    outermost edits to the original reproduces the cleaned text.
+    """
     
-    # Also handle curly quotes
-    text = re.sub(r'["""](\w{1,20})["""]', r'\1', text)
-    text = re.sub(r'["""](\w+\s\w+)["""]', r'\1', text)
+    def __init__(self, original: str):
+        self.original = original
+        self.edits: List[CleanupEdit] = []
+        # Replaced regions as (current_start, current_end, original_start,
+        # original_end), sorted and disjoint in the current text
+        self._regions: List[Tuple[int, int, int, int]] = []
+        self._starts: List[int] = []
+    
+    def _region_at(self, pos: int, is_end: bool) -> Optional[Tuple[int, int, int, int]]:
+        """The replaced region containing pos (as a start or end offset), if any."""
+        i = (bisect_left if is_end else bisect_right)(self._starts, pos) - 1
+        if i < 0:
+            return None
+        region = self._regions[i]
+        inside = pos <= region[1] if is_end else pos < region[1]
+        return region if inside else None
+    
+    def _to_original(self, pos: int, is_end: bool) -> int:
+        """Map a current offset outside every replaced region."""
+        i = (bisect_left if is_end else bisect_right)(self._starts, pos) - 1
+        if i < 0:
+            return pos
+        cur_start, cur_end, orig_start, orig_end = self._regions[i]
+        return orig_end + pos - cur_end
+    
+    def record(self, text: str, step_edits: List[Tuple[int, int, str, str]]) -> None:
+        """
+        Add one step's (start, end, replacement, rule) edits of text (the
+        step's input), sorted by start.
+        """
+        if not step_edits:
+            return
+        
+        # Widen each edit to whole earlier regions it touches, merging edits
+        # that end up sharing one
+        groups = []
+        for start, end, replacement, rule in step_edits:
+            first = self._region_at(start, is_end=False)
+            last = self._region_at(end, is_end=True)
+            span_start = first[0] if first else start
+            span_end = last[1] if last else end
+            if groups and span_start < groups[-1][1]:
+                group = groups[-1]
+                group[1] = max(group[1], span_end)
+                group[2].append((start, end, replacement))
+            else:
+                groups.append([span_start, span_end, [(start, end, replacement)], rule])
+        
+        regions = []
+        old = self._regions
+        j = 0
+        shift = 0
+        for span_start, span_end, matches, rule in groups:
+            pieces = []
+            pos = span_start
+            for start, end, replacement in matches:
+                pieces.append(text[pos:start])
+                pieces.append(replacement)
+                pos = end
+            pieces.append(text[pos:span_end])
+            replacement = "".join(pieces)
+            
+            first = self._region_at(span_start, is_end=False)
+            last = self._region_at(span_end, is_end=True)
+            orig_start = first[2] if first else self._to_original(span_start, is_end=False)
+            orig_end = last[3] if last else self._to_original(span_end, is_end=True)
+            self.edits.append({
+                "rule": rule,
+                "start": orig_start,
+                "end": orig_end,
+                "original": self.original[orig_start:orig_end],
+                "replacement": replacement,
+            })
+            
+            while j < len(old) and old[j][1] <= span_start:
+                cur_start, cur_end, o_start, o_end = old[j]
+                regions.append((cur_start + shift, cur_end + shift, o_start, o_end))
+                j += 1
+            while j < len(old) and old[j][0] < span_end:
+                j += 1  # Absorbed into this edit
+            regions.append((span_start + shift, span_start + shift + len(replacement), orig_start, orig_end))
+            shift += len(replacement) - (span_end - span_start)
+        
+        for cur_start, cur_end, o_start, o_end in old[j:]:
+            regions.append((cur_start + shift, cur_end + shift, o_start, o_end))
+        
+        self._regions = regions
+        self._starts = [region[0] for region in regions]
     
-    return text
+    def sorted_edits(self) -> List[CleanupEdit]:
+        """Edits by position in the original text (step order within a position)."""
+        return sorted(self.edits, key=lambda edit: edit["start"])
 
 
-def replace_ai_words(text: str) -> str:
-    """Replace AI-typical words with human alternatives."""
-    result = text
-    
-    # Sort by length (longest first) to avoid partial replacements
-    sorted_words = sorted(WORD_REPLACEMENTS.keys(), key=len, reverse=True)
+def _sub(
+    pattern: "re.Pattern",
+    repl: Union[str, Callable[["re.Match"], str]],
+    text: str,
+    log: Optional[_EditLog],
+    rule: Union[str, Callable[["re.Match"], str]],
+) -> str:
+    """pattern.sub(repl, text), recording each change in log when given."""
+    if log is None:
+        return pattern.sub(repl, text)
+    
+    step_edits = []
+    
+    def record(match: "re.Match") -> str:
+        replacement = repl(match) if callable(repl) else match.expand(repl)
+        if replacement != match.group(0):
+            step_edits.append((
+                match.start(), match.end(), replacement,
+                rule(match) if callable(rule) else rule,
+            ))
+        return replacement
+    
+    result = pattern.sub(record, text)
+    log.record(text, step_edits)
+    return result
+
+
+# ============================================================================
+# COMPILED CLEANER
+# ============================================================================
+
+def _keep_case(original: str, replacement: str) -> str:
+    """Word replacements keep ALL CAPS and Capitalized forms."""
+    if original.isupper():
+        return replacement.upper()
+    elif original[0].isupper():
+        return replacement.capitalize()
+    return replacement
+
+
+def _keep_initial_cap(original: str, replacement: str) -> str:
+    """Contractions keep a capitalized first letter."""
+    if original[0].isupper():
+        return replacement.capitalize()
+    return replacement
+
+
+def _plain(original: str, replacement: str) -> str:
+    """Phrase simplification ignores the original case."""
+    return replacement
+
+
+def _is_word_char(ch: str) -> bool:
+    return bool(re.match(r'\w', ch))
+
+
+def _overlap_guard(key: str, earlier: str, earlier_bounded: bool, key_bounded: bool) -> Optional[str]:
+    """
+    Lookahead (placed at the end of a key match) that rejects the key where
+    an occurrence of earlier would overlap it.
     
-    for ai_word in sorted_words:
-        alternatives = WORD_REPLACEMENTS[ai_word]
-        
-        # Skip if word not in text (optimization)
-        if ai_word.lower() not in result.lower():
+    Returns None if the keys can't overlap, or "(?!)" if earlier always
+    claims part of key first (the key can never match).
+    """
+    key, earlier = key.casefold(), earlier.casefold()
+    guards = []
+    for offset in range(1, len(key)):
+        tail = key[offset:]
+        # earlier needs a word boundary where it starts inside key
+        if earlier_bounded and _is_word_char(key[offset - 1]) == _is_word_char(key[offset]):
             continue
         
-        # Pick a replacement (first one is usually best)
-        replacement = alternatives[0]
+        if len(earlier) < len(tail):
+            # Fully inside key: every boundary is known up front
+            end = offset + len(earlier)
+            if tail.startswith(earlier) and not (
+                earlier_bounded and _is_word_char(key[end - 1]) == _is_word_char(key[end])
+            ):
+                return '(?!)'
+        elif earlier.startswith(tail):
+            rest = re.escape(earlier[len(tail):])
+            if earlier_bounded:
+                if not rest and key_bounded:
+                    return '(?!)'  # Both end on the same boundary
+                rest += r'\b'
+            if not rest:
+                return '(?!)'
+            guards.append('(?!%s)' % rest)
+    return ''.join(guards) or None
+
+
+def _trie_pattern(entries: List[Tuple[str, str]]) -> str:
+    """
+    Regex for (key, tail) entries as a character trie, so each position is
+    rejected after one or two characters instead of trying every key.
+    Longer keys are tried before keys that are their prefixes.
+    """
+    trie: dict = {}
+    for key, tail in entries:
+        node = trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node.setdefault(None, tail)
+    
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in node.items() if ch is not None]
+        if None in node:
+            branches.append(node[None])
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+    
+    return build(trie)
+
+
+class _Stage:
+    """
+    One replacement table as a single compiled regex with a lookup dict.
+    
+    The table used to be applied one key at a time, each key a full regex
+    pass, so an earlier key always won where two keys overlap (e.g. "are
+    not" before "we are" in "we are not"). The combined pattern keeps that
+    priority: a key is rejected wherever an earlier key would overlap it.
+    """
+    
+    def __init__(self, name: str, replacements: Dict[str, str], case_fn, bound_multiword: bool = True):
+        self.name = name
+        self._lookup = {key.casefold(): value for key, value in replacements.items()}
+        self._case_fn = case_fn
         
-        # Use word boundaries to avoid partial matches
-        # Example: "implement" shouldn't match inside "implementation"
-        pattern = re.compile(r'\b' + re.escape(ai_word) + r'\b', re.IGNORECASE)
+        keys = list(replacements)
+        # Verbose phrases only use word boundaries for single words
+        bounded = {key: bound_multiword or ' ' not in key for key in keys}
         
-        def replace_match(match):
-            original = match.group(0)
-            # Preserve capitalization
-            if original.isupper():
-                return replacement.upper()
-            elif original[0].isupper():
-                return replacement.capitalize()
-            return replacement
+        entries = {True: [], False: []}
+        for index, key in enumerate(keys):
+            guards = [
+                _overlap_guard(key, earlier, bounded[earlier], bounded[key])
+                for earlier in keys[:index]
+            ]
+            tail = (r'\b' if bounded[key] else '') + ''.join(g for g in guards if g)
+            entries[bounded[key]].append((key.casefold(), tail))
         
-        result = pattern.sub(replace_match, result)
-    
-    return result
+        alternatives = []
+        if entries[False]:
+            alternatives.append(_trie_pattern(entries[False]))
+        if entries[True]:
+            alternatives.append(r'\b' + _trie_pattern(entries[True]))
+        self.pattern = re.compile('|'.join(alternatives), re.IGNORECASE) if alternatives else None
+    
+    def _replace(self, match: "re.Match") -> str:
+        original = match.group(0)
+        replacement = self._lookup.get(original.casefold())
+        if replacement is None:
+            return original
+        return self._case_fn(original, replacement)
+    
+    def _rule(self, match: "re.Match") -> str:
+        return f"{self.name}:{match.group(0).casefold()}"
+    
+    def apply(self, text: str, log: Optional[_EditLog] = None) -> str:
+        if self.pattern is None:
+            return text
+        return _sub(self.pattern, self._replace, text, log, self._rule)
 
 
-def clean_verbose_phrases(text: str) -> str:
-    """Simplify verbose AI phrases."""
-    result = text
+# Em/en dashes and the punctuation they leave behind
+_EM_DASH = re.compile(r'\s*—\s*')
+_EN_DASH = re.compile('–')
+_DASH_CLEANUP = [
+    (re.compile(r',\s*,'), ','),
+    (re.compile(r'\.\s*,'), '.'),
+    (re.compile(r',\s*\.'), '.'),
+]
+
+# Quotes around 1-3 words used for emphasis (keeps dialogue and citations)
+_EMPHASIS_QUOTES = [
+    re.compile(r'"(\w{1,20})"'),
+    re.compile(r'"(\w+\s\w+)"'),
+    re.compile(r'"(\w+\s\w+\s\w+)"'),
+    # Second sweep catches quotes uncovered by the first (e.g. ""word"")
+    re.compile(r'["""](\w{1,20})["""]'),
+    re.compile(r'["""](\w+\s\w+)["""]'),
+]
+
+_DUPLICATE_WORDS = re.compile(r'\b(\w+)\s+\1\b', re.IGNORECASE)
+
+_SPACING = [
+    (re.compile(r'  +'), ' '),                            # Double spaces
+    (re.compile(r'\s+([.,!?;:])'), r'\1'),                # Space before punctuation
+    (re.compile(r'([.,!?;:])\s*([.,!?;:])'), r'\1'),      # Double punctuation
+]
+
+
+def _longest_first(table: Dict[str, str]) -> Dict[str, str]:
+    return {key: table[key] for key in sorted(table, key=len, reverse=True)}
+
+
+class CleanerEngine:
+    """
+    Compiled form of the cleanup rules.
     
-    # Sort by length (longest first) to match longer phrases before shorter words
-    sorted_phrases = sorted(PHRASES_TO_SIMPLIFY.keys(), key=len, reverse=True)
+    Each replacement table (verbose phrases, AI words, contractions) is one
+    regex alternation with a lookup dict, instead of one regex pass per
+    key. Build once and reuse; the module-level engine covers the default
+    tables.
+    """
     
-    for verbose in sorted_phrases:
-        simple = PHRASES_TO_SIMPLIFY[verbose]
+    def __init__(
+        self,
+        word_replacements: Dict[str, List[str]],
+        phrases: Dict[str, str],
+        contractions: List[Tuple[str, str]],
+    ):
+        # Longest keys first so phrases win over the words they contain
+        self.phrases = _Stage("phrase", _longest_first(phrases), _plain, bound_multiword=False)
         
-        # Use word boundaries for single/few word patterns
-        if ' ' not in verbose:
-            # Single word - use word boundaries
-            pattern = re.compile(r'\b' + re.escape(verbose) + r'\b', re.IGNORECASE)
-        else:
-            # Multi-word phrase - case insensitive only
-            pattern = re.compile(re.escape(verbose), re.IGNORECASE)
+        # The first alternative is usually the best replacement
+        self.words = _Stage(
+            "word",
+            _longest_first({word: alternatives[0] for word, alternatives in word_replacements.items()}),
+            _keep_case,
+        )
         
-        result = pattern.sub(simple, result)
+        # Contractions keep table order ("are not" before "we are")
+        self.contractions = _Stage("contraction", dict(contractions), _keep_initial_cap)
     
-    return result
-
-
-def add_human_imperfections(text: str) -> str:
-    """Optionally add subtle human markers if text seems too perfect."""
-    # This is subtle - we don't want to make it worse
-    # Just ensure contractions are used
-    
-    contractions = [
-        ("do not", "don't"),
-        ("does not", "doesn't"),
-        ("did not", "didn't"),
-        ("will not", "won't"),
-        ("would not", "wouldn't"),
-        ("could not", "couldn't"),
-        ("should not", "shouldn't"),
-        ("can not", "can't"),
-        ("cannot", "can't"),
-        ("is not", "isn't"),
-        ("are not", "aren't"),
-        ("was not", "wasn't"),
-        ("were not", "weren't"),
-        ("have not", "haven't"),
-        ("has not", "hasn't"),
-        ("had not", "hadn't"),
-        ("it is", "it's"),
-        ("that is", "that's"),
-        ("there is", "there's"),
-        ("here is", "here's"),
-        ("what is", "what's"),
-        ("who is", "who's"),
-        ("let us", "let's"),
-        ("I am", "I'm"),
-        ("you are", "you're"),
-        ("we are", "we're"),
-        ("they are", "they're"),
-        ("I will", "I'll"),
-        ("you will", "you'll"),
-        ("we will", "we'll"),
-        ("I would", "I'd"),
-        ("you would", "you'd"),
-        ("we would", "we'd"),
-        ("I have", "I've"),
-        ("you have", "you've"),
-        ("we have", "we've"),
-    ]
-    
-    result = text
-    for formal, contraction in contractions:
-        # Case-insensitive replacement
-        pattern = re.compile(r'\b' + re.escape(formal) + r'\b', re.IGNORECASE)
+    def clean(self, text: str, log: Optional[_EditLog] = None) -> str:
+        """All cleanup steps except the final strip; changes go to log if given."""
+        # Step 1: Phrases first (longer matches before word replacements)
+        result = self.phrases.apply(text, log)
         
-        def replace_contraction(match):
-            original = match.group(0)
-            if original[0].isupper():
-                return contraction.capitalize()
-            return contraction
+        # Step 2: Word replacements
+        result = self.words.apply(result, log)
         
-        result = pattern.sub(replace_contraction, result)
-    
-    return result
+        # Step 3: Punctuation cleanup
+        result = _clean_em_dashes(result, log)
+        result = _clean_emphasis_quotes(result, log)
+        
+        # Step 4: Contractions
+        result = self.contractions.apply(result, log)
+        
+        # Step 5: Clean up duplicate words (e.g., "into into")
+        result = _sub(_DUPLICATE_WORDS, r'\1', result, log, "duplicate_word")
+        
+        # Step 6: Clean up spacing
+        for pattern, replacement in _SPACING:
+            result = _sub(pattern, replacement, result, log, "spacing")
+        
+        return result
+
+
+_engine = CleanerEngine(WORD_REPLACEMENTS, PHRASES_TO_SIMPLIFY, CONTRACTIONS)
+
+
+def _get_engine(rule_pack: Optional[str]) -> CleanerEngine:
+    """The default engine, or the compiled engine for a tenant rule pack."""
+    if rule_pack is None:
+        return _engine
+    from .rule_packs import get_cleaner_engine
+    return get_cleaner_engine(rule_pack)
 
 
 # ============================================================================
-# MAIN CLEANUP FUNCTION
+# CLEANUP FUNCTIONS
 # ============================================================================
 
+def clean_em_dashes(text: str) -> str:
+    """Replace em dashes and en dashes with appropriate punctuation."""
+    return _clean_em_dashes(text, None)
+
+
+def _clean_em_dashes(text: str, log: Optional[_EditLog]) -> str:
+    # Em dash (—) to comma, en dash (–) to hyphen
+    if '—' in text:
+        text = _sub(_EM_DASH, ', ', text, log, "em_dash")
+    if '–' in text:
+        text = _sub(_EN_DASH, '-', text, log, "en_dash")
+    
+    # Clean up double commas that might result
+    for pattern, replacement in _DASH_CLEANUP:
+        text = _sub(pattern, replacement, text, log, "dash_cleanup")
+    
+    return text
+
+
+def clean_emphasis_quotes(text: str) -> str:
+    """Remove quotation marks used for emphasis on single words/short phrases."""
+    return _clean_emphasis_quotes(text, None)
+
+
+def _clean_emphasis_quotes(text: str, log: Optional[_EditLog]) -> str:
+    if '"' not in text:
+        return text
+    for pattern in _EMPHASIS_QUOTES:
+        text = _sub(pattern, r'\1', text, log, "emphasis_quotes")
+    return text
+
+
+def replace_ai_words(text: str) -> str:
+    """Replace AI-typical words with human alternatives (case preserved)."""
+    return _engine.words.apply(text)
+
+
+def clean_verbose_phrases(text: str) -> str:
+    """Simplify verbose AI phrases."""
+    return _engine.phrases.apply(text)
+
+
+def add_human_imperfections(text: str) -> str:
+    """Ensure contractions are used (subtle human marker)."""
+    return _engine.contractions.apply(text)
+
+
 def clean_duplicate_words(text: str) -> str:
     """Remove accidental duplicate words like 'into into' or 'that that'."""
-    # Pattern matches repeated words (case-insensitive)
-    result = re.sub(r'\b(\w+)\s+\1\b', r'\1', text, flags=re.IGNORECASE)
-    return result
+    return _DUPLICATE_WORDS.sub(r'\1', text)
 
 
-def cleanup_ai_content(text: str) -> str:
+# ============================================================================
+# MAIN CLEANUP FUNCTION
+# ============================================================================
+
+def cleanup_ai_content(
+    text: str, return_edits: bool = False, rule_pack: Optional[str] = None
+) -> Union[str, Tuple[str, List[CleanupEdit]]]:
     """
     Main function to clean AI patterns from generated content.
     
@@ -305,43 +630,202 @@ def cleanup_ai_content(text: str) -> str:
     
     Args:
         text: Generated content to clean
-        
+        return_edits: Also return the changes made, collected during the
+            same pass (rule id, span in text, replacement)
+        rule_pack: Tenant rule pack to apply on top of the built-in rules
+    
     Returns:
-        Cleaned content with AI patterns removed
+        Cleaned content with AI patterns removed, or (cleaned, edits)
+        when return_edits is set. Edits are sorted by start; where a step
+        changed text an earlier step had replaced, its edit contains the
+        earlier one.
     """
-    if not text:
-        return text
+    engine = _get_engine(rule_pack)
+    if not return_edits:
+        if not text:
+            return text
+        return engine.clean(text).strip()
     
-    # Apply all cleanup steps in optimal order
-    result = text
+    if not text:
+        return text, []
+    
+    log = _EditLog(text)
+    result = engine.clean(text, log)
+    
+    stripped = result.strip()
+    if stripped != result:
+        leading = len(result) - len(result.lstrip())
+        trailing = len(result) - len(result.rstrip())
+        step_edits = []
+        if leading:
+            step_edits.append((0, leading, "", "strip"))
+        if trailing and stripped:
+            step_edits.append((len(result) - trailing, len(result), "", "strip"))
+        log.record(result, step_edits)
+    
+    return stripped, log.sorted_edits()
+
+
+def cleanup_content_list(contents: List[str], rule_pack: Optional[str] = None) -> List[str]:
+    """Clean a list of content pieces (for A/B variations)."""
+    return [cleanup_ai_content(content, rule_pack=rule_pack) for content in contents]
+
+
+# ============================================================================
+# BATCH CLEANUP
+# ============================================================================
+
+def _clean_chunk(texts: List[str], rule_pack: Optional[str]) -> List[str]:
+    """Worker-process entry point (each worker loads and caches the pack itself)."""
+    return cleanup_content_list(texts, rule_pack)
+
+
+def _chunks(texts: Iterator[str], size: int) -> Iterator[List[str]]:
+    while True:
+        chunk = list(itertools.islice(texts, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def cleanup_batch(
+    texts: Iterable[str],
+    workers: Optional[int] = None,
+    chunk_size: int = CLEANUP_BATCH_CHUNK_SIZE,
+    rule_pack: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Clean a large iterable (or stream) of texts, yielding results in input order.
     
-    # Step 1: Phrases first (longer matches before word replacements)
-    result = clean_verbose_phrases(result)
+    Batches smaller than CLEANUP_BATCH_MIN_PARALLEL are cleaned in-process.
+    Larger ones are split into chunks of chunk_size across a process pool,
+    with at most two chunks per worker in flight so a stream is never read
+    far ahead of what has been yielded. Throughput is printed at the end
+    and recorded under ``cleaner.batch.*``.
     
-    # Step 2: Word replacements
-    result = replace_ai_words(result)
+    Args:
+        texts: Drafts to clean (any iterable, consumed lazily)
+        workers: Worker processes (default CLEANUP_BATCH_MAX_WORKERS or CPU count)
+        chunk_size: Texts per worker task
+        rule_pack: Tenant rule pack to apply on top of the built-in rules
     
-    # Step 3: Punctuation cleanup
-    result = clean_em_dashes(result)
-    result = clean_emphasis_quotes(result)
+    Yields:
+        Cleaned texts, one per input, in the same order
+    """
+    start = time.perf_counter()
+    _get_engine(rule_pack)  # Fail on a bad pack before any work is done
+    iterator = iter(texts)
+    head = list(itertools.islice(iterator, CLEANUP_BATCH_MIN_PARALLEL))
+    count = 0
+    chars = 0
+    
+    if len(head) < CLEANUP_BATCH_MIN_PARALLEL:
+        # Fast path: small batch, not worth starting a pool
+        workers = 1
+        for text in head:
+            count += 1
+            chars += len(text or "")
+            yield cleanup_ai_content(text, rule_pack=rule_pack)
+    else:
+        workers = workers or CLEANUP_BATCH_MAX_WORKERS or os.cpu_count() or 1
+        chunks = _chunks(itertools.chain(head, iterator), chunk_size)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = deque()
+            
+            def submit(chunk: List[str]) -> None:
+                in_flight.append((pool.submit(_clean_chunk, chunk, rule_pack), len(chunk), sum(len(t or "") for t in chunk)))
+            
+            for chunk in itertools.islice(chunks, workers * 2):
+                submit(chunk)
+            
+            while in_flight:
+                future, chunk_count, chunk_chars = in_flight.popleft()
+                cleaned = future.result()
+                next_chunk = next(chunks, None)
+                if next_chunk is not None:
+                    submit(next_chunk)
+                count += chunk_count
+                chars += chunk_chars
+                yield from cleaned
+    
+    elapsed = time.perf_counter() - start
+    increment("cleaner.batch.texts", count)
+    increment("cleaner.batch.chars", chars)
+    increment("cleaner.batch.seconds", elapsed)
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"🧹 [CLEANER] Cleaned {count} texts ({chars:,} chars) in {elapsed:.2f}s "
+          f"with {workers} worker(s): {rate:,.0f} texts/s")
+
+
+# ============================================================================
+# STREAMING CLEANUP
+# ============================================================================
+
+# Whitespace between a punctuation mark and a word. No cleanup rule can
+# match across it: phrases, words and contractions are letters and spaces,
+# duplicate words need a word on both sides, quote/dash rules need those
+# characters on the left, and spacing rules need punctuation on the right.
+# Text can therefore be cleaned piecewise at these points.
+_SAFE_CUT = re.compile(r'(?<=[^\w\s—–"\'-])\s+(?=\w)')
+
+
+class StreamingCleaner:
+    """
+    Incremental cleanup_ai_content for streamed text.
     
-    # Step 4: Contractions
-    result = add_human_imperfections(result)
+    feed() takes raw chunks and returns newly cleaned text; flush() returns
+    the rest once the stream ends. The concatenated output is identical to
+    cleanup_ai_content() on the full text (with the same rule pack).
     
-    # Step 5: Clean up duplicate words (e.g., "into into")
-    result = clean_duplicate_words(result)
+    Raw text is held back only until the next safe cut (the end of the
+    current clause or sentence), and trailing whitespace is held until
+    more text follows, so output lags the stream by about one clause.
+    """
     
-    # Step 6: Clean up spacing
-    result = re.sub(r'  +', ' ', result)  # Double spaces
-    result = re.sub(r'\s+([.,!?;:])', r'\1', result)  # Space before punctuation
-    result = re.sub(r'([.,!?;:])\s*([.,!?;:])', r'\1', result)  # Double punctuation
+    def __init__(self, rule_pack: Optional[str] = None):
+        self._engine = _get_engine(rule_pack)
+        self._buffer = ""       # Raw text after the last safe cut
+        self._scan_from = 0     # Where to resume looking for safe cuts
+        self._pending = ""      # Cleaned trailing whitespace not yet emitted
+        self._started = False   # Leading whitespace is stripped until text appears
     
-    return result.strip()
-
-
-def cleanup_content_list(contents: List[str]) -> List[str]:
-    """Clean a list of content pieces (for A/B variations)."""
-    return [cleanup_ai_content(content) for content in contents]
+    def feed(self, chunk: str) -> str:
+        """Add a raw chunk; return cleaned text that can be shown now."""
+        self._buffer += chunk
+        
+        cut = None
+        for match in _SAFE_CUT.finditer(self._buffer, self._scan_from):
+            cut = match.end()
+        
+        # Resume at the start of any trailing whitespace run next time
+        self._scan_from = len(self._buffer.rstrip())
+        
+        if cut is None:
+            return ""
+        
+        segment, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        self._scan_from = max(0, self._scan_from - cut)
+        return self._emit(self._engine.clean(segment))
+    
+    def flush(self) -> str:
+        """Clean whatever is left at the end of the stream."""
+        output = self._emit(self._engine.clean(self._buffer)) if self._buffer else ""
+        self._buffer = ""
+        self._scan_from = 0
+        self._pending = ""  # Trailing whitespace of the whole text is stripped
+        return output
+    
+    def _emit(self, cleaned: str) -> str:
+        if not self._started:
+            cleaned = cleaned.lstrip()
+            if not cleaned:
+                return ""
+            self._started = True
+        
+        text = self._pending + cleaned
+        output = text.rstrip()
+        self._pending = text[len(output):]
+        return output
 
 
 # ============================================================================
@@ -0,0 +1,40 @@
+"""
+Workflow event sink for code running below the workflow.
+
+Lower layers (retries, circuit breakers) have no handle on the workflow
+generator, so they call emit_event() and the event goes to whatever sink
+the surrounding workflow installed for the current context. With no sink
+installed (CLI scripts, direct node calls) events are dropped.
+"""
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+EventSink = Callable[[Dict[str, Any]], None]
+
+_sink: contextvars.ContextVar[Optional[EventSink]] = contextvars.ContextVar("event_sink", default=None)
+
+
+def emit_event(event: Dict[str, Any]) -> None:
+    """Send event to the current workflow, if any is listening."""
+    sink = _sink.get()
+    if sink is not None:
+        sink(event)
+
+
+def run_with_event_sink(sink: EventSink, fn: Callable[..., Any], *args: Any) -> Any:
+    """Call fn(*args) with sink receiving its events (use on worker threads)."""
+    token = _sink.set(sink)
+    try:
+        return fn(*args)
+    finally:
+        _sink.reset(token)
+
+
+async def arun_with_event_sink(sink: EventSink, awaitable: Awaitable[Any]) -> Any:
+    """Await awaitable with sink receiving its events (wrap in a task)."""
+    token = _sink.set(sink)
+    try:
+        return await awaitable
+    finally:
+        _sink.reset(token)
@@ -0,0 +1,214 @@
+"""
+Hedged requests for tail-latency reduction.
+
+When a call for a hedging node (LLM_HEDGE_NODES, behind
+ENABLE_HEDGED_REQUESTS) hasn't returned after the node's recent
+LLM_HEDGE_PERCENTILE latency, a duplicate is sent and whichever finishes
+first wins. Async losers are cancelled; a sync loser can't be interrupted
+mid-request, so it is abandoned and its result discarded.
+
+Only the API request itself is hedged (utils.llm_client calls this after
+the rate limiter has granted a permit, inside the retry loop), so the
+latencies and the hedge trigger never include queueing or backoff. A
+hedge is only sent if the caller's admit() lets it through, i.e. the
+limiter has room for it right now; it never waits in line.
+
+Spend is bounded by a per-node budget: every call earns
+LLM_HEDGE_BUDGET_RATIO of a hedge, up to LLM_HEDGE_BUDGET_BURST saved.
+Counters live under ``hedge.{node}.*`` (calls, sent, hedge_wins,
+primary_wins, budget_denied, rate_limited).
+"""
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config import (
+    ENABLE_HEDGED_REQUESTS,
+    LLM_HEDGE_NODES,
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_MIN_DELAY,
+    LLM_HEDGE_DEFAULT_DELAY,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_WINDOW,
+    LLM_HEDGE_BUDGET_RATIO,
+    LLM_HEDGE_BUDGET_BURST,
+    LLM_MAX_CONCURRENCY,
+)
+from .metrics import increment, get_metrics
+
+
+class HedgePolicy:
+    """Latency window and hedge budget for one node."""
+    
+    def __init__(self, node: str):
+        self.node = node
+        self._latencies = deque(maxlen=LLM_HEDGE_WINDOW)
+        self._budget = float(LLM_HEDGE_BUDGET_BURST)
+        self._lock = threading.Lock()
+    
+    def record_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+    
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the first call before hedging."""
+        with self._lock:
+            if len(self._latencies) < LLM_HEDGE_MIN_SAMPLES:
+                return LLM_HEDGE_DEFAULT_DELAY
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * LLM_HEDGE_PERCENTILE / 100))
+        return max(LLM_HEDGE_MIN_DELAY, ordered[index])
+    
+    def earn(self) -> None:
+        """Credit the budget for one call."""
+        with self._lock:
+            self._budget = min(float(LLM_HEDGE_BUDGET_BURST), self._budget + LLM_HEDGE_BUDGET_RATIO)
+    
+    def try_spend(self) -> bool:
+        """Take one hedge from the budget if available."""
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            return True
+    
+    def refund(self) -> None:
+        """Return a hedge that was taken but not sent."""
+        with self._lock:
+            self._budget = min(float(LLM_HEDGE_BUDGET_BURST), self._budget + 1)
+
+
+_policies: Dict[str, HedgePolicy] = {}
+_policies_lock = threading.Lock()
+
+# Runs sync attempts so the caller can wait on them with a timeout
+_executor = ThreadPoolExecutor(max_workers=LLM_MAX_CONCURRENCY * 2, thread_name_prefix="llm-hedge")
+
+
+def get_hedge_policy(node: str) -> Optional[HedgePolicy]:
+    """The node's hedge policy, or None when it must not hedge."""
+    if not ENABLE_HEDGED_REQUESTS or node not in LLM_HEDGE_NODES:
+        return None
+    with _policies_lock:
+        policy = _policies.get(node)
+        if policy is None:
+            policy = _policies[node] = HedgePolicy(node)
+        return policy
+
+
+def _timed(policy: HedgePolicy, fn: Callable[[], Any]) -> Any:
+    start = time.perf_counter()
+    result = fn()
+    policy.record_latency(time.perf_counter() - start)
+    return result
+
+
+async def _atimed(policy: HedgePolicy, fn: Callable[[], Awaitable[Any]]) -> Any:
+    start = time.perf_counter()
+    result = await fn()
+    policy.record_latency(time.perf_counter() - start)
+    return result
+
+
+def _should_hedge(policy: HedgePolicy, admit: Optional[Callable[[], bool]]) -> bool:
+    if not policy.try_spend():
+        increment(f"hedge.{policy.node}.budget_denied")
+        return False
+    if admit is not None and not admit():
+        policy.refund()
+        increment(f"hedge.{policy.node}.rate_limited")
+        return False
+    increment(f"hedge.{policy.node}.sent")
+    print(f"⏱️ [HEDGE] {policy.node} call is slow, sending a hedge request")
+    return True
+
+
+def _record_winner(policy: HedgePolicy, hedge_won: bool) -> None:
+    increment(f"hedge.{policy.node}.{'hedge_wins' if hedge_won else 'primary_wins'}")
+
+
+def hedged_call(node: str, fn: Callable[[], Any], admit: Optional[Callable[[], bool]] = None) -> Any:
+    """
+    Run fn, duplicating it once if it is slower than the node's hedge delay.
+    
+    admit, if given, is called before a hedge is sent and must return
+    False when there is no room for an extra request.
+    """
+    policy = get_hedge_policy(node)
+    if policy is None:
+        return fn()
+    
+    increment(f"hedge.{node}.calls")
+    policy.earn()
+    
+    primary = _executor.submit(contextvars.copy_context().run, _timed, policy, fn)
+    done, _ = wait([primary], timeout=policy.hedge_delay())
+    if done or not _should_hedge(policy, admit):
+        return primary.result()
+    
+    hedge = _executor.submit(contextvars.copy_context().run, _timed, policy, fn)
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                for loser in pending:
+                    loser.cancel()  # Only stops it if not started; otherwise abandoned
+                _record_winner(policy, future is hedge)
+                return future.result()
+            error = error or future.exception()
+    raise error
+
+
+async def ahedged_call(
+    node: str, fn: Callable[[], Awaitable[Any]], admit: Optional[Callable[[], bool]] = None
+) -> Any:
+    """Awaitable variant of hedged_call; the losing attempt is cancelled."""
+    policy = get_hedge_policy(node)
+    if policy is None:
+        return await fn()
+    
+    increment(f"hedge.{node}.calls")
+    policy.earn()
+    
+    primary = asyncio.create_task(_atimed(policy, fn))
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=policy.hedge_delay())
+        if done or not _should_hedge(policy, admit):
+            return await primary
+        
+        hedge = asyncio.create_task(_atimed(policy, fn))
+        tasks.add(hedge)
+        pending = set(tasks)
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    _record_winner(policy, task is hedge)
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def get_hedge_stats() -> Dict[str, Dict[str, float]]:
+    """Per-node hedge counters plus how often a sent hedge won."""
+    stats: Dict[str, Dict[str, float]] = {}
+    for name, value in get_metrics("hedge.").items():
+        _, node, counter = name.split(".", 2)
+        stats.setdefault(node, {})[counter] = value
+    
+    for node_stats in stats.values():
+        sent = node_stats.get("sent", 0)
+        node_stats["hedge_win_rate"] = node_stats.get("hedge_wins", 0) / sent if sent else 0.0
+    
+    return stats
@@ -0,0 +1,604 @@
+"""
+Shared Groq client registry.
+
+Building a Groq client creates a fresh HTTP connection pool, so every call
+that does ``Groq(api_key=...)`` pays a new TCP/TLS handshake. This module
+keeps one client per API key for the whole process, with keep-alive
+connection reuse and LRU eviction so bring-your-own-key users can't grow
+the registry without bound.
+
+Pool hits and misses are recorded in utils.metrics under ``llm_client.*``.
+
+chat_completion / achat_completion are the single entry point the agent
+nodes use for chat calls. They coalesce identical concurrent calls so
+only one reaches the API, and pass every call through the per-key rate
+limiter and the retry/circuit-breaker layer in utils.resilience (the
+SDK's own retries are turned off so backoff happens in one place). Slow
+API requests from hedging nodes can be duplicated by utils.hedging. stream_chat_completion /
+astream_chat_completion are the streaming counterparts for drafts.
+
+Each node's model comes from LLM_NODE_MODELS (get_node_model).
+json_chat_completion / ajson_chat_completion parse JSON-mode responses
+and escalate to a larger model when a small one returns malformed JSON
+or leaves out required keys.
+
+Input tokens per node are recorded under ``llm_tokens.*``, split into
+cached and uncached by the usage fields (prompt_tokens_details), see
+get_prompt_cache_stats.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import httpx
+from groq import Groq, AsyncGroq, DefaultHttpxClient, DefaultAsyncHttpxClient, RateLimitError, BadRequestError
+
+from config import (
+    GROQ_MODEL,
+    LLM_NODE_MODELS,
+    LLM_CLIENT_MAX_CLIENTS,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_KEEPALIVE_EXPIRY,
+)
+from .metrics import increment, get_metrics
+from .rate_limiter import rate_limiters, estimate_tokens
+from .resilience import get_breaker, call_with_retries, acall_with_retries, call_deadline, attempt_timeout
+from .hedging import hedged_call, ahedged_call
+from .singleflight import SingleFlight
+
+
+def _connection_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+    )
+
+
+class ClientRegistry:
+    """
+    Thread-safe LRU of API clients keyed by API key (or key + loop).
+    
+    is_stale, if given, is asked about each entry's scope on a pool miss;
+    entries whose scope is gone (e.g. a closed event loop) are dropped.
+    """
+    
+    def __init__(self, name: str, factory: Callable[[str], Any], max_clients: int,
+                 is_stale: Optional[Callable[[Hashable], bool]] = None):
+        self.name = name
+        self._factory = factory
+        self._max_clients = max_clients
+        self._is_stale = is_stale
+        self._clients: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, api_key: str, scope: Hashable = None) -> Any:
+        """Return the pooled client for api_key, creating it on a miss."""
+        key = (api_key, scope)
+        evicted = []
+        
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                increment(f"llm_client.{self.name}.pool_hits")
+                return client
+            
+            if self._is_stale is not None:
+                for stale_key in [k for k in self._clients if self._is_stale(k[1])]:
+                    # Nothing left to close them on; drop them for the GC
+                    del self._clients[stale_key]
+                    increment(f"llm_client.{self.name}.stale_drops")
+            
+            client = self._factory(api_key)
+            self._clients[key] = client
+            increment(f"llm_client.{self.name}.pool_misses")
+            
+            while len(self._clients) > self._max_clients:
+                evicted.append(self._clients.popitem(last=False))
+                increment(f"llm_client.{self.name}.evictions")
+        
+        for evicted_key, evicted_client in evicted:
+            _close_client(evicted_client, evicted_key[1])
+        
+        return client
+    
+    def clear(self) -> None:
+        """Drop (and close) every pooled client."""
+        with self._lock:
+            items = list(self._clients.items())
+            self._clients.clear()
+        for key, client in items:
+            _close_client(client, key[1])
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+
+def _close_client(client: Any, scope: Hashable) -> None:
+    """Close an evicted client without blocking the caller."""
+    try:
+        if isinstance(client, AsyncGroq):
+            # Async clients can only be closed on the loop that owns them
+            loop = asyncio.get_running_loop()
+            if scope is not None and scope() is loop:
+                loop.create_task(client.close())
+        else:
+            client.close()
+    except Exception:
+        pass
+
+
+def _loop_is_gone(loop_ref: "weakref.ref[asyncio.AbstractEventLoop]") -> bool:
+    loop = loop_ref()
+    return loop is None or loop.is_closed()
+
+
+_sync_registry = ClientRegistry(
+    "sync",
+    lambda api_key: Groq(
+        api_key=api_key,
+        max_retries=0,
+        http_client=DefaultHttpxClient(limits=_connection_limits()),
+    ),
+    LLM_CLIENT_MAX_CLIENTS,
+)
+
+_async_registry = ClientRegistry(
+    "async",
+    lambda api_key: AsyncGroq(
+        api_key=api_key,
+        max_retries=0,
+        http_client=DefaultAsyncHttpxClient(limits=_connection_limits()),
+    ),
+    LLM_CLIENT_MAX_CLIENTS,
+    is_stale=_loop_is_gone,
+)
+
+
+def get_groq_client(api_key: str) -> Groq:
+    """Pooled Groq client for api_key (shared across threads)."""
+    return _sync_registry.get(api_key)
+
+
+def get_async_groq_client(api_key: str) -> AsyncGroq:
+    """
+    Pooled AsyncGroq client for api_key on the running event loop.
+    
+    httpx async connection pools are bound to the loop that created them,
+    so async clients are scoped per loop as well as per key. The scope is a
+    weak reference, so a finished loop's id can't be mistaken for a new
+    loop's and its clients are dropped once it is closed.
+    """
+    return _async_registry.get(api_key, scope=weakref.ref(asyncio.get_running_loop()))
+
+
+def clear_client_pool() -> None:
+    """Close and forget every pooled client (e.g. in tests or on shutdown)."""
+    _sync_registry.clear()
+    _async_registry.clear()
+
+
+# =============================================================================
+# CHAT COMPLETIONS
+# =============================================================================
+
+# Identical calls in flight at the same time (same API key and request)
+# share one API call across threads, sessions and event loops
+_inflight = SingleFlight()
+
+
+def _request_key(params: Dict[str, Any]) -> str:
+    """Stable hash of everything that determines the completion."""
+    fingerprint = {
+        "model": params.get("model"),
+        "messages": params.get("messages"),
+        "temperature": params.get("temperature"),
+        "response_format": params.get("response_format"),
+    }
+    encoded = json.dumps(fingerprint, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _flight_key(api_key: str, request_key: str) -> str:
+    """Coalescing key: the request plus the caller's key, so one user's
+    failing or rate-limited key never fails another user's call."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16] + ":" + request_key
+
+
+def _record_flight(node: str, shared: bool) -> None:
+    increment(f"singleflight.{node}.{'coalesced' if shared else 'leaders'}")
+
+
+def _total_tokens(response: Any) -> Optional[int]:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
+def _cached_prompt_tokens(usage: Any) -> int:
+    """prompt_tokens_details.cached_tokens (a plain dict when the SDK doesn't model it)."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    if isinstance(details, dict):
+        return details.get("cached_tokens") or 0
+    return getattr(details, "cached_tokens", None) or 0
+
+
+def _record_usage(node: str, usage: Any) -> None:
+    """Count a call's input tokens, split by whether the provider's prompt cache served them."""
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    if prompt_tokens is None:
+        return
+    cached = min(_cached_prompt_tokens(usage), prompt_tokens)
+    increment(f"llm_tokens.{node}.input", prompt_tokens)
+    increment(f"llm_tokens.{node}.cached_input", cached)
+    increment(f"llm_tokens.{node}.uncached_input", prompt_tokens - cached)
+
+
+LLM_PROVIDER = "groq"
+
+
+def _send_once(api_key: str, node: str, params: Dict[str, Any], deadline: float) -> Any:
+    """
+    Send one chat request once the rate limiter grants a permit (both
+    before deadline). Only the request itself is hedged, so hedge timing
+    never includes queueing or retry backoff.
+    """
+    limiter = rate_limiters.get(api_key)
+    estimated = estimate_tokens(params["messages"], params.get("max_tokens"))
+    permit = limiter.acquire(estimated, deadline=deadline)
+    client = get_groq_client(api_key)
+    throttled = False
+    response = None
+    try:
+        response = hedged_call(
+            node,
+            lambda: client.chat.completions.create(**{"timeout": attempt_timeout(deadline, node), **params}),
+            admit=lambda: limiter.try_charge(estimated),
+        )
+        return response
+    except RateLimitError:
+        throttled = True
+        raise
+    finally:
+        permit.release(throttled=throttled, actual_tokens=_total_tokens(response))
+
+
+async def _asend_once(api_key: str, node: str, params: Dict[str, Any], deadline: float) -> Any:
+    """Awaitable variant of _send_once."""
+    limiter = rate_limiters.get(api_key)
+    estimated = estimate_tokens(params["messages"], params.get("max_tokens"))
+    permit = await limiter.acquire_async(estimated, deadline=deadline)
+    client = get_async_groq_client(api_key)
+    throttled = False
+    response = None
+    try:
+        response = await ahedged_call(
+            node,
+            lambda: client.chat.completions.create(**{"timeout": attempt_timeout(deadline, node), **params}),
+            admit=lambda: limiter.try_charge(estimated),
+        )
+        return response
+    except RateLimitError:
+        throttled = True
+        raise
+    finally:
+        permit.release(throttled=throttled, actual_tokens=_total_tokens(response))
+
+
+def _send(api_key: str, node: str, params: Dict[str, Any]) -> Any:
+    """Send a chat request with deadline, retries and the model's circuit breaker."""
+    breaker = get_breaker(LLM_PROVIDER, params.get("model", ""))
+    deadline = call_deadline()
+    response = call_with_retries(
+        breaker, node, lambda: _send_once(api_key, node, params, deadline), deadline
+    )
+    _record_usage(node, getattr(response, "usage", None))
+    return response
+
+
+async def _asend(api_key: str, node: str, params: Dict[str, Any]) -> Any:
+    """Awaitable variant of _send."""
+    breaker = get_breaker(LLM_PROVIDER, params.get("model", ""))
+    deadline = call_deadline()
+    response = await acall_with_retries(
+        breaker, node, lambda: _asend_once(api_key, node, params, deadline), deadline
+    )
+    _record_usage(node, getattr(response, "usage", None))
+    return response
+
+
+def chat_completion(api_key: str, node: str, **params: Any) -> str:
+    """
+    Run a chat completion for an agent node and return the message content.
+    
+    Args:
+        api_key: Groq API key (selects the pooled client)
+        node: Calling node name, used for metrics
+        **params: Arguments for ``client.chat.completions.create``
+    """
+    def call() -> str:
+        return _send(api_key, node, params).choices[0].message.content
+    
+    content, shared = _inflight.do(_flight_key(api_key, _request_key(params)), call)
+    _record_flight(node, shared)
+    return content
+
+
+async def achat_completion(api_key: str, node: str, **params: Any) -> str:
+    """Awaitable variant of chat_completion on the pooled AsyncGroq client."""
+    async def call() -> str:
+        return (await _asend(api_key, node, params)).choices[0].message.content
+    
+    content, shared = await _inflight.do_async(_flight_key(api_key, _request_key(params)), call)
+    _record_flight(node, shared)
+    return content
+
+
+# =============================================================================
+# PER-NODE MODEL ROUTING
+# =============================================================================
+
+def get_node_model(node: str) -> str:
+    """Model a node's calls go to (LLM_NODE_MODELS, else GROQ_MODEL)."""
+    return LLM_NODE_MODELS.get(node, {}).get("model", GROQ_MODEL)
+
+
+def get_escalation_model(node: str) -> Optional[str]:
+    """Model a node's unusable JSON responses are retried on (None if it isn't routed)."""
+    return LLM_NODE_MODELS.get(node, {}).get("escalate_to")
+
+
+def _missing_keys(content: Optional[str], required_keys: Iterable[str]) -> Optional[List[str]]:
+    """Required keys absent or empty in a JSON response; None if it isn't a JSON object."""
+    try:
+        data = json.loads(content) if content is not None else None
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    return [key for key in required_keys if data.get(key) in (None, "", [], {})]
+
+
+def _is_json_failure(error: BadRequestError) -> bool:
+    """Groq rejects JSON-mode output that doesn't parse with json_validate_failed."""
+    return "json_validate_failed" in str(error)
+
+
+def _escalation(node: str, params: Dict[str, Any], content: Optional[str],
+                required_keys: Iterable[str]) -> Optional[Dict[str, Any]]:
+    """Params for a retry on the node's escalation model, or None if content is usable."""
+    escalate_to = get_escalation_model(node)
+    if not escalate_to or escalate_to == params.get("model"):
+        return None
+    
+    missing = _missing_keys(content, required_keys)
+    if missing == []:
+        return None
+    
+    reason = "malformed JSON" if missing is None else f"no {', '.join(missing)}"
+    increment(f"llm_routing.{node}.escalations")
+    print(f"⬆️ [LLM] {node}: {params.get('model')} returned {reason}, escalating to {escalate_to}")
+    return {**params, "model": escalate_to}
+
+
+def json_chat_completion_with_model(api_key: str, node: str, required_keys: Iterable[str] = (),
+                                   **params: Any) -> Tuple[Dict[str, Any], str]:
+    """
+    chat_completion for JSON-mode calls: (parsed object, model that answered).
+    
+    When the node has an "escalate_to" model in LLM_NODE_MODELS and the
+    response is malformed or lacks any of required_keys, the call is made
+    once more on that model.
+    
+    Raises:
+        BadRequestError: JSON mode rejected the output and there is no
+            model left to escalate to
+        ValueError: The final response isn't valid JSON
+    """
+    increment(f"llm_routing.{node}.calls")
+    error = None
+    try:
+        content = chat_completion(api_key, node, **params)
+    except BadRequestError as e:
+        if not _is_json_failure(e) or not get_escalation_model(node):
+            raise
+        content, error = None, e
+    
+    model = params.get("model")
+    escalated = _escalation(node, params, content, required_keys)
+    if escalated is not None:
+        model = escalated["model"]
+        content = chat_completion(api_key, node, **escalated)
+    elif content is None:
+        raise error
+    return json.loads(content), model
+
+
+async def ajson_chat_completion_with_model(api_key: str, node: str, required_keys: Iterable[str] = (),
+                                          **params: Any) -> Tuple[Dict[str, Any], str]:
+    """Awaitable variant of json_chat_completion_with_model."""
+    increment(f"llm_routing.{node}.calls")
+    error = None
+    try:
+        content = await achat_completion(api_key, node, **params)
+    except BadRequestError as e:
+        if not _is_json_failure(e) or not get_escalation_model(node):
+            raise
+        content, error = None, e
+    
+    model = params.get("model")
+    escalated = _escalation(node, params, content, required_keys)
+    if escalated is not None:
+        model = escalated["model"]
+        content = await achat_completion(api_key, node, **escalated)
+    elif content is None:
+        raise error
+    return json.loads(content), model
+
+
+def json_chat_completion(api_key: str, node: str, required_keys: Iterable[str] = (), **params: Any) -> Dict[str, Any]:
+    """json_chat_completion_with_model, returning only the parsed object."""
+    return json_chat_completion_with_model(api_key, node, required_keys, **params)[0]
+
+
+async def ajson_chat_completion(api_key: str, node: str, required_keys: Iterable[str] = (), **params: Any) -> Dict[str, Any]:
+    """Awaitable variant of json_chat_completion."""
+    return (await ajson_chat_completion_with_model(api_key, node, required_keys, **params))[0]
+
+
+# =============================================================================
+# STREAMING CHAT COMPLETIONS
+# =============================================================================
+
+# Called with (delta, text so far) for every chunk. A retried attempt starts
+# again from empty text, so consumers should render ``text``.
+DeltaCallback = Callable[[str, str], None]
+
+
+class _StreamTimer:
+    """Records time-to-first-token for one streamed call."""
+    
+    def __init__(self, node: str):
+        self.node = node
+        self.start = time.perf_counter()
+        self.first_token = False
+    
+    def mark(self) -> None:
+        if not self.first_token:
+            self.first_token = True
+            increment(f"llm_stream.{self.node}.streams")
+            increment(f"llm_stream.{self.node}.first_token_seconds", time.perf_counter() - self.start)
+
+
+def _chunk_delta(chunk: Any) -> str:
+    if not chunk.choices:
+        return ""
+    return chunk.choices[0].delta.content or ""
+
+
+def _chunk_usage(chunk: Any) -> Any:
+    """Usage arrives on the final chunk (Groq reports it under x_groq)."""
+    return getattr(chunk, "usage", None) or getattr(getattr(chunk, "x_groq", None), "usage", None)
+
+
+def _stream_once(api_key: str, params: Dict[str, Any], on_delta: DeltaCallback, timer: _StreamTimer,
+                 deadline: float) -> tuple:
+    """Stream one chat request; returns (content, usage)."""
+    permit = rate_limiters.get(api_key).acquire(
+        estimate_tokens(params["messages"], params.get("max_tokens")), deadline=deadline
+    )
+    throttled = False
+    usage = None
+    try:
+        stream = get_groq_client(api_key).chat.completions.create(
+            **{"timeout": attempt_timeout(deadline, timer.node), **params, "stream": True}
+        )
+        text = ""
+        for chunk in stream:
+            delta = _chunk_delta(chunk)
+            if delta:
+                timer.mark()
+                text += delta
+                on_delta(delta, text)
+            usage = _chunk_usage(chunk) or usage
+        return text, usage
+    except RateLimitError:
+        throttled = True
+        raise
+    finally:
+        permit.release(throttled=throttled, actual_tokens=getattr(usage, "total_tokens", None))
+
+
+async def _astream_once(api_key: str, params: Dict[str, Any], on_delta: DeltaCallback, timer: _StreamTimer,
+                        deadline: float) -> tuple:
+    """Awaitable variant of _stream_once."""
+    permit = await rate_limiters.get(api_key).acquire_async(
+        estimate_tokens(params["messages"], params.get("max_tokens")), deadline=deadline
+    )
+    throttled = False
+    usage = None
+    try:
+        stream = await get_async_groq_client(api_key).chat.completions.create(
+            **{"timeout": attempt_timeout(deadline, timer.node), **params, "stream": True}
+        )
+        text = ""
+        async for chunk in stream:
+            delta = _chunk_delta(chunk)
+            if delta:
+                timer.mark()
+                text += delta
+                on_delta(delta, text)
+            usage = _chunk_usage(chunk) or usage
+        return text, usage
+    except RateLimitError:
+        throttled = True
+        raise
+    finally:
+        permit.release(throttled=throttled, actual_tokens=getattr(usage, "total_tokens", None))
+
+
+def stream_chat_completion(api_key: str, node: str, on_delta: DeltaCallback, **params: Any) -> str:
+    """
+    Like chat_completion, but calls on_delta as tokens arrive.
+    
+    Calls coalesced onto another caller's stream deliver the whole
+    content as a single delta. Streamed calls are not hedged.
+    """
+    def call() -> str:
+        timer = _StreamTimer(node)
+        breaker = get_breaker(LLM_PROVIDER, params.get("model", ""))
+        deadline = call_deadline()
+        content, usage = call_with_retries(
+            breaker, node, lambda: _stream_once(api_key, params, on_delta, timer, deadline), deadline
+        )
+        _record_usage(node, usage)
+        return content
+    
+    content, shared = _inflight.do(_flight_key(api_key, _request_key(params)), call)
+    _record_flight(node, shared)
+    if shared:
+        on_delta(content, content)
+    return content
+
+
+async def astream_chat_completion(api_key: str, node: str, on_delta: DeltaCallback, **params: Any) -> str:
+    """Awaitable variant of stream_chat_completion."""
+    async def call() -> str:
+        timer = _StreamTimer(node)
+        breaker = get_breaker(LLM_PROVIDER, params.get("model", ""))
+        deadline = call_deadline()
+        content, usage = await acall_with_retries(
+            breaker, node, lambda: _astream_once(api_key, params, on_delta, timer, deadline), deadline
+        )
+        _record_usage(node, usage)
+        return content
+    
+    content, shared = await _inflight.do_async(_flight_key(api_key, _request_key(params)), call)
+    _record_flight(node, shared)
+    if shared:
+        on_delta(content, content)
+    return content
+
+
+def get_prompt_cache_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Per-node input tokens from API usage, split into those the provider
+    served from its prompt (prefix) cache and those it didn't.
+    """
+    stats: Dict[str, Dict[str, float]] = {}
+    for name, value in get_metrics("llm_tokens.").items():
+        _, node, counter = name.split(".", 2)
+        stats.setdefault(node, {})[counter] = value
+    
+    for node_stats in stats.values():
+        total = node_stats.get("input", 0)
+        node_stats["cached_ratio"] = node_stats.get("cached_input", 0) / total if total else 0.0
+    
+    return stats
@@ -0,0 +1,27 @@
+"""In-process performance counters shared by the LLM and cache layers."""
+import threading
+from collections import defaultdict
+from typing import Dict
+
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = defaultdict(float)
+
+
+def increment(name: str, value: float = 1) -> None:
+    """Add value to the named counter (thread-safe)."""
+    with _lock:
+        _counters[name] += value
+
+
+def get_metrics(prefix: str = "") -> Dict[str, float]:
+    """Snapshot of all counters whose name starts with prefix."""
+    with _lock:
+        return {name: value for name, value in _counters.items() if name.startswith(prefix)}
+
+
+def reset_metrics(prefix: str = "") -> None:
+    """Reset counters whose name starts with prefix (all by default)."""
+    with _lock:
+        for name in [n for n in _counters if n.startswith(prefix)]:
+            del _counters[name]
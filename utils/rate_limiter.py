@@ -0,0 +1,325 @@
+"""
+Central rate limiter for Groq calls.
+
+Every chat call acquires a permit from the limiter for its API key before
+it is sent. The limiter enforces:
+
+- a requests-per-minute token bucket
+- a tokens-per-minute bucket charged with the estimated prompt+completion size
+- an adaptive concurrency limit (AIMD): +1 slot per window of successful
+  calls, halved on a 429 or a call slower than the latency target
+
+Callers that can't proceed wait in line instead of failing, unless their
+deadline (see utils.resilience) passes first. Threads and coroutines
+share one first-come, first-served queue per key: only its head may take
+a slot, and it is woken (not polled) when a slot is released or the
+waiter ahead of it leaves. Queue depth and time spent waiting are
+recorded under ``rate_limiter.*``.
+"""
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional
+
+from config import (
+    GROQ_RPM_LIMIT,
+    GROQ_TPM_LIMIT,
+    LLM_MIN_CONCURRENCY,
+    LLM_MAX_CONCURRENCY,
+    LLM_INITIAL_CONCURRENCY,
+    LLM_LATENCY_TARGET,
+    LLM_DEFAULT_COMPLETION_TOKENS,
+    LLM_CLIENT_MAX_CLIENTS,
+)
+from .metrics import increment
+from .resilience import DeadlineExceededError
+
+
+# Rough prompt size estimate; good enough for budgeting before the call
+CHARS_PER_TOKEN = 4
+
+# Salt for key labels; random per process so labels can't be matched to keys
+_KEY_LABEL_SALT = os.urandom(16)
+
+
+def estimate_tokens(messages: List[Dict[str, Any]], max_tokens: Optional[int] = None) -> int:
+    """Estimate total tokens (prompt + completion) for a chat request."""
+    prompt_chars = sum(len(m.get("content") or "") for m in messages)
+    return prompt_chars // CHARS_PER_TOKEN + (max_tokens or LLM_DEFAULT_COMPLETION_TOKENS)
+
+
+class TokenBucket:
+    """Continuous-refill bucket; not thread-safe on its own."""
+    
+    def __init__(self, capacity: float, per_seconds: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / per_seconds
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount is available (0 if available now)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+    
+    def take(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+    
+    def drain(self):
+        self.tokens = min(self.tokens, 0.0)
+
+
+def key_label(api_key: str) -> str:
+    """Opaque, stable-per-process label for an API key (safe to log or display)."""
+    return hashlib.sha256(_KEY_LABEL_SALT + api_key.encode()).hexdigest()[:12]
+
+
+def _bounded(timeout: float, deadline: Optional[float]) -> float:
+    """timeout, shortened to the time left before deadline; raises once it has passed."""
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        increment("rate_limiter.deadline_exceeded")
+        raise DeadlineExceededError("Rate limiter wait")
+    return min(timeout, remaining)
+
+
+def _resolve(future: "asyncio.Future"):
+    if not future.done():
+        future.set_result(None)
+
+
+class _Waiter:
+    """A caller queued for a permit. Async callers are woken through their loop."""
+    
+    __slots__ = ("loop", "future")
+    
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.future: Optional[asyncio.Future] = None
+    
+    def wake(self):
+        """Resolve the pending future from any thread (sync waiters use the condition)."""
+        if self.future is None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+        except RuntimeError:
+            pass  # Loop already closed; the waiter went with it
+
+
+class Permit:
+    """A granted slot; must be released exactly once."""
+    
+    def __init__(self, limiter: "KeyRateLimiter", estimated_tokens: int):
+        self.limiter = limiter
+        self.estimated_tokens = estimated_tokens
+        self.started = time.monotonic()
+        self._released = False
+    
+    def release(self, throttled: bool = False, actual_tokens: Optional[int] = None):
+        """Free the slot and feed the outcome back into the AIMD controller."""
+        if self._released:
+            return
+        self._released = True
+        self.limiter._release(self, throttled, actual_tokens, time.monotonic() - self.started)
+
+
+class KeyRateLimiter:
+    """Request/token budgets and adaptive concurrency for one API key."""
+    
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.concurrency_limit = float(LLM_INITIAL_CONCURRENCY)
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        self._waiters: "deque[_Waiter]" = deque()
+    
+    def _try_acquire(self, estimated_tokens: int) -> float:
+        """Take a slot if possible; otherwise return seconds to wait. Lock held."""
+        if self.in_flight >= int(self.concurrency_limit):
+            return -1.0  # Wait for a release
+        
+        now = time.monotonic()
+        wait = max(
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(estimated_tokens, now),
+        )
+        if wait > 0:
+            return wait
+        
+        self.requests.take(1)
+        self.tokens.take(estimated_tokens)
+        self.in_flight += 1
+        return 0.0
+    
+    def _next_wait(self, waiter: _Waiter, estimated_tokens: int) -> float:
+        """_try_acquire for a queued caller; only the head of the queue may go. Lock held."""
+        if self._waiters[0] is not waiter:
+            return -1.0
+        wait = self._try_acquire(estimated_tokens)
+        if wait == 0:
+            self._waiters.popleft()
+            self._notify()
+        return wait
+    
+    def _leave(self, waiter: _Waiter):
+        """Take a waiter that gave up (deadline, cancellation) out of the queue. Lock held."""
+        if waiter not in self._waiters:
+            return
+        was_head = self._waiters[0] is waiter
+        self._waiters.remove(waiter)
+        if was_head:
+            self._notify()
+    
+    def _notify(self):
+        """Wake blocked threads and, if it is async, the head of the queue. Lock held."""
+        self._cond.notify_all()
+        if self._waiters:
+            self._waiters[0].wake()
+    
+    def acquire(self, estimated_tokens: int, deadline: Optional[float] = None) -> Permit:
+        """Block until the call may be sent (DeadlineExceededError past deadline)."""
+        start = time.monotonic()
+        with self._cond:
+            if self._waiters or self._try_acquire(estimated_tokens) != 0:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+                increment("rate_limiter.queue_depth")
+                try:
+                    wait = self._next_wait(waiter, estimated_tokens)
+                    while wait != 0:
+                        self._cond.wait(timeout=_bounded(wait if wait > 0 else 1.0, deadline))
+                        wait = self._next_wait(waiter, estimated_tokens)
+                finally:
+                    self._leave(waiter)
+                    increment("rate_limiter.queue_depth", -1)
+        self._record_wait(time.monotonic() - start)
+        return Permit(self, estimated_tokens)
+    
+    async def acquire_async(self, estimated_tokens: int, deadline: Optional[float] = None) -> Permit:
+        """Awaitable acquire; waits on the event loop instead of blocking it."""
+        start = time.monotonic()
+        with self._cond:
+            if not self._waiters and self._try_acquire(estimated_tokens) == 0:
+                waiter = None
+            else:
+                waiter = _Waiter(asyncio.get_running_loop())
+                self._waiters.append(waiter)
+                increment("rate_limiter.queue_depth")
+        
+        if waiter is not None:
+            try:
+                while True:
+                    with self._cond:
+                        wait = self._next_wait(waiter, estimated_tokens)
+                        if wait == 0:
+                            break
+                        waiter.future = waiter.loop.create_future()
+                    try:
+                        await asyncio.wait_for(waiter.future, _bounded(wait if wait > 0 else 1.0, deadline))
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                with self._cond:
+                    waiter.future = None
+                    self._leave(waiter)
+                increment("rate_limiter.queue_depth", -1)
+        self._record_wait(time.monotonic() - start)
+        return Permit(self, estimated_tokens)
+    
+    def try_charge(self, estimated_tokens: int) -> bool:
+        """
+        Charge the request and token buckets for an extra request if they
+        have room right now. Used for hedges, which ride on the primary
+        call's concurrency slot and never wait in line (nor jump it: no
+        hedge while anyone is queued).
+        """
+        with self._cond:
+            if self._waiters:
+                return False
+            now = time.monotonic()
+            if self.requests.wait_time(1, now) > 0 or self.tokens.wait_time(estimated_tokens, now) > 0:
+                return False
+            self.requests.take(1)
+            self.tokens.take(estimated_tokens)
+            return True
+    
+    @staticmethod
+    def _record_wait(waited: float):
+        increment("rate_limiter.acquired")
+        increment("rate_limiter.wait_seconds", waited)
+        if waited > 0.001:
+            increment("rate_limiter.queued")
+    
+    def _release(self, permit: Permit, throttled: bool, actual_tokens: Optional[int], latency: float):
+        with self._cond:
+            self.in_flight -= 1
+            
+            # Settle the token estimate against real usage
+            if actual_tokens is not None:
+                self.tokens.take(actual_tokens - permit.estimated_tokens)
+            
+            if throttled:
+                # Multiplicative decrease; stop sending until the buckets refill
+                self.concurrency_limit = max(LLM_MIN_CONCURRENCY, self.concurrency_limit / 2)
+                self.requests.drain()
+                increment("rate_limiter.throttled")
+            elif latency > LLM_LATENCY_TARGET:
+                self.concurrency_limit = max(LLM_MIN_CONCURRENCY, self.concurrency_limit / 2)
+                increment("rate_limiter.slow_calls")
+            else:
+                # Additive increase: about +1 slot per full window of successes
+                self.concurrency_limit = min(
+                    LLM_MAX_CONCURRENCY,
+                    self.concurrency_limit + 1.0 / max(self.concurrency_limit, 1.0),
+                )
+            
+            self._notify()
+
+
+class RateLimiterRegistry:
+    """One KeyRateLimiter per API key, LRU-bounded like the client pool."""
+    
+    def __init__(self, max_keys: int):
+        self._max_keys = max_keys
+        self._limiters: "OrderedDict[str, KeyRateLimiter]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, api_key: str) -> KeyRateLimiter:
+        with self._lock:
+            limiter = self._limiters.get(api_key)
+            if limiter is None:
+                limiter = KeyRateLimiter(GROQ_RPM_LIMIT, GROQ_TPM_LIMIT)
+                self._limiters[api_key] = limiter
+                while len(self._limiters) > self._max_keys:
+                    self._limiters.popitem(last=False)
+            else:
+                self._limiters.move_to_end(api_key)
+            return limiter
+    
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Current concurrency limit and in-flight count per key (keys shown as key_label)."""
+        with self._lock:
+            return {
+                key_label(api_key): {
+                    "concurrency_limit": limiter.concurrency_limit,
+                    "in_flight": limiter.in_flight,
+                }
+                for api_key, limiter in self._limiters.items()
+            }
+
+
+rate_limiters = RateLimiterRegistry(LLM_CLIENT_MAX_CLIENTS)
@@ -0,0 +1,269 @@
+"""
+Retries, deadlines and circuit breaking for LLM calls.
+
+Every call that reaches the API runs under LLM_REQUEST_TIMEOUT. Timeouts,
+429s, 5xx responses and connection errors are retried up to
+LLM_MAX_RETRIES times with full-jitter exponential backoff (a 429's
+Retry-After header is honoured when it asks for longer).
+
+A logical call (rate-limiter wait, every attempt and the backoff between
+them) also has an overall deadline, LLM_CALL_DEADLINE. A retry that
+can't start before it is skipped, and each attempt's timeout is cut to
+the time that is left.
+
+A circuit breaker per provider/model counts consecutive backend failures
+(timeouts, 5xx, connection errors; not 429s, which are per-key quota).
+Once open it fails calls immediately until LLM_BREAKER_RESET_TIMEOUT has
+passed, then lets a single trial call through to decide whether to close.
+
+Retries and breaker state changes are sent to the workflow with
+emit_event() and counted under ``resilience.*``.
+"""
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from groq import APIConnectionError, InternalServerError, RateLimitError
+
+from config import (
+    LLM_MAX_RETRIES,
+    LLM_RETRY_BASE_DELAY,
+    LLM_RETRY_MAX_DELAY,
+    LLM_BREAKER_FAILURE_THRESHOLD,
+    LLM_BREAKER_RESET_TIMEOUT,
+    LLM_CALL_DEADLINE,
+    LLM_REQUEST_TIMEOUT,
+)
+from .events import emit_event
+from .metrics import increment
+
+
+# APIConnectionError also covers APITimeoutError
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+BACKEND_FAILURES = (APIConnectionError, InternalServerError)
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the API while a breaker is open."""
+    
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} is unavailable (circuit open, retry in {retry_in:.0f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a call's overall deadline runs out before it could finish."""
+    
+    def __init__(self, name: str):
+        super().__init__(f"{name} ran out of time ({LLM_CALL_DEADLINE:.0f}s deadline)")
+        self.name = name
+
+
+def call_deadline() -> float:
+    """Monotonic time by which a logical call started now must finish."""
+    return time.monotonic() + LLM_CALL_DEADLINE
+
+
+def attempt_timeout(deadline: Optional[float], node: str = "llm") -> float:
+    """Timeout for the next attempt: LLM_REQUEST_TIMEOUT, capped by the deadline."""
+    if deadline is None:
+        return LLM_REQUEST_TIMEOUT
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        increment("resilience.deadline_exceeded")
+        raise DeadlineExceededError(node)
+    return min(LLM_REQUEST_TIMEOUT, remaining)
+
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures -> half-open trial -> closed."""
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the call must not be sent."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            
+            retry_in = self.opened_at + self.reset_timeout - time.monotonic()
+            if self.state == self.OPEN and retry_in <= 0:
+                self._transition(self.HALF_OPEN)
+            
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+        
+        increment("resilience.breaker_rejections")
+        raise CircuitOpenError(self.name, max(retry_in, 0.0))
+    
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.opened_at = time.monotonic()
+                self._transition(self.OPEN)
+    
+    def release(self) -> None:
+        """Forget a trial call that ended without a verdict (e.g. a 4xx)."""
+        with self._lock:
+            self._trial_in_flight = False
+    
+    def _transition(self, state: str) -> None:
+        """Change state and tell the workflow. Lock held."""
+        previous, self.state = self.state, state
+        increment(f"resilience.breaker_{state}")
+        icon = {self.OPEN: "🔴", self.HALF_OPEN: "🟡", self.CLOSED: "🟢"}[state]
+        emit_event({
+            "type": "circuit_breaker",
+            "breaker": self.name,
+            "state": state,
+            "previous_state": previous,
+            "message": f"{icon} {self.name} circuit {state.replace('_', '-')}",
+            "platform": None,
+        })
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider: str, model: str) -> CircuitBreaker:
+    """Shared breaker for one provider/model pair."""
+    name = f"{provider}/{model}"
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, LLM_BREAKER_FAILURE_THRESHOLD, LLM_BREAKER_RESET_TIMEOUT)
+            _breakers[name] = breaker
+        return breaker
+
+
+def get_breaker_states() -> Dict[str, str]:
+    """Current state of every breaker, by provider/model."""
+    with _breakers_lock:
+        return {name: breaker.state for name, breaker in _breakers.items()}
+
+
+def backoff_delay(attempt: int, error: Exception) -> float:
+    """Full-jitter exponential backoff; never shorter than a 429's Retry-After."""
+    delay = random.uniform(0, min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * 2 ** attempt))
+    
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            delay = max(delay, min(float(retry_after), LLM_RETRY_MAX_DELAY))
+        except ValueError:
+            pass
+    return delay
+
+
+def _on_error(
+    breaker: CircuitBreaker, node: str, attempt: int, error: Exception, deadline: Optional[float]
+) -> Tuple[bool, float]:
+    """Record a failed attempt; return (retry, delay)."""
+    if isinstance(error, BACKEND_FAILURES):
+        breaker.record_failure()
+    else:
+        breaker.release()
+    
+    if not isinstance(error, RETRYABLE_ERRORS):
+        return False, 0.0
+    if attempt >= LLM_MAX_RETRIES or breaker.state == CircuitBreaker.OPEN:
+        # Out of attempts, or this failure just tripped the breaker
+        increment("resilience.retries_exhausted")
+        return False, 0.0
+    
+    delay = backoff_delay(attempt, error)
+    if deadline is not None and time.monotonic() + delay >= deadline:
+        # The retry couldn't even start in time; fail now rather than sleep
+        increment("resilience.deadline_exceeded")
+        return False, 0.0
+    
+    increment("resilience.retries")
+    increment(f"resilience.{node}.retries")
+    emit_event({
+        "type": "llm_retry",
+        "node": node,
+        "attempt": attempt + 1,
+        "max_retries": LLM_MAX_RETRIES,
+        "delay": delay,
+        "error": type(error).__name__,
+        "message": f"🔁 {node}: {type(error).__name__}, retry {attempt + 1}/{LLM_MAX_RETRIES} in {delay:.1f}s",
+        "platform": None,
+    })
+    return True, delay
+
+
+def call_with_retries(
+    breaker: CircuitBreaker, node: str, fn: Callable[[], Any], deadline: Optional[float] = None
+) -> Any:
+    """
+    Run fn through the breaker, retrying retryable errors with backoff.
+    
+    No retry is started that couldn't begin before deadline (a monotonic
+    time, see call_deadline); fn should cap its own waits with it too.
+    """
+    attempt = 0
+    while True:
+        breaker.before_call()
+        try:
+            result = fn()
+        except Exception as e:
+            retry, delay = _on_error(breaker, node, attempt, e, deadline)
+            if not retry:
+                raise
+            time.sleep(delay)
+            attempt += 1
+        else:
+            breaker.record_success()
+            return result
+
+
+async def acall_with_retries(
+    breaker: CircuitBreaker, node: str, fn: Callable[[], Awaitable[Any]], deadline: Optional[float] = None
+) -> Any:
+    """Awaitable variant of call_with_retries; fn creates a fresh coroutine per attempt."""
+    attempt = 0
+    while True:
+        breaker.before_call()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            retry, delay = _on_error(breaker, node, attempt, e, deadline)
+            if not retry:
+                raise
+            await asyncio.sleep(delay)
+            attempt += 1
+        else:
+            breaker.record_success()
+            return result
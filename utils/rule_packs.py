@@ -0,0 +1,193 @@
+"""
+Per-tenant cleaner rule packs.
+
+A rule pack is a JSON file in CLEANER_RULE_PACK_DIR named ``<pack>.json``:
+    
+    {
+        "word_replacements": {"synergize": ["work together"], "ninja": "expert"},
+        "phrases": {"move the needle": "make a difference"}
+    }
+
+Its entries are merged over the built-in WORD_REPLACEMENTS and
+PHRASES_TO_SIMPLIFY (pack entries win) and compiled into a CleanerEngine.
+A pack's version is a hash of its file contents. Compiled engines are cached
+by version, so a pack is compiled once, not once per request. Packs with
+identical contents share an engine.
+
+Files are re-checked at most every CLEANER_RULE_PACK_CHECK_INTERVAL seconds
+and recompiled when they change. If an edited file fails to load, the last
+good version keeps serving.
+
+Keys and replacements may only contain words joined by single spaces,
+apostrophes and hyphens. Sentence punctuation would let a rule match
+across the points where StreamingCleaner splits text, and streamed drafts
+would then differ from the final ones.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from config import (
+    CLEANER_RULE_PACK_DIR,
+    CLEANER_RULE_PACK_CHECK_INTERVAL,
+    CLEANER_RULE_PACK_CACHE_SIZE,
+)
+from .content_cleaner import (
+    CleanerEngine,
+    WORD_REPLACEMENTS,
+    PHRASES_TO_SIMPLIFY,
+    CONTRACTIONS,
+    _engine as _default_engine,
+)
+from .metrics import increment
+
+
+class RulePackError(ValueError):
+    """Raised for a missing or invalid rule pack."""
+
+
+_PACK_NAME = re.compile(r'^[\w-]+$')
+_RULE_TEXT = re.compile(r"^\w(?:[\w'-]*\w)?(?: \w(?:[\w'-]*\w)?)*$")
+
+
+class _PackState:
+    """Last good load of one pack file."""
+    
+    def __init__(self):
+        self.file_key: Optional[Tuple[int, int]] = None  # (mtime_ns, size)
+        self.version: Optional[str] = None
+        self.engine: Optional[CleanerEngine] = None
+        self.checked_at = 0.0
+
+
+_packs: Dict[str, _PackState] = {}
+# Compiled engines by version (LRU), so a pack edited back to an earlier
+# version, or another pack with the same contents, isn't recompiled
+_engines: "OrderedDict[str, CleanerEngine]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _check_rules(pack: str, section: str, rules: Dict[str, List[str]]) -> None:
+    for key, replacements in rules.items():
+        for text in [key, *replacements]:
+            if not isinstance(text, str) or not _RULE_TEXT.match(text):
+                raise RulePackError(
+                    f"Rule pack '{pack}': {section} entry {key!r} -> {text!r} must be words "
+                    "separated by single spaces (no sentence punctuation)"
+                )
+
+
+def _parse_pack(pack: str, raw: bytes) -> Tuple[Dict[str, List[str]], Dict[str, str]]:
+    """Validated (word_replacements, phrases) from a pack file's contents."""
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        raise RulePackError(f"Rule pack '{pack}' is not valid JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise RulePackError(f"Rule pack '{pack}' must be a JSON object")
+    
+    words = data.get("word_replacements", {})
+    phrases = data.get("phrases", {})
+    if not isinstance(words, dict) or not isinstance(phrases, dict):
+        raise RulePackError(f"Rule pack '{pack}': word_replacements and phrases must be objects")
+    
+    # A single replacement may be given as a plain string
+    words = {key: [value] if isinstance(value, str) else value for key, value in words.items()}
+    for key, alternatives in words.items():
+        if not isinstance(alternatives, list) or not alternatives:
+            raise RulePackError(f"Rule pack '{pack}': word_replacements[{key!r}] needs a replacement")
+    
+    _check_rules(pack, "word_replacements", words)
+    _check_rules(pack, "phrases", {key: [value] for key, value in phrases.items()})
+    return words, phrases
+
+
+def _compile(pack: str, raw: bytes, version: str) -> CleanerEngine:
+    """Engine for this pack version, compiled only if not cached. Lock held."""
+    engine = _engines.get(version)
+    if engine is not None:
+        _engines.move_to_end(version)
+        return engine
+    
+    words, phrases = _parse_pack(pack, raw)
+    start = time.perf_counter()
+    engine = CleanerEngine(
+        {**WORD_REPLACEMENTS, **words},
+        {**PHRASES_TO_SIMPLIFY, **phrases},
+        CONTRACTIONS,
+    )
+    increment("cleaner.rule_packs.compiles")
+    print(f"🧩 [CLEANER] Compiled rule pack '{pack}' v{version} "
+          f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+    
+    _engines[version] = engine
+    while len(_engines) > CLEANER_RULE_PACK_CACHE_SIZE:
+        _engines.popitem(last=False)
+    return engine
+
+
+def _refresh(pack: str, state: _PackState) -> None:
+    """Reload the pack file if it changed since the last check. Lock held."""
+    path = CLEANER_RULE_PACK_DIR / f"{pack}.json"
+    try:
+        stat = path.stat()
+        file_key = (stat.st_mtime_ns, stat.st_size)
+        if file_key == state.file_key:
+            return
+        raw = path.read_bytes()
+        version = hashlib.sha256(raw).hexdigest()[:12]
+        engine = _compile(pack, raw, version)
+    except (OSError, RulePackError) as e:
+        if state.version is None:
+            if isinstance(e, OSError):
+                raise RulePackError(f"Rule pack '{pack}' not found in {CLEANER_RULE_PACK_DIR}") from e
+            raise
+        print(f"⚠️ [CLEANER] Rule pack '{pack}' failed to reload, keeping v{state.version}: {e}")
+        increment("cleaner.rule_packs.reload_errors")
+        return
+    
+    if state.version is not None and version != state.version:
+        increment("cleaner.rule_packs.reloads")
+        print(f"🔄 [CLEANER] Rule pack '{pack}' reloaded: v{state.version} -> v{version}")
+    state.file_key = file_key
+    state.version = version
+    state.engine = engine
+
+
+def _current(pack: str) -> _PackState:
+    """The pack's last good load, reloading it if its file changed."""
+    if not _PACK_NAME.match(pack or ""):
+        raise RulePackError(f"Invalid rule pack name: {pack!r}")
+    
+    with _lock:
+        state = _packs.get(pack)
+        if state is None:
+            state = _PackState()
+        
+        now = time.monotonic()
+        if state.version is None or now - state.checked_at >= CLEANER_RULE_PACK_CHECK_INTERVAL:
+            _refresh(pack, state)
+            state.checked_at = now
+            _packs[pack] = state
+        return state
+
+
+def get_rule_pack_version(pack: str) -> str:
+    """Current version (content hash) of a pack."""
+    return _current(pack).version
+
+
+def get_cleaner_engine(pack: Optional[str] = None) -> CleanerEngine:
+    """
+    Compiled engine for a rule pack (the built-in rules when pack is None).
+    
+    Raises:
+        RulePackError: The pack doesn't exist or has never loaded cleanly
+    """
+    if pack is None:
+        return _default_engine
+    return _current(pack).engine
@@ -0,0 +1,89 @@
+"""
+Request coalescing ("singleflight") for identical in-flight calls.
+
+When several callers ask for the same key at the same time, only the
+first (the leader) does the work; the rest wait for and share its result
+or exception. Works across threads (Streamlit sessions, the platform
+ThreadPoolExecutor) and from asyncio code, since every waiter blocks on
+the same concurrent.futures.Future.
+"""
+import asyncio
+import threading
+from concurrent.futures import CancelledError, Future
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+    
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """Return the in-flight future for key and whether the caller leads it."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+    
+    def _finish(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once per concurrent key.
+        
+        Returns (result, shared) where shared is True for callers that
+        received another caller's result.
+        """
+        while True:
+            future, leader = self._join(key)
+            if not leader:
+                try:
+                    return future.result(), True
+                except CancelledError:
+                    continue  # Leader was cancelled; take over
+            
+            try:
+                result = fn()
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            else:
+                future.set_result(result)
+                return result, False
+            finally:
+                self._finish(key, future)
+    
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Awaitable variant of do(); fn is called to create the coroutine."""
+        while True:
+            future, leader = self._join(key)
+            if not leader:
+                try:
+                    # Shield so a cancelled waiter doesn't cancel the shared call
+                    return await asyncio.shield(asyncio.wrap_future(future)), True
+                except asyncio.CancelledError:
+                    if future.cancelled():
+                        continue  # Leader was cancelled; take over
+                    raise
+            
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            else:
+                future.set_result(result)
+                return result, False
+            finally:
+                self._finish(key, future)
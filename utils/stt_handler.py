@@ -1,5 +1,6 @@
 """Speech-to-Text handler using Groq Whisper."""
-from groq import Groq
+from .llm_client import get_groq_client, LLM_PROVIDER
+from .resilience import get_breaker, call_with_retries, call_deadline, attempt_timeout
 from config import GROQ_WHISPER_MODEL
 from typing import BinaryIO
 
@@ -8,6 +9,9 @@ def transcribe_audio(audio_file: BinaryIO, groq_api_key: str) -> str:
     """
     Transcribe audio file using Groq Whisper.
     
+    The pooled client doesn't retry on its own, so the call goes through
+    the same deadline, retries and circuit breaker as the chat calls.
+    
     Args:
         audio_file: Audio file (wav, mp3, m4a, etc.)
         groq_api_key: Groq API key
@@ -16,16 +20,24 @@ def transcribe_audio(audio_file: BinaryIO, groq_api_key: str) -> str:
         Transcribed text
     """
     try:
-        client = Groq(api_key=groq_api_key)
+        client = get_groq_client(groq_api_key)
+        deadline = call_deadline()
         
-        # Call Groq Whisper API
-        transcription = client.audio.transcriptions.create(
-            model=GROQ_WHISPER_MODEL,
-            file=audio_file,
-            response_format="text"
-        )
+        def transcribe() -> str:
+            # A retried attempt has to upload the recording from the start
+            if audio_file.seekable():
+                audio_file.seek(0)
+            
+            # Call Groq Whisper API
+            return client.audio.transcriptions.create(
+                model=GROQ_WHISPER_MODEL,
+                file=audio_file,
+                response_format="text",
+                timeout=attempt_timeout(deadline, "stt"),
+            )
         
-        return transcription
+        breaker = get_breaker(LLM_PROVIDER, GROQ_WHISPER_MODEL)
+        return call_with_retries(breaker, "stt", transcribe, deadline)
     
     except Exception as e:
         raise Exception(f"Transcription failed: {str(e)}")
@@ -0,0 +1,198 @@
+"""
+Deterministic Twitter/X thread packer.
+
+Runs after cleanup_ai_content on Twitter/X drafts. Tweets are separated by
+blank lines (as the validator reads them). Any tweet over the limit is
+split at sentence boundaries, then clause boundaries, then words, and
+greedily re-packed. Tweets that already fit are left alone, and tweets are
+never merged. A draft that was numbered is renumbered "i/n" in the same
+place (start or end of each tweet); an unnumbered one is only numbered,
+at the end, if it had to be re-packed, and is otherwise returned as is.
+
+Lengths follow Twitter's weighted counting: every URL counts as
+TWITTER_URL_LENGTH, and characters outside the Latin/common-punctuation
+ranges (CJK, emoji, ...) count as 2.
+"""
+import re
+import unicodedata
+from typing import Iterator, List, Optional, Tuple
+
+from config import TWITTER_MAX_TWEET_LENGTH, TWITTER_URL_LENGTH
+from .metrics import increment
+
+
+TWEET_SEPARATOR = "\n\n"
+
+_URL = re.compile(r'\b(?:https?://|www\.)\S+', re.IGNORECASE)
+
+# Existing numbering: "1/7 text", "(1/7) text", "1/ text" or "text 1/7"
+_NUMBER_AT_START = re.compile(r'^\(?(\d{1,3})/(\d{1,3})?\)?[.:]?\s+')
+_NUMBER_AT_END = re.compile(r'\s+\(?(\d{1,3})/(\d{1,3})?\)?$')
+
+# Break points, keeping the whitespace that follows them
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?…])(\s+)')
+_CLAUSE_BREAK = re.compile(r'(?<=[,;:])(\s+)')
+_WORD_BREAK = re.compile(r'(\s+)')
+
+
+# ============================================================================
+# WEIGHTED LENGTH
+# ============================================================================
+
+def _char_weight(ch: str) -> int:
+    """Twitter's weight for one code point: 1 in these ranges, 2 elsewhere."""
+    cp = ord(ch)
+    if cp <= 4351 or 8192 <= cp <= 8205 or 8208 <= cp <= 8223 or 8242 <= cp <= 8247:
+        return 1
+    return 2
+
+
+def _weighted(text: str) -> int:
+    if text.isascii():
+        return len(text)
+    return sum(_char_weight(ch) for ch in text)
+
+
+def tweet_length(text: str) -> int:
+    """Length of text as Twitter counts it against the character limit."""
+    text = unicodedata.normalize("NFC", text)
+    length = 0
+    pos = 0
+    for match in _URL.finditer(text):
+        length += _weighted(text[pos:match.start()]) + TWITTER_URL_LENGTH
+        pos = match.end()
+    return length + _weighted(text[pos:])
+
+
+# ============================================================================
+# PACKING
+# ============================================================================
+
+def _pieces(text: str, pattern: "re.Pattern") -> List[Tuple[str, str]]:
+    """Split text at pattern into (piece, whitespace after it) pairs."""
+    parts = pattern.split(text)
+    return [(parts[i], parts[i + 1] if i + 1 < len(parts) else "") for i in range(0, len(parts), 2)]
+
+
+def _hard_split(word: str, budget: int) -> Iterator[str]:
+    """Last resort for a single unbreakable token longer than a tweet."""
+    chunk = ""
+    length = 0
+    for ch in word:
+        weight = _char_weight(ch)
+        if chunk and length + weight > budget:
+            yield chunk
+            chunk = ""
+            length = 0
+        chunk += ch
+        length += weight
+    if chunk:
+        yield chunk
+
+
+def _units(text: str, budget: int) -> Iterator[Tuple[str, str]]:
+    """(unit, whitespace after it) pairs that each fit in budget, coarsest first."""
+    for sentence, sentence_ws in _pieces(text, _SENTENCE_BREAK):
+        if tweet_length(sentence) <= budget:
+            yield sentence, sentence_ws
+            continue
+        clauses = _pieces(sentence, _CLAUSE_BREAK)
+        for i, (clause, clause_ws) in enumerate(clauses):
+            ws = sentence_ws if i == len(clauses) - 1 else clause_ws
+            if tweet_length(clause) <= budget:
+                yield clause, ws
+                continue
+            words = _pieces(clause, _WORD_BREAK)
+            for j, (word, word_ws) in enumerate(words):
+                after = ws if j == len(words) - 1 else word_ws
+                if tweet_length(word) <= budget:
+                    yield word, after
+                else:
+                    parts = list(_hard_split(word, budget))
+                    for part in parts[:-1]:
+                        yield part, ""
+                    yield parts[-1], after
+
+
+def _split_tweet(text: str, budget: int) -> List[str]:
+    """Greedily pack an over-long tweet's units into tweets of at most budget."""
+    tweets = []
+    current = ""
+    length = 0  # Units never split a URL, so lengths simply add up
+    pending_ws = ""
+    for unit, ws in _units(text, budget):
+        unit_length = tweet_length(unit)
+        joined_length = length + tweet_length(pending_ws) + unit_length
+        if current and joined_length <= budget:
+            current += pending_ws + unit
+            length = joined_length
+        else:
+            if current:
+                tweets.append(current)
+            current = unit
+            length = unit_length
+        pending_ws = ws
+    if current:
+        tweets.append(current)
+    return tweets
+
+
+def _strip_numbering(tweets: List[str]) -> Tuple[List[str], Optional[str]]:
+    """Remove an existing i/n numbering; return the tweets and where it was."""
+    if len(tweets) < 2:
+        return tweets, None  # A lone "1/2 of developers..." is a fraction, not numbering
+    for position, pattern in (("start", _NUMBER_AT_START), ("end", _NUMBER_AT_END)):
+        matches = [pattern.search(tweet) for tweet in tweets]
+        # Only when every tweet carries its own index (so "3/4 of teams..." survives)
+        if all(m and m.group(1) == str(i + 1) for i, m in enumerate(matches)):
+            return [pattern.sub("", tweet, count=1) for tweet in tweets], position
+    return tweets, None
+
+
+def pack_thread(draft: str, max_length: int = TWITTER_MAX_TWEET_LENGTH) -> str:
+    """
+    Re-pack a Twitter/X draft into tweets of at most max_length (weighted)
+    and number them (only if it was numbered already or had to be split).
+    
+    Args:
+        draft: Cleaned thread, tweets separated by blank lines
+        max_length: Weighted character limit per tweet
+    
+    Returns:
+        The thread, tweets separated by blank lines
+    """
+    tweets = [t.strip() for t in draft.split(TWEET_SEPARATOR) if t.strip()]
+    if not tweets:
+        return draft
+    tweets, position = _strip_numbering(tweets)
+    if position is None and all(tweet_length(tweet) <= max_length for tweet in tweets):
+        return draft  # Nothing to split and no numbering to keep up to date
+    
+    # Reserve room for " i/n", growing it if the thread gets more digits
+    total = len(tweets)
+    while True:
+        reserve = len(f" {total}/{total}") if total > 1 else 0
+        budget = max_length - reserve
+        packed = []
+        for tweet in tweets:
+            if tweet_length(tweet) <= budget:
+                packed.append(tweet)
+            else:
+                packed.extend(_split_tweet(tweet, budget))
+        needed = len(f" {len(packed)}/{len(packed)}") if len(packed) > 1 else 0
+        if needed <= reserve:
+            break
+        total = len(packed)
+    
+    if len(packed) > len(tweets):
+        increment("thread_packer.repacked")
+        print(f"🧵 [THREAD] Re-packed {len(tweets)} tweets into {len(packed)}")
+    
+    if len(packed) > 1:
+        n = len(packed)
+        if position == "start":
+            packed = [f"{i}/{n} {tweet}" for i, tweet in enumerate(packed, 1)]
+        else:
+            packed = [f"{tweet} {i}/{n}" for i, tweet in enumerate(packed, 1)]
+    
+    return TWEET_SEPARATOR.join(packed)
@@ -7,17 +7,271 @@ OPTIMIZED VERSION:
 - Parallel processing for multi-platform generation
 - Simpler, faster, more reliable
 """
-from typing import Generator, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import queue
+from typing import AsyncGenerator, Generator, Dict, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from langgraph.graph import StateGraph, START
 from agents import (
     RepurposingState,
     extract_core_message_node,
+    extract_core_message_node_async,
     generate_content_node,
+    generate_content_node_async,
+    generate_all_platforms_node,
+    generate_all_platforms_node_async,
     validate_content_node,
+    revise_content_node,
+    revise_content_node_async,
 )
+from agents.repair_node import needs_repair, repair_content_node, build_limit_critique
 from utils.content_cleaner import cleanup_ai_content, cleanup_content_list
-from config import ENABLE_PARALLEL_PROCESSING
+from utils.rule_packs import get_cleaner_engine
+from utils.thread_packer import pack_thread
+from utils.events import run_with_event_sink, arun_with_event_sink
+from config import (
+    ENABLE_PARALLEL_PROCESSING,
+    ENABLE_THREAD_PACKING,
+    ENABLE_LOCAL_REPAIR,
+    ENABLE_REPAIR_LLM_FALLBACK,
+    ENABLE_MULTI_PLATFORM_GENERATION,
+    WORKFLOW_MAX_WORKERS,
+)
+from utils.metrics import increment
+
+
+def _create_initial_state(
+    raw_text: str,
+    selected_platforms: list[str],
+    audience: str,
+    ab_testing: bool,
+    groq_api_key: str,
+    best_posts: str,
+    rule_pack: Optional[str],
+) -> RepurposingState:
+    """Build the starting state shared by the sync and async workflows."""
+    return {
+        "raw_text": raw_text,
+        "selected_platforms": selected_platforms,
+        "audience": audience,
+        "ab_testing": ab_testing,
+        "groq_api_key": groq_api_key,
+        "best_posts": best_posts,
+        "rule_pack": rule_pack,
+        "drafts": {},
+        "critiques": {},
+        "metadata": {},
+        "iterations": {},
+    }
+
+
+def _clean_draft(draft, platform: str, rule_pack: Optional[str] = None):
+    """
+    Run AI-pattern cleanup on a single draft or a list of A/B variations,
+    then pack Twitter/X threads into valid, numbered tweets.
+    """
+    if isinstance(draft, list):
+        # A/B variations
+        cleaned = cleanup_content_list(draft, rule_pack)
+        if platform == "Twitter/X" and ENABLE_THREAD_PACKING:
+            cleaned = [pack_thread(variation) for variation in cleaned]
+        return cleaned
+    # Single draft
+    cleaned = cleanup_ai_content(draft, rule_pack=rule_pack)
+    if platform == "Twitter/X" and ENABLE_THREAD_PACKING and cleaned:
+        cleaned = pack_thread(cleaned)
+    return cleaned
+
+
+def _repair_locally(state: RepurposingState, platform: str) -> bool:
+    """
+    Repair a validated draft locally if it breaks a fixable limit. True if
+    it is still non-compliant and should go to the LLM reviser.
+    """
+    if not ENABLE_LOCAL_REPAIR or not needs_repair(state, platform):
+        return False
+    state = repair_content_node(state, platform)
+    needs_llm = (
+        ENABLE_REPAIR_LLM_FALLBACK
+        and isinstance(state["drafts"][platform], str)  # A/B variations are only repaired locally
+        and not state["metadata"][platform]["platform_compliant"]
+    )
+    if needs_llm:
+        increment("repair.llm_fallbacks")
+        state["critiques"][platform] = build_limit_critique(state, platform)
+    return needs_llm
+
+
+def _finish_revision(state: RepurposingState, platform: str) -> RepurposingState:
+    """Clean and re-validate a draft the LLM reviser rewrote."""
+    state["drafts"][platform] = _clean_draft(state["drafts"][platform], platform, state.get("rule_pack"))
+    return validate_content_node(state, platform)
+
+
+def _validate_and_repair(state: RepurposingState, platform: str) -> RepurposingState:
+    """
+    Validate a cleaned draft. Limit and hashtag violations are repaired
+    locally first; only drafts that local repair can't fix are revised by
+    the LLM.
+    """
+    state = validate_content_node(state, platform)
+    if _repair_locally(state, platform):
+        state = _finish_revision(revise_content_node(state, platform), platform)
+    return state
+
+
+async def _avalidate_and_repair(state: RepurposingState, platform: str) -> RepurposingState:
+    """Async counterpart of _validate_and_repair."""
+    state = validate_content_node(state, platform)
+    if _repair_locally(state, platform):
+        state = _finish_revision(await revise_content_node_async(state, platform), platform)
+    return state
+
+
+def _use_multi_platform(state: RepurposingState, platforms: list[str]) -> bool:
+    """Whether to generate every platform's single draft in one call."""
+    return ENABLE_MULTI_PLATFORM_GENERATION and not state.get("ab_testing", False) and len(platforms) > 1
+
+
+def _generate_all_platforms(state: RepurposingState, platforms: list[str]) -> RepurposingState:
+    """
+    Generate every platform's draft in one call, then clean and validate
+    them. Platforms the call missed (or all of them, if it failed) are left
+    without a draft for the per-platform path.
+    """
+    try:
+        state = generate_all_platforms_node(state, platforms)
+    except Exception as e:
+        increment("generator.multi_platform.fallbacks", len(platforms))
+        print(f"⚠️ [GENERATOR] Multi-platform call failed, generating separately: {e}")
+        return state
+    
+    for platform in platforms:
+        if platform in state["drafts"]:
+            state["drafts"][platform] = _clean_draft(state["drafts"][platform], platform, state.get("rule_pack"))
+            state = _validate_and_repair(state, platform)
+    return state
+
+
+async def _agenerate_all_platforms(state: RepurposingState, platforms: list[str]) -> RepurposingState:
+    """Async counterpart of _generate_all_platforms."""
+    try:
+        state = await generate_all_platforms_node_async(state, platforms)
+    except Exception as e:
+        increment("generator.multi_platform.fallbacks", len(platforms))
+        print(f"⚠️ [GENERATOR] Multi-platform call failed, generating separately: {e}")
+        return state
+    
+    for platform in platforms:
+        if platform in state["drafts"]:
+            state["drafts"][platform] = _clean_draft(state["drafts"][platform], platform, state.get("rule_pack"))
+            state = await _avalidate_and_repair(state, platform)
+    return state
+
+
+def _multi_platform_events(state: RepurposingState, platforms: list[str]) -> Generator[Dict[str, Any], None, None]:
+    """draft_generated and validation_complete for each platform generated in one call."""
+    for platform in platforms:
+        if platform not in state["drafts"]:
+            continue
+        yield {
+            "type": "draft_generated",
+            "platform": platform,
+            "draft": state["drafts"][platform],
+            "message": f"✅ {platform} ready!"
+        }
+        yield {
+            "type": "validation_complete",
+            "platform": platform,
+            "metadata": state["metadata"][platform],
+            "message": f"✅ {platform} validated"
+        }
+
+
+def _core_message_event(state: RepurposingState) -> Dict[str, Any]:
+    """Build the core_message event, flagging results served from the cache."""
+    cached = state.get("core_message_cached", False)
+    verb = "loaded from cache" if cached else "extracted"
+    return {
+        "type": "core_message",
+        "data": state["core_message"],
+        "cached": cached,
+        "message": f"✅ Core message {verb}: {state['core_message']['topic']}"
+    }
+
+
+# Longest wait for an event before checking on running steps (seconds).
+# Finished steps also wake the relay, so this is only a safety net.
+EVENT_POLL_INTERVAL = 0.1
+
+
+def _next_events(events: queue.Queue, block: bool = True) -> Generator[Dict[str, Any], None, None]:
+    """Wait briefly for an event (unless block is False), then yield everything queued."""
+    try:
+        event = events.get(timeout=EVENT_POLL_INTERVAL) if block else events.get_nowait()
+    except queue.Empty:
+        return
+    while True:
+        if event is not None:  # None just wakes the relay
+            yield event
+        try:
+            event = events.get_nowait()
+        except queue.Empty:
+            return
+
+
+async def _anext_events(events: asyncio.Queue, block: bool = True) -> AsyncGenerator[Dict[str, Any], None]:
+    """Async counterpart of _next_events."""
+    try:
+        if block:
+            event = await asyncio.wait_for(events.get(), EVENT_POLL_INTERVAL)
+        else:
+            event = events.get_nowait()
+    except (asyncio.TimeoutError, asyncio.QueueEmpty):
+        return
+    while True:
+        if event is not None:
+            yield event
+        try:
+            event = events.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+
+
+# Shared by every workflow step of every run, so no step pays for a new
+# thread pool. Steps never wait on each other from inside the pool.
+_executor = ThreadPoolExecutor(max_workers=WORKFLOW_MAX_WORKERS, thread_name_prefix="workflow")
+
+
+def _run_in_worker(events: queue.Queue, fn, *args) -> Future:
+    """Run fn(*args) on the shared pool with its events sent to events; wake the relay when done."""
+    future = _executor.submit(run_with_event_sink, events.put, fn, *args)
+    future.add_done_callback(lambda _: events.put(None))
+    return future
+
+
+def _create_task(events: asyncio.Queue, coro) -> asyncio.Task:
+    """Async counterpart of _run_in_worker."""
+    task = asyncio.create_task(arun_with_event_sink(events.put_nowait, coro))
+    task.add_done_callback(lambda _: events.put_nowait(None))
+    return task
+
+
+def _relay_until_done(events: queue.Queue, future: Future) -> Generator[Dict[str, Any], None, Any]:
+    """Yield emitted events while future runs, then return its result."""
+    while not future.done():
+        yield from _next_events(events)
+    yield from _next_events(events, block=False)
+    return future.result()
+
+
+async def _arelay_until_done(events: asyncio.Queue, task: asyncio.Task) -> AsyncGenerator[Dict[str, Any], None]:
+    """Yield emitted events until task has finished."""
+    while not task.done():
+        async for event in _anext_events(events):
+            yield event
+    async for event in _anext_events(events, block=False):
+        yield event
 
 
 def process_single_platform_fast(state: RepurposingState, platform: str) -> Dict[str, Any]:
@@ -27,7 +281,7 @@ def process_single_platform_fast(state: RepurposingState, platform: str) -> Dict
     Steps:
     1. Generate content
     2. Clean AI patterns (post-processing)
-    3. Validate metadata
+    3. Validate metadata (repairing limit violations)
     
     Returns dictionary with platform results.
     """
@@ -44,25 +298,20 @@ def process_single_platform_fast(state: RepurposingState, platform: str) -> Dict
         draft = state["drafts"][platform]
         
         # Step 2: Clean AI patterns (post-processing)
-        if isinstance(draft, list):
-            # A/B variations
-            cleaned_draft = cleanup_content_list(draft)
-        else:
-            # Single draft
-            cleaned_draft = cleanup_ai_content(draft)
+        cleaned_draft = _clean_draft(draft, platform, state.get("rule_pack"))
         
         # Update state with cleaned draft
         state["drafts"][platform] = cleaned_draft
-        results["draft"] = cleaned_draft
-        results["events"].append({"type": "draft_generated", "platform": platform})
         
-        # Step 3: Validate (extract metadata)
-        state = validate_content_node(state, platform)
+        # Step 3: Validate (extract metadata), repairing limit violations
+        state = _validate_and_repair(state, platform)
+        results["draft"] = state["drafts"][platform]
+        results["events"].append({"type": "draft_generated", "platform": platform})
         results["metadata"] = state["metadata"][platform]
         results["events"].append({"type": "validation_complete", "platform": platform})
         
         return results
-        
+    
     except Exception as e:
         results["error"] = str(e)
         results["events"].append({"type": "error", "error": str(e)})
@@ -76,18 +325,25 @@ def run_workflow(
     ab_testing: bool = False,
     groq_api_key: str = "",
     best_posts: str = "",
+    rule_pack: Optional[str] = None,
 ) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
     """
     Runs the content repurposing workflow with streaming.
     
     OPTIMIZED FLOW:
     1. Extract core message
-    2. Analyze style (if best posts provided)
-    3. Generate + Clean + Validate for each platform (in parallel)
+    2. Analyze style (if best posts provided), concurrently with step 1
+    3. Generate + Clean + Validate for each platform (in parallel), or
+       all platforms from one call when ENABLE_MULTI_PLATFORM_GENERATION
+       (platforms it misses fall back to their own call)
     
     No critic/reviser loop = 40% faster!
     Post-processing cleanup = No AI patterns!
     
+    LLM calls run on worker threads so events they emit (draft_delta
+    tokens, llm_retry, circuit_breaker) are yielded while the calls are
+    still running.
+    
     Args:
         raw_text: Source content
         selected_platforms: List of platforms to generate for
@@ -95,57 +351,60 @@ def run_workflow(
         ab_testing: Whether to generate A/B variations
         groq_api_key: Groq API key
         best_posts: User's best performing posts (optional, for style matching)
+        rule_pack: Tenant cleaner rule pack (optional, see utils/rule_packs.py)
     
     Yields:
         Progress events with type and data
     
     Returns:
         Final state with all generated content
+    
+    Raises:
+        RulePackError: rule_pack doesn't exist or is invalid
     """
     from agents import analyze_best_posts_node
     
+    # Compile (or fetch) the rule pack up front so a bad pack fails before any LLM call
+    get_cleaner_engine(rule_pack)
+    
     # Initialize state
-    state: RepurposingState = {
-        "raw_text": raw_text,
-        "selected_platforms": selected_platforms,
-        "audience": audience,
-        "ab_testing": ab_testing,
-        "groq_api_key": groq_api_key,
-        "best_posts": best_posts,
-        "drafts": {},
-        "critiques": {},
-        "metadata": {},
-        "iterations": {},
-    }
+    state = _create_initial_state(
+        raw_text, selected_platforms, audience, ab_testing, groq_api_key, best_posts, rule_pack
+    )
+    events = queue.Queue()
     
     # =========================================================================
-    # STEP 1: Extract core message
+    # STEP 1 + 2: Extract core message and analyze best posts (concurrently)
     # =========================================================================
+    # Style analysis only reads best_posts, so it runs on a worker thread
+    # alongside core message extraction. Both join before generation.
+    analyze_style = bool(best_posts and best_posts.strip())
+    
     yield {
         "type": "status",
         "message": "🧠 Extracting core message...",
         "platform": None
     }
     
-    state = extract_core_message_node(state)
-    
-    yield {
-        "type": "core_message",
-        "data": state["core_message"],
-        "message": f"✅ Core message extracted: {state['core_message']['topic']}"
-    }
-    
-    # =========================================================================
-    # STEP 2: Analyze best posts (if provided)
-    # =========================================================================
-    if best_posts and best_posts.strip():
+    style_future = None
+    if analyze_style:
         yield {
             "type": "status",
             "message": "🔍 Analyzing your writing style...",
             "platform": None
         }
         
-        state = analyze_best_posts_node(state)
+        style_future = _run_in_worker(events, analyze_best_posts_node, state.copy())
+    
+    state = yield from _relay_until_done(
+        events, _run_in_worker(events, extract_core_message_node, state)
+    )
+    
+    yield _core_message_event(state)
+    
+    if style_future is not None:
+        style_state = yield from _relay_until_done(events, style_future)
+        state["style_guide"] = style_state.get("style_guide")
         
         if state.get("style_guide"):
             yield {
@@ -158,30 +417,57 @@ def run_workflow(
     # STEP 3: Generate content for all platforms
     # =========================================================================
     
-    use_parallel = ENABLE_PARALLEL_PROCESSING and len(selected_platforms) > 1
+    platforms = selected_platforms
+    if _use_multi_platform(state, platforms):
+        yield {
+            "type": "status",
+            "message": f"⚡ Generating for {len(platforms)} platforms in one call...",
+            "platform": None
+        }
+        state = yield from _relay_until_done(
+            events, _run_in_worker(events, _generate_all_platforms, state, platforms)
+        )
+        yield from _multi_platform_events(state, platforms)
+        # Whatever the call missed goes through the per-platform path below
+        platforms = [p for p in platforms if p not in state["drafts"]]
+    
+    use_parallel = ENABLE_PARALLEL_PROCESSING and len(platforms) > 1
     
     if use_parallel:
         # PARALLEL PROCESSING - All platforms at once!
         yield {
             "type": "status",
-            "message": f"⚡ Generating for {len(selected_platforms)} platforms in parallel...",
+            "message": f"⚡ Generating for {len(platforms)} platforms in parallel...",
             "platform": None
         }
         
         try:
-            with ThreadPoolExecutor(max_workers=len(selected_platforms)) as executor:
-                # Submit all platforms
-                future_to_platform = {
-                    executor.submit(process_single_platform_fast, state.copy(), platform): platform
-                    for platform in selected_platforms
-                }
+            # Submit all platforms
+            future_to_platform = {
+                _run_in_worker(events, process_single_platform_fast, state.copy(), platform): platform
+                for platform in platforms
+            }
+            
+            # Collect results as they complete, relaying emitted events
+            pending = set(future_to_platform)
+            while pending:
+                yield from _next_events(events)
+                done, pending = wait(pending, timeout=0)
                 
-                # Collect results as they complete
-                for future in as_completed(future_to_platform):
+                for future in done:
                     platform = future_to_platform[future]
                     try:
                         result = future.result()
                         
+                        # Same contract as run_workflow_async: no None drafts
+                        if result.get("error"):
+                            yield {
+                                "type": "error",
+                                "platform": platform,
+                                "message": f"❌ {platform} failed: {result['error']}"
+                            }
+                            continue
+                        
                         # Update state with results
                         state["drafts"][platform] = result["draft"]
                         if result.get("metadata"):
@@ -202,7 +488,7 @@ def run_workflow(
                                 "metadata": result["metadata"],
                                 "message": f"✅ {platform} validated"
                             }
-                        
+                    
                     except Exception as e:
                         yield {
                             "type": "error",
@@ -220,7 +506,7 @@ def run_workflow(
     
     if not use_parallel:
         # SEQUENTIAL PROCESSING - One at a time
-        for platform in selected_platforms:
+        for platform in platforms:
             yield {
                 "type": "status",
                 "message": f"✍️ Generating for {platform}...",
@@ -228,27 +514,28 @@ def run_workflow(
             }
             
             # Generate
-            state = generate_content_node(state, platform)
+            state = yield from _relay_until_done(
+                events, _run_in_worker(events, generate_content_node, state, platform)
+            )
             draft = state["drafts"][platform]
             
             # Clean AI patterns
-            if isinstance(draft, list):
-                cleaned_draft = cleanup_content_list(draft)
-            else:
-                cleaned_draft = cleanup_ai_content(draft)
+            cleaned_draft = _clean_draft(draft, platform, state.get("rule_pack"))
             
             state["drafts"][platform] = cleaned_draft
             
+            # Validate, repairing limit violations (the LLM fallback runs off this thread)
+            state = yield from _relay_until_done(
+                events, _run_in_worker(events, _validate_and_repair, state, platform)
+            )
+            
             yield {
                 "type": "draft_generated",
                 "platform": platform,
-                "draft": cleaned_draft,
+                "draft": state["drafts"][platform],
                 "message": f"✅ {platform} ready!"
             }
             
-            # Validate
-            state = validate_content_node(state, platform)
-            
             yield {
                 "type": "validation_complete",
                 "platform": platform,
@@ -268,6 +555,194 @@ def run_workflow(
     return state
 
 
+# =============================================================================
+# ASYNC WORKFLOW
+# =============================================================================
+
+async def process_single_platform_async(state: RepurposingState, platform: str) -> Dict[str, Any]:
+    """
+    Async counterpart of process_single_platform_fast.
+    
+    Generation (and any LLM repair fallback) is awaited on the event loop;
+    cleanup, validation and local repair are CPU work and run inline. Returns the same result dictionary.
+    """
+    results = {
+        "platform": platform,
+        "events": [],
+        "draft": None,
+        "metadata": None,
+    }
+    
+    try:
+        state = await generate_content_node_async(state, platform)
+        cleaned_draft = _clean_draft(state["drafts"][platform], platform, state.get("rule_pack"))
+        
+        state["drafts"][platform] = cleaned_draft
+        
+        state = await _avalidate_and_repair(state, platform)
+        results["draft"] = state["drafts"][platform]
+        results["events"].append({"type": "draft_generated", "platform": platform})
+        results["metadata"] = state["metadata"][platform]
+        results["events"].append({"type": "validation_complete", "platform": platform})
+        
+        return results
+    
+    except Exception as e:
+        results["error"] = str(e)
+        results["events"].append({"type": "error", "error": str(e)})
+        return results
+
+
+async def run_workflow_async(
+    raw_text: str,
+    selected_platforms: list[str],
+    audience: str = "General Professional",
+    ab_testing: bool = False,
+    groq_api_key: str = "",
+    best_posts: str = "",
+    rule_pack: Optional[str] = None,
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    Async version of run_workflow built on AsyncGroq.
+    
+    Yields the same events in the same order as run_workflow, but every
+    LLM call is awaited and per-platform generation runs as tasks on the
+    current event loop instead of on a per-request thread pool. Retry and
+    circuit breaker events are relayed as in run_workflow. Use with
+    ``async for event in run_workflow_async(...)``.
+    """
+    from agents import analyze_best_posts_node_async
+    
+    get_cleaner_engine(rule_pack)
+    
+    state = _create_initial_state(
+        raw_text, selected_platforms, audience, ab_testing, groq_api_key, best_posts, rule_pack
+    )
+    events = asyncio.Queue()
+    
+    # STEP 1 + 2: Extract core message and analyze best posts concurrently
+    analyze_style = bool(best_posts and best_posts.strip())
+    
+    yield {
+        "type": "status",
+        "message": "🧠 Extracting core message...",
+        "platform": None
+    }
+    
+    style_task = None
+    if analyze_style:
+        yield {
+            "type": "status",
+            "message": "🔍 Analyzing your writing style...",
+            "platform": None
+        }
+        style_task = _create_task(events, analyze_best_posts_node_async(state.copy()))
+    
+    extract_task = _create_task(events, extract_core_message_node_async(state))
+    try:
+        async for event in _arelay_until_done(events, extract_task):
+            yield event
+        state = extract_task.result()
+    except BaseException:
+        extract_task.cancel()
+        if style_task is not None:
+            style_task.cancel()
+        raise
+    
+    yield _core_message_event(state)
+    
+    if style_task is not None:
+        async for event in _arelay_until_done(events, style_task):
+            yield event
+        state["style_guide"] = style_task.result().get("style_guide")
+        
+        if state.get("style_guide"):
+            yield {
+                "type": "style_analyzed",
+                "data": state["style_guide"],
+                "message": f"✅ Style extracted: {state['style_guide'].get('writing_style', 'N/A')}"
+            }
+    
+    # STEP 3: Generate content for all platforms as concurrent tasks
+    platforms = selected_platforms
+    if _use_multi_platform(state, platforms):
+        yield {
+            "type": "status",
+            "message": f"⚡ Generating for {len(platforms)} platforms in one call...",
+            "platform": None
+        }
+        multi_task = _create_task(events, _agenerate_all_platforms(state, platforms))
+        try:
+            async for event in _arelay_until_done(events, multi_task):
+                yield event
+        except BaseException:
+            multi_task.cancel()
+            raise
+        state = multi_task.result()
+        for event in _multi_platform_events(state, platforms):
+            yield event
+        platforms = [p for p in platforms if p not in state["drafts"]]
+    
+    if len(platforms) > 1:
+        yield {
+            "type": "status",
+            "message": f"⚡ Generating for {len(platforms)} platforms in parallel...",
+            "platform": None
+        }
+    elif platforms:
+        yield {
+            "type": "status",
+            "message": f"✍️ Generating for {platforms[0]}...",
+            "platform": platforms[0]
+        }
+    
+    pending = {
+        _create_task(events, process_single_platform_async(state.copy(), platform))
+        for platform in platforms
+    }
+    
+    while pending:
+        async for event in _anext_events(events):
+            yield event
+        done = {task for task in pending if task.done()}
+        pending -= done
+        
+        for task in done:
+            result = task.result()
+            platform = result["platform"]
+            
+            if result.get("error"):
+                yield {
+                    "type": "error",
+                    "platform": platform,
+                    "message": f"❌ {platform} failed: {result['error']}"
+                }
+                continue
+            
+            state["drafts"][platform] = result["draft"]
+            yield {
+                "type": "draft_generated",
+                "platform": platform,
+                "draft": result["draft"],
+                "message": f"✅ {platform} ready!"
+            }
+            
+            if result.get("metadata"):
+                state["metadata"][platform] = result["metadata"]
+                yield {
+                    "type": "validation_complete",
+                    "platform": platform,
+                    "metadata": result["metadata"],
+                    "message": f"✅ {platform} validated"
+                }
+    
+    yield {
+        "type": "complete",
+        "message": "🎉 All content ready!",
+        "state": state
+    }
+
+
 # Legacy function for backwards compatibility
 def create_repurposing_workflow() -> StateGraph:
     """Creates the LangGraph workflow (legacy, not used in optimized flow)."""